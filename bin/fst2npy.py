@@ -1,5 +1,10 @@
 #!/usr/bin/env python3
-"""Convert a Phonetisaurus FST (printed with fstprint) to numpy arrays"""
+"""Convert a Phonetisaurus FST (printed with fstprint) to numpy arrays
+
+Edges are sorted by source node and indexed with a CSR offsets array, so
+out-edges of node n are edges[edge_offsets[n]:edge_offsets[n + 1]].
+No arrays require pickle, so the .npz can be memory-mapped when loaded.
+"""
 import argparse
 import logging
 import typing
@@ -93,16 +98,44 @@ def fst2graph(fst_path: typing.Union[str, Path]) -> typing.Dict[str, np.ndarray]
 
     assert start_node is not None, "No start node"
 
-    edges = sorted(edges, key=lambda e: e[0])
+    # Sort edges by source node (stable, so order within a node is kept).
+    # Probabilities must stay aligned with their edges.
+    edges_array = np.array(edges, dtype=np.int32).reshape((-1, 4))
+    edge_probs_array = np.array(edge_probs, dtype=np.float32)
+
+    edge_order = np.argsort(edges_array[:, 0], kind="stable")
+    edges_array = edges_array[edge_order]
+    edge_probs_array = edge_probs_array[edge_order]
+
+    final_nodes_array = np.array(final_nodes, dtype=np.int32)
+    final_probs_array = np.array(final_probs, dtype=np.float32)
+
+    num_nodes = 1 + max(
+        start_node,
+        int(edges_array[:, :2].max()) if len(edges_array) > 0 else 0,
+        int(final_nodes_array.max()) if len(final_nodes_array) > 0 else 0,
+    )
+
+    # CSR offsets: out-edges of node n are edges[edge_offsets[n]:edge_offsets[n+1]]
+    edge_offsets = np.searchsorted(
+        edges_array[:, 0], np.arange(num_nodes + 1), side="left"
+    ).astype(np.int64)
+
+    # node -> final probability (inf if not an accepting state)
+    node_final_probs = np.full(num_nodes, np.inf, dtype=np.float32)
+    node_final_probs[final_nodes_array] = final_probs_array
 
     return {
         "start_node": np.array([start_node], dtype=np.int32),
-        "edges": np.array(edges, dtype=np.int32),
-        "edge_probs": np.array(edge_probs, dtype=np.float32),
-        "final_nodes": np.array(final_nodes, dtype=np.int32),
-        "final_probs": np.array(final_probs, dtype=np.float32),
+        "edges": edges_array,
+        "edge_probs": edge_probs_array,
+        "edge_offsets": edge_offsets,
+        "final_nodes": final_nodes_array,
+        "final_probs": final_probs_array,
+        "node_final_probs": node_final_probs,
+        # Fixed-width unicode instead of object array (no pickle needed)
         "symbols": np.array(
-            [k for k, v in sorted(symbols.items(), key=lambda kv: kv[1])], dtype=object
+            [k for k, v in sorted(symbols.items(), key=lambda kv: kv[1])], dtype=np.str_
         ),
     }
 
@@ -3,6 +3,7 @@ import itertools
 import logging
 import re
 import sqlite3
+import sys
 import threading
 import typing
 from enum import Enum
@@ -21,10 +22,13 @@ __version__ = (_DIR / "VERSION").read_text().strip()
 __author__ = "Michael Hansen (synesthesiam)"
 __all__ = [
     "sentences",
+    "segment",
+    "asentences",
     "is_language_supported",
     "get_supported_languages",
     "TextProcessor",
     "TextProcessorSettings",
+    "AsyncTextProcessor",
 ]
 
 # -----------------------------------------------------------------------------
@@ -46,6 +50,7 @@ def sentences(
     phonemes: bool = True,
     break_phonemes: bool = True,
     pos: bool = True,
+    workers: int = 0,
     #transformer: bool = True,
     **process_args,
 ) -> typing.Iterable[Sentence]:
@@ -60,6 +65,8 @@ def sentences(
         major_breaks: False if no sentence-breaking symbols in output
         minor_breaks: False if no phrase-breaking symbols in output
         punctuations: False if no word-surrounding symbols in output
+        workers: number of processes for long documents (0 to process in one piece).
+            See TextProcessor.sentences_chunked.
         **process_args: keyword arguments passed to TextProcessor.process
 
     Returns:
@@ -79,21 +86,137 @@ def sentences(
             _LOCAL.processors[model_prefix] = text_processor
 
     assert text_processor is not None
-    graph, root = text_processor(text, lang=lang, ssml=ssml, **process_args)
+    sentences_args = {
+        "major_breaks": major_breaks,
+        "minor_breaks": minor_breaks,
+        "punctuations": punctuations,
+        "explicit_lang": explicit_lang,
+        "phonemes": phonemes,
+        "break_phonemes": break_phonemes,
+        "pos": pos,
+    }
+
+    if workers > 0:
+        yield from text_processor.sentences_chunked(
+            text,
+            lang=lang,
+            ssml=ssml,
+            max_workers=workers,
+            use_processes=True,
+            sentences_args=sentences_args,
+            **process_args,
+        )
+        return
+
+    yield from text_processor.process_sentences(
+        text, lang=lang, ssml=ssml, sentences_args=sentences_args, **process_args
+    )
+
+
+def segment(
+    text: str,
+    lang: str = "en_US",
+    ssml: bool = False,
+    major_breaks: bool = True,
+    minor_breaks: bool = True,
+    punctuations: bool = True,
+    explicit_lang: bool = True,
+    max_passes: int = 5,
+) -> typing.Iterable[Sentence]:
+    """
+    Split text into sentences and words only (segmentation fast mode)
+
+    Runs whitespace splitting, replacements, punctuation, abbreviations,
+    initialisms, and breaks. Numbers, dates, times, and currency are left as-is.
+    No lexicon, part of speech tagger, grapheme to phoneme model, dateparser, or
+    babel is ever loaded, so words have no phonemes or parts of speech.
+
+    Args:
+        text: input text or SSML (ssml=True)
+        lang: default language of input text
+        ssml: True if input text is SSML
+        major_breaks: False if no sentence-breaking symbols in output
+        minor_breaks: False if no phrase-breaking symbols in output
+        punctuations: False if no word-surrounding symbols in output
+        explicit_lang: False if lang should be empty for the default language
+
+    Returns:
+        sentences: iterable of Sentence objects
+
+    """
+    with _PROCESSORS_LOCK:
+        text_processor = getattr(_LOCAL, "segmenter", None)
+        if text_processor is None:
+            text_processor = TextProcessor(
+                default_lang=lang,
+                load_pos_tagger=False,
+                load_phoneme_lexicon=False,
+                load_g2p_guesser=False,
+                load_currencies=False,
+            )
+            _LOCAL.segmenter = text_processor
+
+    assert text_processor is not None
+    sentences_args = {
+        "major_breaks": major_breaks,
+        "minor_breaks": minor_breaks,
+        "punctuations": punctuations,
+        "explicit_lang": explicit_lang,
+    }
+
+    if not ssml:
+        # Flat list of tokens instead of a graph
+        yield from text_processor.segment(
+            text, lang=lang, max_passes=max_passes, **sentences_args
+        )
+        return
+
+    graph, root = text_processor(
+        text,
+        lang=lang,
+        ssml=True,
+        pos=False,
+        phonemize=False,
+        detect_numbers=False,
+        detect_currency=False,
+        detect_dates=False,
+        detect_times=False,
+        verbalize_numbers=False,
+        verbalize_currency=False,
+        verbalize_dates=False,
+        verbalize_times=False,
+        max_passes=max_passes,
+    )
 
     yield from text_processor.sentences(
-        graph,
-        root,
-        major_breaks=major_breaks,
-        minor_breaks=minor_breaks,
-        punctuations=punctuations,
-        explicit_lang=explicit_lang,
-        phonemes=phonemes,
-        break_phonemes=break_phonemes,
-        pos=pos,
+        graph, root, phonemes=False, pos=False, **sentences_args
     )
 
 
+def asentences(*args, **kwargs):
+    """Process text asynchronously and yield sentences (see gruut.aio.asentences)"""
+    from gruut.aio import asentences as aio_asentences
+
+    return aio_asentences(*args, **kwargs)
+
+
+# asyncio is only imported when needed
+if sys.version_info >= (3, 7):
+
+    def __getattr__(name: str):
+        if name == "AsyncTextProcessor":
+            from gruut.aio import AsyncTextProcessor
+
+            return AsyncTextProcessor
+
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+else:
+    # No module __getattr__ (PEP 562)
+    from gruut.aio import AsyncTextProcessor
+
+
 # -----------------------------------------------------------------------------
 
 
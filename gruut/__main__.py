@@ -1,19 +1,27 @@
 #!/usr/bin/env python3
 """Command-line interface to gruut"""
 import argparse
+import contextlib
 import csv
 import dataclasses
+import itertools
 import logging
+import multiprocessing
 import os
 import sys
+import time
+import traceback
+import typing
+from collections import deque
 from enum import Enum
 from pathlib import Path
 
 import jsonlines
 
-from gruut.const import KNOWN_LANGS
+from gruut.const import KNOWN_LANGS, Sentence
+from gruut.profiling import Profiler
 from gruut.text_processor import TextProcessor
-from gruut.utils import print_graph
+from gruut.utils import StageTimingAggregator, print_graph, stats_to_prometheus
 
 # -----------------------------------------------------------------------------
 
@@ -22,6 +30,9 @@ _LOGGER = logging.getLogger("gruut")
 # Path to gruut base directory
 _DIR = Path(__file__).parent
 
+# Seconds between throughput reports with --workers
+PROGRESS_INTERVAL_SECONDS = 10.0
+
 
 class StdinFormat(str, Enum):
     """Format of standard input"""
@@ -50,6 +61,18 @@ def main():
 
         print(__version__)
         sys.exit(0)
+    elif sys.argv[1] == "corpus":
+        # Sharded, resumable processing of a corpus file
+        from gruut.corpus import main as corpus_main
+
+        corpus_main(sys.argv[2:])
+        return
+    elif sys.argv[1] == "serve":
+        # Local HTTP/JSON server
+        from gruut.server import main as server_main
+
+        server_main(sys.argv[2:])
+        return
 
     args = get_args()
 
@@ -63,38 +86,150 @@ def main():
     if args.espeak:
         args.model_prefix = "espeak"
 
+    if args.daemon:
+        # Serve other gruut commands until interrupted
+        from gruut.daemon import run_daemon
+
+        run_daemon(args)
+        return
+
     # -------------------------------------------------------------------------
 
-    text_processor = TextProcessor(
-        default_lang=args.language, model_prefix=args.model_prefix,
-    )
+    stage_callbacks: typing.List[typing.Callable[[typing.Any], None]] = []
+
+    stage_timings: typing.Optional[StageTimingAggregator] = None
+    if args.stage_timings:
+        stage_timings = StageTimingAggregator()
+        stage_callbacks.append(stage_timings)
+
+    profiler: typing.Optional[Profiler] = None
+    if args.profile:
+        profiler = Profiler(
+            pstats_path=f"{args.profile}.pstats",
+            collapsed_path=f"{args.profile}.collapsed",
+            top=args.profile_top,
+            trace_memory=args.profile_memory,
+        )
+
+        if args.profile_memory:
+            # Record traced memory at stage boundaries
+            stage_callbacks.append(profiler)
+
+    on_stage_timing = None
+    if len(stage_callbacks) == 1:
+        on_stage_timing = stage_callbacks[0]
+    elif stage_callbacks:
+
+        def on_stage_timing(timing):
+            for stage_callback in stage_callbacks:
+                stage_callback(timing)
+
+    if (args.workers > 1) and (on_stage_timing or args.profile or args.stats_file):
+        _LOGGER.warning(
+            "--stage-timings, --profile, and --stats-file only cover the main process "
+            + "when --workers > 1"
+        )
+
+    if args.text:
+        stdin_tty = False
+    else:
+        stdin_tty = os.isatty(sys.stdin.fileno())
+        if stdin_tty:
+            print("Reading input from stdin...", file=sys.stderr)
+
+    if can_forward(args):
+        # Send to warm processors in gruut --daemon (if running)
+        from gruut.daemon import forward_to_daemon
+
+        exit_code = forward_to_daemon(
+            sys.argv[1:],
+            socket_path=args.daemon_socket,
+            send_stdin=(not args.text),
+            stdin_tty=stdin_tty,
+        )
+        if exit_code is not None:
+            sys.exit(exit_code)
+
+    text_processor = make_text_processor(args, on_stage_timing=on_stage_timing)
 
     if args.debug:
         _LOGGER.debug(text_processor.settings)
 
+    lines = read_lines(args, sys.stdin)
+
+    # Profile the processing loop.
+    # Models are loaded lazily on first use, so loading is included in the profile.
+    with contextlib.ExitStack() as profile_stack:
+        if profiler is not None:
+            profile_stack.enter_context(profiler)
+
+        write_output(args, text_processor, lines, sys.stdout)
+
+    if stage_timings is not None:
+        stage_timings.print_summary(file=sys.stderr)
+
+    if args.stats_file:
+        stats_to_prometheus(text_processor.stats(), path=args.stats_file)
+
+
+# -----------------------------------------------------------------------------
+
+
+def make_text_processor(
+    args: argparse.Namespace, on_stage_timing=None
+) -> TextProcessor:
+    """Create text processor from command-line arguments"""
+    return TextProcessor(
+        default_lang=args.language,
+        model_prefix=args.model_prefix,
+        g2p_engine=args.g2p_engine,
+        on_stage_timing=on_stage_timing,
+    )
+
+
+def can_forward(args: argparse.Namespace) -> bool:
+    """True if this command can be run by gruut --daemon instead"""
+    return not (
+        args.daemon
+        or args.no_daemon
+        or args.debug
+        or (args.workers > 1)
+        or args.profile
+        or args.stage_timings
+        or args.stats_file
+    )
+
+
+def read_lines(args: argparse.Namespace, stdin: typing.TextIO) -> typing.Iterable[str]:
+    """Get input lines from arguments or stdin"""
     if args.text:
         # Use arguments
-        lines = args.text
-    else:
-        # Use stdin
-        stdin_format = StdinFormat.LINES
+        return args.text
 
-        if (args.stdin_format == StdinFormat.AUTO) and args.ssml:
-            # Assume SSML input is entire document
-            stdin_format = StdinFormat.DOCUMENT
+    # Use stdin
+    stdin_format = StdinFormat.LINES
 
-        if stdin_format == StdinFormat.DOCUMENT:
-            # One big line
-            lines = [sys.stdin.read()]
-        else:
-            # Multiple lines
-            lines = sys.stdin
+    if (args.stdin_format == StdinFormat.AUTO) and args.ssml:
+        # Assume SSML input is entire document
+        stdin_format = StdinFormat.DOCUMENT
+
+    if stdin_format == StdinFormat.DOCUMENT:
+        # One big line
+        return [stdin.read()]
+
+    # Multiple lines
+    return stdin
 
-        if os.isatty(sys.stdin.fileno()):
-            print("Reading input from stdin...", file=sys.stderr)
 
+def write_output(
+    args: argparse.Namespace,
+    text_processor: TextProcessor,
+    lines: typing.Iterable[str],
+    stdout: typing.TextIO,
+):
+    """Process input lines and write sentences as JSON lines or CSV"""
     if args.csv:
-        writer = csv.writer(sys.stdout, delimiter=args.csv_delimiter)
+        writer = csv.writer(stdout, delimiter=args.csv_delimiter)
 
         def input_text(lines):
             reader = csv.reader(lines, delimiter=args.csv_delimiter)
@@ -103,26 +238,10 @@ def main():
                 yield (text, row)
 
         def output_sentences(sentences, writer, text_data=None):
-            row = list(text_data)
-            row.append(
-                args.sentence_separator.join(
-                    args.word_separator.join(w.text for w in sentence if w.is_spoken)
-                    for sentence in sentences
-                )
-            )
-
-            phonemes = [
-                args.phoneme_separator.join(w.phonemes)
-                for sentence in sentences
-                for w in sentence
-                if w.phonemes
-            ]
-
-            row.append(args.phoneme_word_separator.join(phonemes))
-            writer.writerow(row)
+            writer.writerow(sentences_to_csv_row(text_data, sentences, args))
 
     else:
-        writer = jsonlines.Writer(sys.stdout, flush=True)
+        writer = jsonlines.Writer(stdout, flush=True)
 
         def input_text(lines):
             for line in lines:
@@ -133,46 +252,214 @@ def main():
                 sentence_dict = dataclasses.asdict(sentence)
                 writer.write(sentence_dict)
 
-    for text, text_data in input_text(lines):
-        try:
-            graph, root = text_processor(
-                text,
-                ssml=args.ssml,
-                pos=(not args.no_pos),
-                phonemize=(not (args.no_lexicon and args.no_g2p)),
-                post_process=(not args.no_post_process),
-                verbalize_numbers=(not args.no_numbers),
-                verbalize_currency=(not args.no_currency),
-                verbalize_dates=(not args.no_dates),
-                verbalize_times=(not args.no_times),
-            )
+    if args.workers > 1:
+        # Chunks of lines are processed in worker processes, output is in order
+        for text, text_data, sentences, error in process_parallel(
+            input_text(lines), args
+        ):
+            if error is not None:
+                _LOGGER.error("%s\n%s", text, error)
 
-            if args.debug:
-                print_graph(
-                    graph,
-                    root,
-                    print_func=lambda *print_args: _LOGGER.debug(
-                        " ".join(str(a) for a in print_args)
-                    ),
-                )
-
-            # Output sentences
-            sentences = list(
-                text_processor.sentences(
-                    graph,
-                    root,
-                    major_breaks=(not args.no_major_breaks),
-                    minor_breaks=(not args.no_minor_breaks),
-                    punctuations=(not args.no_punctuation),
-                )
-            )
+                if not args.no_fail:
+                    raise TextProcessingError(text)
+
+                continue
 
             output_sentences(sentences, writer, text_data)
-        except Exception as e:
-            _LOGGER.exception(text)
+    else:
+        for text, text_data in input_text(lines):
+            try:
+                sentences = process_text(text_processor, text, args)
+                output_sentences(sentences, writer, text_data)
+            except Exception as e:
+                _LOGGER.exception(text)
+
+                if not args.no_fail:
+                    raise TextProcessingError(text) from e
+
+
+def process_text(
+    text_processor: TextProcessor, text: str, args: argparse.Namespace
+) -> typing.List[Sentence]:
+    """Process a single line/document into sentences"""
+    graph, root = text_processor(
+        text,
+        ssml=args.ssml,
+        pos=(not args.no_pos),
+        phonemize=(not (args.no_lexicon and args.no_g2p)),
+        post_process=(not args.no_post_process),
+        verbalize_numbers=(not args.no_numbers),
+        verbalize_currency=(not args.no_currency),
+        verbalize_dates=(not args.no_dates),
+        verbalize_times=(not args.no_times),
+    )
+
+    if args.debug:
+        print_graph(
+            graph,
+            root,
+            print_func=lambda *print_args: _LOGGER.debug(
+                " ".join(str(a) for a in print_args)
+            ),
+        )
+
+    return list(
+        text_processor.sentences(
+            graph,
+            root,
+            major_breaks=(not args.no_major_breaks),
+            minor_breaks=(not args.no_minor_breaks),
+            punctuations=(not args.no_punctuation),
+        )
+    )
+
+
+def sentences_to_csv_row(
+    row: typing.Sequence[str],
+    sentences: typing.Iterable[Sentence],
+    args: argparse.Namespace,
+) -> typing.List[str]:
+    """Append words and phonemes of sentences to an input CSV row"""
+    sentences = list(sentences)
+    row = list(row)
+    row.append(
+        args.sentence_separator.join(
+            args.word_separator.join(w.text for w in sentence if w.is_spoken)
+            for sentence in sentences
+        )
+    )
+
+    phonemes = [
+        args.phoneme_separator.join(w.phonemes)
+        for sentence in sentences
+        for w in sentence
+        if w.phonemes
+    ]
+
+    row.append(args.phoneme_word_separator.join(phonemes))
+
+    return row
 
-            if not args.no_fail:
-                raise TextProcessingError(text) from e
+
+# -----------------------------------------------------------------------------
+# Multiprocessing (--workers)
+# -----------------------------------------------------------------------------
+
+# Text processor and arguments for each worker process
+_WORKER_TEXT_PROCESSOR: typing.Optional[TextProcessor] = None
+_WORKER_ARGS: typing.Optional[argparse.Namespace] = None
+
+# (sentences, error) for each line of a chunk
+CHUNK_RESULTS = typing.List[
+    typing.Tuple[typing.Optional[typing.List[Sentence]], typing.Optional[str]]
+]
+
+
+def process_parallel(
+    texts_and_data: typing.Iterable[typing.Tuple[str, typing.Any]],
+    args: argparse.Namespace,
+) -> typing.Iterable[
+    typing.Tuple[
+        str, typing.Any, typing.Optional[typing.List[Sentence]], typing.Optional[str]
+    ]
+]:
+    """Process lines in chunks with a pool of worker processes.
+
+    Yields (text, text_data, sentences, error) in input order. Only a few chunks
+    per worker are in flight, so input is read as fast as it can be processed.
+    Throughput is reported on stderr.
+    """
+    max_pending_chunks = 2 * args.workers
+    pending_chunks: typing.Deque[typing.Tuple[typing.List[typing.Any], typing.Any]] = (
+        deque()
+    )
+
+    start_time = time.perf_counter()
+    last_report_time = start_time
+    num_lines = 0
+    num_sentences = 0
+    num_chars = 0
+
+    def report_throughput():
+        elapsed_seconds = max(1e-9, time.perf_counter() - start_time)
+        print(
+            f"{num_lines} line(s), {num_sentences} sentence(s)",
+            f"in {elapsed_seconds:.2f} second(s):",
+            f"{num_lines / elapsed_seconds:.1f} lines/sec,",
+            f"{num_chars / elapsed_seconds:.0f} chars/sec",
+            f"({args.workers} worker(s))",
+            file=sys.stderr,
+        )
+
+    def finish_chunk(chunk, async_result):
+        nonlocal num_lines, num_sentences, num_chars, last_report_time
+
+        chunk_results: CHUNK_RESULTS = async_result.get()
+        for (text, text_data), (sentences, error) in zip(chunk, chunk_results):
+            num_lines += 1
+            num_chars += len(text)
+            if sentences:
+                num_sentences += len(sentences)
+
+            yield (text, text_data, sentences, error)
+
+        current_time = time.perf_counter()
+        if (current_time - last_report_time) >= PROGRESS_INTERVAL_SECONDS:
+            report_throughput()
+            last_report_time = current_time
+
+    texts_and_data = iter(texts_and_data)
+    with multiprocessing.Pool(
+        processes=args.workers, initializer=_init_worker, initargs=(args,)
+    ) as pool:
+        while True:
+            chunk = list(itertools.islice(texts_and_data, max(1, args.chunk_size)))
+            if not chunk:
+                break
+
+            async_result = pool.apply_async(
+                _process_chunk, ([text for text, _ in chunk],)
+            )
+            pending_chunks.append((chunk, async_result))
+
+            if len(pending_chunks) >= max_pending_chunks:
+                # Wait for oldest chunk to keep output in order
+                yield from finish_chunk(*pending_chunks.popleft())
+
+        while pending_chunks:
+            yield from finish_chunk(*pending_chunks.popleft())
+
+    report_throughput()
+
+
+def _init_worker(args: argparse.Namespace):
+    """Create one text processor per worker process"""
+    global _WORKER_TEXT_PROCESSOR, _WORKER_ARGS
+
+    if args.debug:
+        logging.basicConfig(level=logging.DEBUG)
+    else:
+        logging.basicConfig(level=logging.INFO)
+
+    _WORKER_ARGS = args
+    _WORKER_TEXT_PROCESSOR = make_text_processor(args)
+
+
+def _process_chunk(texts: typing.Sequence[str]) -> CHUNK_RESULTS:
+    """Process a chunk of lines in a worker process, catching errors per line"""
+    assert _WORKER_TEXT_PROCESSOR is not None
+    assert _WORKER_ARGS is not None
+
+    results: CHUNK_RESULTS = []
+    for text in texts:
+        try:
+            results.append(
+                (process_text(_WORKER_TEXT_PROCESSOR, text, _WORKER_ARGS), None)
+            )
+        except Exception:
+            results.append((None, traceback.format_exc()))
+
+    return results
 
 
 # -----------------------------------------------------------------------------
@@ -187,8 +474,10 @@ class TextProcessingError(Exception):
 # -----------------------------------------------------------------------------
 
 
-def get_args() -> argparse.Namespace:
-    """Parse command-line arguments"""
+def get_args(
+    argv: typing.Optional[typing.Sequence[str]] = None,
+) -> argparse.Namespace:
+    """Parse command-line arguments (default: sys.argv)"""
     parser = argparse.ArgumentParser(prog="gruut")
     parser.add_argument(
         "-l",
@@ -261,6 +550,33 @@ def get_args() -> argparse.Namespace:
     parser.add_argument(
         "--no-fail", action="store_true", help="Skip lines that result in errors",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of worker processes for lines of input (default: 1)",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=64,
+        help="Number of lines sent to a worker process at a time (default: 64)",
+    )
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="Keep processors loaded and serve other gruut commands over a socket",
+    )
+    parser.add_argument(
+        "--daemon-socket",
+        help="Path to Unix socket of gruut --daemon "
+        + "(default: $GRUUT_DAEMON_SOCKET or gruut.sock in $XDG_RUNTIME_DIR)",
+    )
+    parser.add_argument(
+        "--no-daemon",
+        action="store_true",
+        help="Don't send input to gruut --daemon, even if it's running",
+    )
 
     # Miscellaneous
     parser.add_argument(
@@ -272,6 +588,12 @@ def get_args() -> argparse.Namespace:
         "--model-prefix",
         help="Sub-directory of gruut language data files with different lexicon, etc. (e.g., espeak)",
     )
+    parser.add_argument(
+        "--g2p-engine",
+        choices=["crf", "fst", "auto"],
+        default="auto",
+        help="Grapheme to phoneme guesser for unknown words (default: auto)",
+    )
     parser.add_argument(
         "--csv", action="store_true", help="Input text is id|text (see --csv-delimiter)"
     )
@@ -298,11 +620,38 @@ def get_args() -> argparse.Namespace:
         default=" ",
         help="String used to separate words in CSV output phonemes",
     )
+    parser.add_argument(
+        "--stage-timings",
+        action="store_true",
+        help="Print time spent in each processing stage to stderr",
+    )
+    parser.add_argument(
+        "--stats-file",
+        help="Write runtime counters to a file in Prometheus text format",
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="gruut-profile",
+        help="Profile processing, writing <PREFIX>.pstats and <PREFIX>.collapsed "
+        + "(flame graph stacks) and printing the hottest functions to stderr",
+    )
+    parser.add_argument(
+        "--profile-memory",
+        action="store_true",
+        help="Also trace memory allocations at each stage with --profile",
+    )
+    parser.add_argument(
+        "--profile-top",
+        type=int,
+        default=20,
+        help="Number of functions to show in --profile summary (default: 20)",
+    )
     parser.add_argument(
         "--debug", action="store_true", help="Print DEBUG messages to console"
     )
 
-    return parser.parse_args()
+    return parser.parse_args(argv)
 
 
 # -----------------------------------------------------------------------------
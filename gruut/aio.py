@@ -0,0 +1,257 @@
+"""asyncio front end for gruut"""
+import asyncio
+import concurrent.futures
+import functools
+import logging
+import typing
+
+from gruut.const import Sentence
+from gruut.text_processor import (
+    CHUNK_RESULT,
+    ChunkStitcher,
+    TextProcessor,
+    _process_chunk_in_process,
+)
+
+# -----------------------------------------------------------------------------
+
+_LOGGER = logging.getLogger("gruut.aio")
+
+DEFAULT_MAX_QUEUE_SIZE = 32
+
+# Marks the end of a sentence queue
+_END = object()
+
+
+class AsyncTextProcessor:
+    """Runs a TextProcessor on an executor and yields sentences asynchronously.
+
+    Documents are split into chunks (see TextProcessor.sentences_chunked) that
+    are processed on the executor in order. Sentences are passed through a
+    bounded queue, so no more chunks are started while the consumer is behind.
+    Closing or cancelling the iterator stops further chunks from being processed.
+    """
+
+    def __init__(
+        self,
+        text_processor: typing.Optional[TextProcessor] = None,
+        executor: typing.Optional[concurrent.futures.Executor] = None,
+        max_queue_size: int = DEFAULT_MAX_QUEUE_SIZE,
+        max_pending_chunks: int = 2,
+        max_chunk_chars: int = 10000,
+        **processor_kwargs,
+    ):
+        """
+        Args:
+            text_processor: processor to use (created from processor_kwargs if None)
+            executor: thread or process pool (None for the event loop's default).
+                With a process pool, each process creates its own TextProcessor
+                from the processor's constructor arguments.
+            max_queue_size: maximum number of sentences waiting to be consumed
+            max_pending_chunks: maximum number of chunks submitted to the executor
+            max_chunk_chars: approximate number of characters per chunk
+            **processor_kwargs: keyword arguments passed to TextProcessor
+        """
+        if text_processor is None:
+            text_processor = TextProcessor(**processor_kwargs)
+
+        self.text_processor = text_processor
+        self.executor = executor
+        self.max_queue_size = max_queue_size
+        self.max_pending_chunks = max(1, max_pending_chunks)
+        self.max_chunk_chars = max_chunk_chars
+
+    async def sentences(
+        self,
+        text: str,
+        lang: typing.Optional[str] = None,
+        ssml: bool = False,
+        sentences_args: typing.Optional[typing.Mapping[str, typing.Any]] = None,
+        **process_args,
+    ) -> typing.AsyncIterator[Sentence]:
+        """
+        Processes text or SSML and yields each sentence
+
+        Args:
+            text: input text or SSML (ssml=True)
+            lang: default language of input text
+            ssml: True if input text is SSML
+            sentences_args: keyword arguments passed to TextProcessor.sentences
+            **process_args: keyword arguments passed to TextProcessor.process
+
+        Returns:
+            sentences: async iterable of Sentence objects
+        """
+        loop = asyncio.get_event_loop()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.max_queue_size)
+        producer = asyncio.ensure_future(
+            self._produce(
+                queue, loop, text, lang, ssml, dict(sentences_args or {}), process_args
+            )
+        )
+
+        try:
+            while True:
+                item = await queue.get()
+                if item is _END:
+                    break
+
+                if isinstance(item, BaseException):
+                    raise item
+
+                yield item
+        finally:
+            # Consumer is done, dropped, or cancelled
+            if not producer.done():
+                producer.cancel()
+
+    async def _produce(
+        self,
+        queue: asyncio.Queue,
+        loop: asyncio.AbstractEventLoop,
+        text: str,
+        lang: typing.Optional[str],
+        ssml: bool,
+        sentences_args: typing.Dict[str, typing.Any],
+        process_args: typing.Mapping[str, typing.Any],
+    ):
+        """Process chunks in order and put their sentences into the queue"""
+        chunk_func: typing.Callable[..., CHUNK_RESULT]
+        if isinstance(self.executor, concurrent.futures.ProcessPoolExecutor):
+            chunk_func = functools.partial(
+                _process_chunk_in_process, self.text_processor.get_config()
+            )
+        else:
+            chunk_func = self.text_processor._process_chunk
+
+        chunk_args = (lang, ssml, sentences_args, process_args)
+        pending: typing.List[typing.Tuple[asyncio.Future, bool]] = []
+
+        try:
+            chunks = await loop.run_in_executor(
+                None,
+                functools.partial(
+                    self.text_processor.split_chunks,
+                    text,
+                    lang=lang,
+                    ssml=ssml,
+                    max_chunk_chars=self.max_chunk_chars,
+                    add_speak_tag=process_args.get("add_speak_tag", True),
+                ),
+            )
+
+            stitcher = ChunkStitcher()
+            chunks_iter = iter(chunks)
+
+            while True:
+                # Keep a few chunks in flight
+                for chunk_text, continues in chunks_iter:
+                    pending.append(
+                        (
+                            loop.run_in_executor(
+                                self.executor, chunk_func, chunk_text, *chunk_args
+                            ),
+                            continues,
+                        )
+                    )
+
+                    if len(pending) >= self.max_pending_chunks:
+                        break
+
+                if not pending:
+                    break
+
+                future, continues = pending.pop(0)
+                chunk_sentences, num_paragraphs = await future
+                for sentence in stitcher(chunk_sentences, num_paragraphs, continues):
+                    # Blocks while the consumer is behind
+                    await queue.put(sentence)
+
+            await queue.put(_END)
+        except asyncio.CancelledError:
+            _LOGGER.debug("Processing cancelled")
+            raise
+        except Exception as e:
+            await queue.put(e)
+        finally:
+            for future, _ in pending:
+                # Chunks that haven't started yet are dropped
+                future.cancel()
+
+
+# -----------------------------------------------------------------------------
+
+
+async def asentences(
+    text: str,
+    lang: str = "en_US",
+    ssml: bool = False,
+    espeak: bool = False,
+    executor: typing.Optional[concurrent.futures.Executor] = None,
+    max_queue_size: int = DEFAULT_MAX_QUEUE_SIZE,
+    major_breaks: bool = True,
+    minor_breaks: bool = True,
+    punctuations: bool = True,
+    explicit_lang: bool = True,
+    phonemes: bool = True,
+    break_phonemes: bool = True,
+    pos: bool = True,
+    **process_args,
+) -> typing.AsyncIterator[Sentence]:
+    """
+    Process text asynchronously and yield sentences (see gruut.sentences)
+
+    Args:
+        text: input text or SSML (ssml=True)
+        lang: default language of input text
+        ssml: True if input text is SSML
+        espeak: True if eSpeak phonemes should be used
+        executor: thread or process pool (None for the event loop's default)
+        max_queue_size: maximum number of sentences waiting to be consumed
+        major_breaks: False if no sentence-breaking symbols in output
+        minor_breaks: False if no phrase-breaking symbols in output
+        punctuations: False if no word-surrounding symbols in output
+        **process_args: keyword arguments passed to TextProcessor.process
+
+    Returns:
+        sentences: async iterable of Sentence objects
+    """
+    model_prefix = "" if (not espeak) else "espeak"
+
+    async_processor = AsyncTextProcessor(
+        text_processor=_get_shared_processor(model_prefix, lang),
+        executor=executor,
+        max_queue_size=max_queue_size,
+    )
+
+    async for sentence in async_processor.sentences(
+        text,
+        lang=lang,
+        ssml=ssml,
+        sentences_args={
+            "major_breaks": major_breaks,
+            "minor_breaks": minor_breaks,
+            "punctuations": punctuations,
+            "explicit_lang": explicit_lang,
+            "phonemes": phonemes,
+            "break_phonemes": break_phonemes,
+            "pos": pos,
+        },
+        **process_args,
+    ):
+        yield sentence
+
+
+# model prefix -> processor (shared by executor threads)
+_SHARED_PROCESSORS: typing.Dict[str, TextProcessor] = {}
+
+
+def _get_shared_processor(model_prefix: str, default_lang: str) -> TextProcessor:
+    text_processor = _SHARED_PROCESSORS.get(model_prefix)
+    if text_processor is None:
+        text_processor = TextProcessor(
+            default_lang=default_lang, model_prefix=model_prefix
+        )
+        _SHARED_PROCESSORS[model_prefix] = text_processor
+
+    return text_processor
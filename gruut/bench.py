@@ -0,0 +1,962 @@
+#!/usr/bin/env python3
+"""Benchmarks for gruut
+
+Usage:
+    python3 -m gruut.bench g2p [--language <lang>] [--output <report.json>]
+    python3 -m gruut.bench pipeline [--language <lang>] [--baseline <report.json>]
+"""
+import argparse
+import gc
+import json
+import logging
+import math
+import multiprocessing
+import os
+import platform
+import random
+import sqlite3
+import sys
+import time
+import tracemalloc
+import typing
+from pathlib import Path
+
+import gruut
+from gruut import __version__
+from gruut.const import DATA_PROP, KNOWN_LANGS, PHONEMES_TYPE, SentenceNode, WordNode
+from gruut.lang import DelayedGraphemesToPhonemes, DelayedPhonetisaurusGraph
+from gruut.text_processor import TextProcessor
+from gruut.utils import LRUCache, find_lang_dir, resolve_lang
+
+_DIR = Path(__file__).parent
+
+_LOGGER = logging.getLogger("gruut.bench")
+
+# word -> phonemes
+LEXICON_TYPE = typing.Dict[str, PHONEMES_TYPE]
+
+# word -> guessed phonemes
+GUESSER_TYPE = typing.Callable[[str], typing.Optional[PHONEMES_TYPE]]
+
+# Engines for g2p benchmark ("+cache" adds an LRU cache of guesses)
+G2P_ENGINES = ["crf", "fst", "crf+cache", "fst+cache"]
+
+_MB = 1024 * 1024
+
+# Sentinel for words that are not in a cache
+_NOT_CACHED = object()
+
+# Corpora for pipeline benchmark (see make_corpora)
+PIPELINE_CORPORA = ["prose", "numbers", "ssml", "long"]
+
+# Entry points for pipeline benchmark
+PIPELINE_APIS = ["sentences", "graph", "process"]
+
+# Metrics compared to a baseline (all higher is better)
+PIPELINE_METRICS = ["chars_per_second", "sentences_per_second"]
+
+DEFAULT_SENTENCES_PATH = _DIR.parent / "test" / "test_sentences.txt"
+
+# -----------------------------------------------------------------------------
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(prog="gruut.bench")
+
+    # Create subparsers for each sub-command
+    sub_parsers = parser.add_subparsers()
+    sub_parsers.required = True
+    sub_parsers.dest = "command"
+
+    # ---
+    # G2P
+    # ---
+    g2p_parser = sub_parsers.add_parser(
+        "g2p", help="Compare grapheme to phoneme engines on a lexicon (JSON report)"
+    )
+    g2p_parser.add_argument(
+        "--language",
+        action="append",
+        help="Language to benchmark (default: all installed)",
+    )
+    g2p_parser.add_argument(
+        "--lexicon",
+        help="Lexicon with '<word> <phoneme> <phoneme> ...' lines "
+        + "(default: lexicon.db in language directory)",
+    )
+    g2p_parser.add_argument(
+        "--engine",
+        action="append",
+        choices=G2P_ENGINES,
+        help="Engine to benchmark (default: all available)",
+    )
+    g2p_parser.add_argument(
+        "--model-prefix",
+        default="",
+        help="Sub-directory of language data files with models (e.g., espeak)",
+    )
+    g2p_parser.add_argument(
+        "--max-words",
+        type=int,
+        default=1000,
+        help="Maximum number of lexicon words to guess (default: 1000)",
+    )
+    g2p_parser.add_argument(
+        "--slice-offset",
+        type=int,
+        default=0,
+        help="Offset of held-out slice in lexicon database (default: 0)",
+    )
+    g2p_parser.add_argument(
+        "--workers",
+        type=int,
+        help="Number of benchmarks to run in parallel (default: 1)",
+        default=1,
+    )
+    g2p_parser.add_argument(
+        "--output", help="Path to write JSON report (default: stdout)"
+    )
+    g2p_parser.set_defaults(func=do_g2p)
+
+    # --------
+    # Pipeline
+    # --------
+    pipeline_parser = sub_parsers.add_parser(
+        "pipeline", help="Measure end-to-end text processing speed (JSON report)"
+    )
+    pipeline_parser.add_argument(
+        "--language",
+        action="append",
+        help="Language to benchmark (default: all in --sentences)",
+    )
+    pipeline_parser.add_argument(
+        "--sentences",
+        default=str(DEFAULT_SENTENCES_PATH),
+        help="File with lang|text|truth lines used to build corpora "
+        + "(default: test/test_sentences.txt)",
+    )
+    pipeline_parser.add_argument(
+        "--corpus",
+        action="append",
+        choices=PIPELINE_CORPORA,
+        help="Corpus to benchmark (default: all)",
+    )
+    pipeline_parser.add_argument(
+        "--api",
+        action="append",
+        choices=PIPELINE_APIS,
+        help="Entry point to benchmark (default: all)",
+    )
+    pipeline_parser.add_argument(
+        "--scale",
+        type=int,
+        default=20,
+        help="Number of items in each synthetic corpus (default: 20)",
+    )
+    pipeline_parser.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        help="Number of warm passes over each corpus (default: 3)",
+    )
+    pipeline_parser.add_argument(
+        "--seed", type=int, default=0, help="Seed for synthetic corpora (default: 0)"
+    )
+    pipeline_parser.add_argument(
+        "--workers",
+        type=int,
+        help="Number of benchmarks to run in parallel (default: 1)",
+        default=1,
+    )
+    pipeline_parser.add_argument(
+        "--baseline", help="Report from a previous run to compare against"
+    )
+    pipeline_parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.1,
+        help="Allowed slowdown relative to baseline (default: 0.1)",
+    )
+    pipeline_parser.add_argument(
+        "--output", help="Path to write JSON report (default: stdout)"
+    )
+    pipeline_parser.set_defaults(func=do_pipeline)
+
+    # ----------------
+    # Shared arguments
+    # ----------------
+    for sub_parser in [g2p_parser, pipeline_parser]:
+        sub_parser.add_argument(
+            "--debug", action="store_true", help="Print DEBUG messages to console"
+        )
+
+    args = parser.parse_args()
+
+    if args.debug:
+        logging.basicConfig(level=logging.DEBUG)
+    else:
+        logging.basicConfig(level=logging.INFO)
+
+    _LOGGER.debug(args)
+
+    args.func(args)
+
+
+# -----------------------------------------------------------------------------
+
+
+def do_g2p(args):
+    """Measure speed, memory, and phoneme error rate of g2p engines.
+
+    Each (language, engine) pair is run in a fresh process, so model load
+    time and memory are not affected by other models.
+    """
+    langs = [resolve_lang(lang) for lang in args.language or sorted(KNOWN_LANGS)]
+    langs = list(dict.fromkeys(langs))  # en-gb -> en-us
+    engines = args.engine or G2P_ENGINES
+
+    tasks = []
+    for lang in langs:
+        lang_dir = find_lang_dir(lang)
+        if lang_dir is None:
+            _LOGGER.debug("(%s) no language directory", lang)
+            continue
+
+        lang_dir = Path(lang_dir) / args.model_prefix
+        if args.lexicon:
+            lexicon = load_lexicon(args.lexicon, max_words=args.max_words)
+        else:
+            lexicon = load_lexicon_db(
+                lang_dir / "lexicon.db",
+                max_words=args.max_words,
+                offset=args.slice_offset,
+            )
+
+        if not lexicon:
+            _LOGGER.warning("(%s) no lexicon to compare against", lang)
+            continue
+
+        for engine in engines:
+            if get_g2p_model_path(lang_dir, engine) is None:
+                _LOGGER.debug("(%s) no model for engine %s", lang, engine)
+                continue
+
+            tasks.append((lang, engine, lang_dir, lexicon))
+
+    with multiprocessing.Pool(processes=args.workers, maxtasksperchild=1) as pool:
+        results = list(pool.imap(_bench_g2p_task, tasks))
+
+    report = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "gruut_version": __version__,
+        "python_version": platform.python_version(),
+        "platform": platform.platform(),
+        "model_prefix": args.model_prefix,
+        "results": results,
+    }
+
+    # Summary
+    print(
+        "language",
+        "engine",
+        "words",
+        "words/sec",
+        "p50 ms",
+        "p99 ms",
+        "load sec",
+        "RSS MB",
+        "PER",
+        sep="\t",
+        file=sys.stderr,
+    )
+    for result in results:
+        print(
+            result["language"],
+            result["engine"],
+            result["words"],
+            round(result["words_per_second"], 2),
+            round(result["latency_ms"]["p50"], 3),
+            round(result["latency_ms"]["p99"], 3),
+            round(result["load_seconds"], 3),
+            round(result["rss_mb"]["after"], 1),
+            round(result["per"], 4),
+            sep="\t",
+            file=sys.stderr,
+        )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output_file:
+            json.dump(report, output_file, indent=4, ensure_ascii=False)
+    else:
+        json.dump(report, sys.stdout, indent=4, ensure_ascii=False)
+        print("")
+
+
+def _bench_g2p_task(
+    task: typing.Tuple[str, str, Path, LEXICON_TYPE]
+) -> typing.Dict[str, typing.Any]:
+    """Run g2p benchmark for one language and engine (in a worker process)"""
+    lang, engine, lang_dir, lexicon = task
+    _LOGGER.debug("(%s) benchmarking %s", lang, engine)
+
+    result: typing.Dict[str, typing.Any] = {
+        "language": lang,
+        "engine": engine,
+        "model": str(get_g2p_model_path(lang_dir, engine)),
+    }
+    result.update(bench_g2p(get_guesser(lang_dir, engine), lexicon, engine=engine))
+
+    return result
+
+
+def get_g2p_model_path(lang_dir: Path, engine: str) -> typing.Optional[Path]:
+    """Path to model file for a g2p engine, or None if it doesn't exist"""
+    engine = engine.split("+", maxsplit=1)[0]
+    if engine == "crf":
+        model_path = lang_dir / "g2p" / "model.crf"
+    elif engine == "fst":
+        model_path = lang_dir / "g2p" / "graph.npz"
+    else:
+        raise ValueError(f"Unknown engine: {engine}")
+
+    if model_path.is_file():
+        return model_path
+
+    return None
+
+
+def get_guesser(lang_dir: Path, engine: str) -> GUESSER_TYPE:
+    """Create guesser for a g2p engine (model loads on first use)"""
+    model_path = get_g2p_model_path(lang_dir, engine)
+    assert model_path is not None, f"No model for {engine} in {lang_dir}"
+
+    guess_phonemes: GUESSER_TYPE
+    if engine.startswith("fst"):
+        guess_phonemes = DelayedPhonetisaurusGraph(model_path, transform_func=str.lower)
+    else:
+        guess_phonemes = DelayedGraphemesToPhonemes(
+            model_path, transform_func=str.lower
+        )
+
+    if engine.endswith("+cache"):
+        guess_phonemes = CachedGuesser(guess_phonemes)
+
+    return guess_phonemes
+
+
+class CachedGuesser:
+    """Caches guesses for words in an LRU cache"""
+
+    def __init__(self, guess_phonemes: GUESSER_TYPE, max_size: int = 100000):
+        self.guess_phonemes = guess_phonemes
+        self.cache = LRUCache(max_size=max_size)
+
+    def __call__(self, word: str) -> typing.Optional[PHONEMES_TYPE]:
+        phonemes = self.cache.get(word, _NOT_CACHED)
+        if phonemes is _NOT_CACHED:
+            phonemes = self.guess_phonemes(word)
+            self.cache.put(word, phonemes)
+
+        return typing.cast(typing.Optional[PHONEMES_TYPE], phonemes)
+
+
+def bench_g2p(
+    guess_phonemes: GUESSER_TYPE, lexicon: LEXICON_TYPE, engine: str = ""
+) -> typing.Dict[str, typing.Any]:
+    """Guess every word in the lexicon and compare to its actual phonemes.
+
+    The model is loaded by guessing the first word, and timed separately.
+    Cached engines ("+cache") are timed on a second, warm pass.
+    """
+    assert lexicon, "Empty lexicon"
+    words = list(lexicon)
+    rss_before = get_rss_bytes()
+
+    start_time = time.perf_counter()
+    guess_phonemes(words[0])
+    load_seconds = time.perf_counter() - start_time
+    rss_after_load = get_rss_bytes()
+
+    num_passes = 2 if engine.endswith("+cache") else 1
+    for _ in range(num_passes):
+        guesses: typing.Dict[str, typing.Optional[PHONEMES_TYPE]] = {}
+        latencies: typing.List[float] = []
+
+        total_start_time = time.perf_counter()
+        for word in words:
+            start_time = time.perf_counter()
+            guesses[word] = guess_phonemes(word)
+            latencies.append(time.perf_counter() - start_time)
+
+        total_seconds = time.perf_counter() - total_start_time
+
+    # Phoneme error rate
+    num_errors = 0
+    num_phonemes = 0
+    num_missing = 0
+
+    for word, actual_phonemes in lexicon.items():
+        guessed_phonemes = guesses[word] or []
+        if not guessed_phonemes:
+            num_missing += 1
+
+        num_errors += edit_distance(guessed_phonemes, actual_phonemes)
+        num_phonemes += len(actual_phonemes)
+
+    latencies_ms = sorted(seconds * 1000 for seconds in latencies)
+
+    return {
+        "words": len(words),
+        "missing": num_missing,
+        "errors": num_errors,
+        "phonemes": num_phonemes,
+        "per": num_errors / max(1, num_phonemes),
+        "load_seconds": load_seconds,
+        "words_per_second": len(words) / total_seconds,
+        "latency_ms": {
+            "mean": sum(latencies_ms) / len(latencies_ms),
+            "p50": percentile(latencies_ms, 50),
+            "p99": percentile(latencies_ms, 99),
+            "max": latencies_ms[-1],
+        },
+        "rss_mb": {
+            "before": rss_before / _MB,
+            "after": rss_after_load / _MB,
+            "peak": get_peak_rss_bytes() / _MB,
+        },
+    }
+
+
+# -----------------------------------------------------------------------------
+
+
+def do_pipeline(args):
+    """Measure end-to-end throughput of gruut.sentences and TextProcessor.process.
+
+    Each (language, corpus, api) is run in a fresh process, so cold latency
+    includes loading settings and models. Exits with an error if any metric is
+    slower than the baseline by more than the tolerance.
+    """
+    seed_sentences = load_test_sentences(args.sentences)
+    if args.language:
+        langs = [resolve_lang(lang) for lang in args.language]
+    else:
+        langs = sorted(seed_sentences)
+
+    tasks = []
+    for lang in langs:
+        lang_sentences = seed_sentences.get(lang)
+        if not lang_sentences:
+            _LOGGER.warning("(%s) no sentences in %s", lang, args.sentences)
+            continue
+
+        corpora = make_corpora(
+            lang_sentences, num_items=args.scale, rng=random.Random(args.seed)
+        )
+        for corpus_name in args.corpus or PIPELINE_CORPORA:
+            for api in args.api or PIPELINE_APIS:
+                tasks.append(
+                    (lang, corpus_name, api, corpora[corpus_name], args.repeat)
+                )
+
+    with multiprocessing.Pool(processes=args.workers, maxtasksperchild=1) as pool:
+        results = list(pool.imap(_bench_pipeline_task, tasks))
+
+    report = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "gruut_version": __version__,
+        "python_version": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+    # Summary
+    print(
+        "language",
+        "corpus",
+        "api",
+        "chars/sec",
+        "sentences/sec",
+        "cold ms",
+        "p50 ms",
+        "p99 ms",
+        "peak RSS MB",
+        "bytes/word",
+        sep="\t",
+        file=sys.stderr,
+    )
+    for result in results:
+        print(
+            result["language"],
+            result["corpus"],
+            result["api"],
+            round(result["chars_per_second"], 2),
+            round(result["sentences_per_second"], 2),
+            round(result["cold_ms"], 3),
+            round(result["latency_ms"]["p50"], 3),
+            round(result["latency_ms"]["p99"], 3),
+            round(result["rss_mb"]["peak"], 1),
+            round(result["memory"]["retained_bytes_per_word"], 1),
+            sep="\t",
+            file=sys.stderr,
+        )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output_file:
+            json.dump(report, output_file, indent=4, ensure_ascii=False)
+    else:
+        json.dump(report, sys.stdout, indent=4, ensure_ascii=False)
+        print("")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as baseline_file:
+            baseline = json.load(baseline_file)
+
+        regressions = compare_to_baseline(report, baseline, tolerance=args.tolerance)
+        for regression in regressions:
+            print("REGRESSION:", regression, file=sys.stderr)
+
+        if regressions:
+            sys.exit(1)
+
+
+def _bench_pipeline_task(
+    task: typing.Tuple[str, str, str, typing.Dict[str, typing.Any], int]
+) -> typing.Dict[str, typing.Any]:
+    """Run pipeline benchmark for one corpus (in a worker process)"""
+    lang, corpus_name, api, corpus, repeat = task
+    _LOGGER.debug("(%s) benchmarking %s on %s corpus", lang, api, corpus_name)
+
+    result: typing.Dict[str, typing.Any] = {
+        "language": lang,
+        "corpus": corpus_name,
+        "api": api,
+    }
+    result.update(
+        bench_pipeline(
+            corpus["items"], lang=lang, ssml=corpus["ssml"], api=api, repeat=repeat
+        )
+    )
+
+    return result
+
+
+def bench_pipeline(
+    items: typing.Sequence[str],
+    lang: str = "en_US",
+    ssml: bool = False,
+    api: str = "sentences",
+    repeat: int = 1,
+) -> typing.Dict[str, typing.Any]:
+    """Process every item in a corpus and measure throughput.
+
+    The first item is processed alone and timed as the cold latency. Warm
+    passes then process every item repeat times.
+    """
+    assert items, "Empty corpus"
+
+    if api == "sentences":
+
+        def run(text: str) -> typing.Any:
+            return list(gruut.sentences(text, lang=lang, ssml=ssml))
+
+    elif api == "graph":
+        # Always through the graph, even for plain text
+        text_processor = TextProcessor(default_lang=lang)
+
+        def run(text: str) -> typing.Any:
+            graph, root = text_processor.process(text, lang=lang, ssml=ssml)
+            return text_processor.sentences(graph, root)
+
+    elif api == "process":
+        text_processor = TextProcessor(default_lang=lang)
+
+        def run(text: str) -> typing.Any:
+            graph, _root = text_processor.process(text, lang=lang, ssml=ssml)
+            return graph
+
+    else:
+        raise ValueError(f"Unknown api: {api}")
+
+    rss_before = get_rss_bytes()
+
+    start_time = time.perf_counter()
+    run(items[0])
+    cold_seconds = time.perf_counter() - start_time
+
+    num_chars = 0
+    num_sentences = 0
+    latencies: typing.List[float] = []
+
+    total_start_time = time.perf_counter()
+    for _ in range(max(1, repeat)):
+        for item in items:
+            start_time = time.perf_counter()
+            num_sentences += count_sentences_words(run(item))[0]
+            latencies.append(time.perf_counter() - start_time)
+            num_chars += len(item)
+
+    total_seconds = time.perf_counter() - total_start_time
+    latencies_ms = sorted(seconds * 1000 for seconds in latencies)
+
+    result = {
+        "items": len(items),
+        "chars": num_chars,
+        "sentences": num_sentences,
+        "cold_ms": cold_seconds * 1000,
+        "chars_per_second": num_chars / total_seconds,
+        "sentences_per_second": num_sentences / total_seconds,
+        "latency_ms": {
+            "mean": sum(latencies_ms) / len(latencies_ms),
+            "p50": percentile(latencies_ms, 50),
+            "p99": percentile(latencies_ms, 99),
+            "max": latencies_ms[-1],
+        },
+        "rss_mb": {
+            "before": rss_before / _MB,
+            "after": get_rss_bytes() / _MB,
+            "peak": get_peak_rss_bytes() / _MB,
+        },
+    }
+
+    # After warm passes, so caches don't count
+    result["memory"] = measure_memory(run, items)
+
+    return result
+
+
+def count_sentences_words(output: typing.Any) -> typing.Tuple[int, int]:
+    """Number of sentences and words in a list of sentences or a text graph"""
+    if isinstance(output, list):
+        return len(output), sum(len(sentence.words) for sentence in output)
+
+    num_sentences, num_words = 0, 0
+    for node in output.nodes:
+        node_data = output.nodes[node][DATA_PROP]
+        if isinstance(node_data, SentenceNode):
+            num_sentences += 1
+        elif isinstance(node_data, WordNode):
+            num_words += 1
+
+    return num_sentences, num_words
+
+
+def measure_memory(
+    run: typing.Callable[[str], typing.Any], items: typing.Sequence[str]
+) -> typing.Dict[str, typing.Any]:
+    """Trace memory while processing every item and keeping the outputs.
+
+    Retained bytes/blocks are still held by the outputs (sentences, words, or
+    graph nodes) at the end. Peak bytes also include temporary allocations.
+    """
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+
+    try:
+        if hasattr(tracemalloc, "reset_peak"):
+            # Python 3.9+
+            tracemalloc.reset_peak()
+
+        # Graphs have reference cycles, so only count what's still reachable
+        gc.collect()
+        snapshot_before = tracemalloc.take_snapshot()
+        current_before, _peak_before = tracemalloc.get_traced_memory()
+
+        outputs = [run(item) for item in items]
+
+        _current_after, peak_after = tracemalloc.get_traced_memory()
+        gc.collect()
+        snapshot_after = tracemalloc.take_snapshot()
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+
+    # Don't count the snapshots themselves
+    trace_filters = [tracemalloc.Filter(False, tracemalloc.__file__)]
+    stats = snapshot_after.filter_traces(trace_filters).compare_to(
+        snapshot_before.filter_traces(trace_filters), "filename"
+    )
+
+    retained_bytes = sum(stat.size_diff for stat in stats)
+    retained_blocks = sum(stat.count_diff for stat in stats)
+
+    num_words = sum(count_sentences_words(output)[1] for output in outputs)
+    per_word = max(1, num_words)
+
+    return {
+        "words": num_words,
+        "retained_bytes_per_word": retained_bytes / per_word,
+        "retained_blocks_per_word": retained_blocks / per_word,
+        "peak_bytes_per_word": max(0, peak_after - current_before) / per_word,
+    }
+
+
+def compare_to_baseline(
+    report: typing.Dict[str, typing.Any],
+    baseline: typing.Dict[str, typing.Any],
+    tolerance: float = 0.1,
+) -> typing.List[str]:
+    """Describe every metric that is worse than baseline by more than tolerance"""
+
+    def result_key(result):
+        return (result["language"], result["corpus"], result["api"])
+
+    baseline_results = {result_key(r): r for r in baseline.get("results", [])}
+    regressions: typing.List[str] = []
+
+    for result in report["results"]:
+        baseline_result = baseline_results.get(result_key(result))
+        if baseline_result is None:
+            continue
+
+        for metric in PIPELINE_METRICS:
+            baseline_value = baseline_result.get(metric)
+            if not baseline_value:
+                continue
+
+            value = result[metric]
+            if value < baseline_value * (1 - tolerance):
+                regressions.append(
+                    "{}: {:.2f} < {:.2f} ({:+.1%})".format(
+                        "/".join(result_key(result) + (metric,)),
+                        value,
+                        baseline_value,
+                        (value - baseline_value) / baseline_value,
+                    )
+                )
+
+    return regressions
+
+
+# -----------------------------------------------------------------------------
+
+
+def load_test_sentences(
+    sentences_path: typing.Union[str, Path]
+) -> typing.Dict[str, typing.List[str]]:
+    """Load lang|text|truth lines (comments start with #)"""
+    sentences: typing.Dict[str, typing.List[str]] = {}
+
+    with open(sentences_path, "r", encoding="utf-8") as sentences_file:
+        for line in sentences_file:
+            line = line.strip()
+            if (not line) or line.startswith("#") or ("|" not in line):
+                continue
+
+            lang, text = line.split("|", maxsplit=2)[:2]
+            sentences.setdefault(resolve_lang(lang), []).append(text)
+
+    return sentences
+
+
+def make_corpora(
+    seed_sentences: typing.Sequence[str],
+    num_items: int = 20,
+    rng: typing.Optional[random.Random] = None,
+) -> typing.Dict[str, typing.Dict[str, typing.Any]]:
+    """Build benchmark corpora from a few sentences.
+
+    Returns:
+        corpus name -> {"items": [text], "ssml": bool}
+
+    Corpora:
+        prose: seed sentences followed by sentences of shuffled seed words
+        numbers: sentences with numbers, currency, dates, and times
+        ssml: documents with paragraphs, marks, and breaks
+        long: a few very long paragraphs
+    """
+    rng = rng or random.Random(0)
+    words = [
+        word.strip('.,;:!?"“”«»')
+        for sentence in seed_sentences
+        for word in sentence.split()
+    ]
+    words = [word for word in words if word] or ["test"]
+
+    def make_sentence(min_words: int = 5, max_words: int = 15) -> str:
+        sentence_words = [
+            rng.choice(words) for _ in range(rng.randint(min_words, max_words))
+        ]
+        return " ".join(sentence_words) + rng.choice([".", ".", "?", "!"])
+
+    def make_number_sentence() -> str:
+        number_texts = [
+            str(rng.randint(0, 1000000)),
+            f"{rng.randint(1, 999)}.{rng.randint(0, 99):02}",
+            f"${rng.randint(1, 5000)}",
+            f"{rng.randint(1, 12)}/{rng.randint(1, 28)}/{rng.randint(1900, 2099)}",
+            f"{rng.randint(1, 12)}:{rng.randint(0, 59):02}",
+            str(rng.randint(1900, 2099)),
+        ]
+        sentence_words = [rng.choice(words) for _ in range(rng.randint(3, 8))]
+        for number_text in rng.sample(number_texts, 3):
+            sentence_words.insert(rng.randint(0, len(sentence_words)), number_text)
+
+        return " ".join(sentence_words) + "."
+
+    def make_ssml_document() -> str:
+        paragraphs = []
+        mark_idx = 0
+        for _ in range(rng.randint(1, 3)):
+            paragraph_items = []
+            for _ in range(rng.randint(1, 4)):
+                paragraph_items.append(
+                    f'<s>{make_sentence()}</s><mark name="m{mark_idx}" />'
+                    + f'<break time="{rng.randint(1, 10) * 50}ms" />'
+                )
+                mark_idx += 1
+
+            paragraphs.append("<p>" + "".join(paragraph_items) + "</p>")
+
+        return "<speak>" + "".join(paragraphs) + "</speak>"
+
+    prose = list(seed_sentences) + [
+        make_sentence() for _ in range(max(0, num_items - len(seed_sentences)))
+    ]
+    long_paragraphs = [
+        " ".join(make_sentence() for _ in range(100))
+        for _ in range(max(1, num_items // 10))
+    ]
+
+    return {
+        "prose": {"items": prose, "ssml": False},
+        "numbers": {
+            "items": [make_number_sentence() for _ in range(num_items)],
+            "ssml": False,
+        },
+        "ssml": {
+            "items": [make_ssml_document() for _ in range(num_items)],
+            "ssml": True,
+        },
+        "long": {"items": long_paragraphs, "ssml": False},
+    }
+
+
+# -----------------------------------------------------------------------------
+
+
+def load_lexicon(
+    lexicon_path: typing.Union[str, Path], max_words: int = 0
+) -> LEXICON_TYPE:
+    """Load first pronunciation of each word from a text lexicon"""
+    lexicon: LEXICON_TYPE = {}
+
+    with open(lexicon_path, "r", encoding="utf-8") as lexicon_file:
+        for line in lexicon_file:
+            line = line.strip()
+            if (not line) or (" " not in line):
+                continue
+
+            word, phonemes_str = line.split(maxsplit=1)
+            if word in lexicon:
+                continue
+
+            lexicon[word] = phonemes_str.split()
+            if (max_words > 0) and (len(lexicon) >= max_words):
+                break
+
+    return lexicon
+
+
+def load_lexicon_db(db_path: Path, max_words: int = 0, offset: int = 0) -> LEXICON_TYPE:
+    """Load first pronunciation of words from a lexicon database.
+
+    Every Nth word (starting at offset) is taken, so the slice is spread evenly
+    over the database and can be held out when training models.
+    """
+    lexicon: LEXICON_TYPE = {}
+    if not db_path.is_file():
+        return lexicon
+
+    db_conn = sqlite3.connect(str(db_path))
+    try:
+        num_words = db_conn.execute(
+            "SELECT COUNT(DISTINCT word) FROM word_phonemes"
+        ).fetchone()[0]
+        word_step = max(1, num_words // max_words) if max_words > 0 else 1
+
+        cursor = db_conn.execute(
+            "SELECT word, phonemes FROM word_phonemes ORDER BY word, pron_order"
+        )
+
+        word_idx = -1
+        last_word: typing.Optional[str] = None
+        for word, phonemes_str in cursor:
+            if word == last_word:
+                # Only first pronunciation
+                continue
+
+            last_word = word
+            word_idx += 1
+            if (word_idx % word_step) != (offset % word_step):
+                continue
+
+            lexicon[word] = phonemes_str.split()
+            if (max_words > 0) and (len(lexicon) >= max_words):
+                break
+    finally:
+        db_conn.close()
+
+    return lexicon
+
+
+def percentile(sorted_values: typing.Sequence[float], percent: float) -> float:
+    """Nearest-rank percentile of sorted values"""
+    if not sorted_values:
+        return 0.0
+
+    rank = int(math.ceil((percent / 100) * len(sorted_values)))
+    return sorted_values[max(0, min(len(sorted_values), rank) - 1)]
+
+
+def get_rss_bytes() -> int:
+    """Current resident set size of this process (0 if unknown)"""
+    try:
+        with open("/proc/self/statm", "r") as statm_file:
+            return int(statm_file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        # Not Linux
+        return get_peak_rss_bytes()
+
+
+def get_peak_rss_bytes() -> int:
+    """Peak resident set size of this process (0 if unknown)"""
+    try:
+        import resource
+    except ImportError:
+        # Windows
+        return 0
+
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        # Bytes
+        return max_rss
+
+    # Kilobytes
+    return max_rss * 1024
+
+
+def edit_distance(guessed: typing.Sequence[str], actual: typing.Sequence[str]) -> int:
+    """Levenshtein distance between phoneme sequences"""
+    distances = list(range(len(actual) + 1))
+    for i, guessed_phoneme in enumerate(guessed, start=1):
+        prev_diagonal, distances[0] = distances[0], i
+        for j, actual_phoneme in enumerate(actual, start=1):
+            prev_diagonal, distances[j] = (
+                distances[j],
+                min(
+                    distances[j] + 1,
+                    distances[j - 1] + 1,
+                    prev_diagonal + (guessed_phoneme != actual_phoneme),
+                ),
+            )
+
+    return distances[-1]
+
+
+# -----------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,15 @@
 """Shared classes, types, and enums"""
+import functools
 import itertools
 import operator
 import re
 import typing
 import xml.etree.ElementTree as etree
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 from datetime import datetime
 from decimal import Decimal
 from enum import Enum
 
-import babel
-import babel.core
-import babel.numbers
-
 # alias -> full language name
 LANG_ALIASES = {
     "ar": "ar",
@@ -250,7 +247,39 @@ class Lexeme:
     roles: typing.Optional[typing.Set[str]] = None
 
 
-@dataclass
+if typing.TYPE_CHECKING:
+    # Type checkers only understand @dataclass
+    from dataclasses import dataclass as slotted_dataclass
+else:
+
+    def slotted_dataclass(cls):
+        """Like @dataclass, but instances use __slots__ instead of a __dict__.
+
+        Same as @dataclass(slots=True) from Python 3.10, which isn't available on
+        older versions. Every subclass must also be slotted to avoid a __dict__.
+        """
+        cls = dataclass(cls)
+        field_names = [f.name for f in fields(cls)]
+
+        # Slots from base classes can't be repeated
+        base_slots: typing.Set[str] = set()
+        for base_cls in cls.__mro__[1:]:
+            base_slots.update(getattr(base_cls, "__slots__", ()))
+
+        cls_dict = dict(cls.__dict__)
+        cls_dict["__slots__"] = tuple(n for n in field_names if n not in base_slots)
+
+        # Defaults are already in __init__ and would conflict with slots
+        for name in itertools.chain(field_names, ["__dict__", "__weakref__"]):
+            cls_dict.pop(name, None)
+
+        slotted_cls = type(cls)(cls.__name__, cls.__bases__, cls_dict)
+        slotted_cls.__qualname__ = cls.__qualname__
+
+        return slotted_cls
+
+
+@slotted_dataclass
 class Node:
     """Base class of all text processing graph nodes"""
 
@@ -261,14 +290,14 @@ class Node:
     implicit: bool = False
 
 
-@dataclass
+@slotted_dataclass
 class IgnoreNode(Node):
     """Node should be ignored"""
 
     pass
 
 
-@dataclass
+@slotted_dataclass
 class BreakNode(Node):
     """Represents a user-specified break"""
 
@@ -286,7 +315,7 @@ class BreakNode(Node):
         return 0
 
 
-@dataclass
+@slotted_dataclass
 class MarkNode(Node):
     """Represents a user-specified mark"""
 
@@ -297,7 +326,7 @@ class MarkNode(Node):
     """Text inside the mark"""
 
 
-@dataclass
+@slotted_dataclass
 class WordNode(Node):
     """Represents a single word"""
 
@@ -327,8 +356,11 @@ class WordNode(Node):
 
     is_from_broken_word: bool = False
 
+    # From a verbalized number, date, time, or currency amount
+    is_verbalized: bool = False
 
-@dataclass
+
+@slotted_dataclass
 class BreakWordNode(Node):
     """Represents a major/minor break in the text"""
 
@@ -337,7 +369,7 @@ class BreakWordNode(Node):
     text_with_ws: str = ""
 
 
-@dataclass
+@slotted_dataclass
 class PunctuationWordNode(Node):
     """Represents a punctuation marker in the text"""
 
@@ -345,21 +377,21 @@ class PunctuationWordNode(Node):
     text_with_ws: str = ""
 
 
-@dataclass
+@slotted_dataclass
 class SentenceNode(Node):
     """Represents a sentence with WordNodes under it"""
 
     pass
 
 
-@dataclass
+@slotted_dataclass
 class ParagraphNode(Node):
     """Represents a paragraph with SentenceNodes under it"""
 
     pass
 
 
-@dataclass
+@slotted_dataclass
 class SpeakNode(Node):
     """Top-level node for SSML"""
 
@@ -369,7 +401,7 @@ class SpeakNode(Node):
 # -----------------------------------------------------------------------------
 
 
-@dataclass
+@slotted_dataclass
 class Word:
     """Processed word from a Sentence"""
 
@@ -443,7 +475,7 @@ class Word:
         self.leading_ws, self.trailing_ws = default_get_whitespace(self.text_with_ws)
 
 
-@dataclass
+@slotted_dataclass
 class Sentence:
     """Processed sentence from a document"""
 
@@ -540,6 +572,27 @@ class EndElement:
     element: etree.Element
 
 
+@dataclass
+class StageTiming:
+    """Timing record for one call of a TextProcessor pipeline stage"""
+
+    stage: str
+    """Name of stage (e.g., split_replacements, process_sentence)"""
+
+    seconds: float
+    """Wall-clock time spent in stage"""
+
+    leaves_visited: int = 0
+    """Number of leaves (words) the stage looked at"""
+
+    leaves_changed: int = 0
+    """Number of leaves the stage split, transformed, or phonemized"""
+
+
+# Receives a timing record for each pipeline stage call (see TextProcessor)
+STAGE_TIMING_CALLBACK = typing.Callable[[StageTiming], None]
+
+
 # -----------------------------------------------------------------------------
 
 
@@ -583,8 +636,325 @@ def maybe_compile_regex(
     return re.compile(str_or_pattern)
 
 
+# Numbered backreferences and conditionals can't be moved into a combined regex
+NUMBERED_GROUP_REFERENCE_PATTERN = re.compile(r"(?<!\\)(?:\\\\)*\\[1-9]|\(\?\(")
+NAMED_GROUP_PATTERN = re.compile(r"\(\?P([<=])(\w+)")
+
+
+def combine_regexes(
+    str_or_patterns: typing.Sequence[typing.Union[str, REGEX_PATTERN]],
+    group_prefix: typing.Optional[str] = None,
+) -> typing.Optional[REGEX_PATTERN]:
+    """Combine patterns into a single alternation, or None if not possible.
+
+    With group_prefix, each alternative is wrapped in a named group
+    (e.g., prefix0, prefix1) so the matching pattern can be identified with
+    match.lastgroup. Named groups inside the patterns are renamed to stay unique.
+    """
+    if not str_or_patterns:
+        return None
+
+    patterns = [maybe_compile_regex(p) for p in str_or_patterns]
+    all_flags = {pattern.flags for pattern in patterns}
+    if len(all_flags) != 1:
+        return None
+
+    def rename_group(match: REGEX_MATCH, pattern_idx: int) -> str:
+        """(?P<name>...) -> (?P<name__0>...), (?P=name) -> (?P=name__0)"""
+        return f"(?P{match.group(1)}{match.group(2)}__{pattern_idx}"
+
+    alternatives: typing.List[str] = []
+    for pattern_idx, pattern in enumerate(patterns):
+        pattern_str = pattern.pattern
+        if (not isinstance(pattern_str, str)) or (
+            NUMBERED_GROUP_REFERENCE_PATTERN.search(pattern_str) is not None
+        ):
+            return None
+
+        # Keep named groups unique across patterns
+        pattern_str = NAMED_GROUP_PATTERN.sub(
+            functools.partial(rename_group, pattern_idx=pattern_idx), pattern_str
+        )
+
+        if group_prefix is None:
+            alternatives.append(f"(?:{pattern_str})")
+        else:
+            alternatives.append(f"(?P<{group_prefix}{pattern_idx}>{pattern_str})")
+
+    try:
+        return re.compile("|".join(alternatives), all_flags.pop())
+    except re.error:
+        # Inline flags, etc.
+        return None
+
+
 # -----------------------------------------------------------------------------
 
+# 4/1/1999, 01.04.1999, 1999-04-01
+NUMERIC_DATE_PATTERN = re.compile(r"^([0-9]{1,4})([-./])([0-9]{1,2})\2([0-9]{1,4})$")
+
+# 1,000.50 or 1.000.000 (never dates)
+PLAIN_NUMBER_PATTERN = re.compile(
+    r"^\W*[-+]?(?:[0-9]{1,3}(?:[,.'\s][0-9]{3})+|[0-9]+)(?:[.,][0-9]+)?\W*$"
+)
+
+DIGIT_RUN_PATTERN = re.compile(r"\d+")
+
+# Separates day, month, and year around a month name (1-Apr-1999, April 1, 1999)
+DATE_SEPARATOR = r"(?:\s*[-/.,]\s*|\s+)"
+
+
+class DateShapes:
+    """Recognizes common date formats for a locale before dateparser is called.
+
+    Calling with a word's text returns (maybe_date, date):
+
+    * (False, None) - text can't be a date (dateparser is not needed)
+    * (True, date) - numeric D/M/Y, ISO, or full month name date parsed directly
+    * (True, None) - may be a date, but dateparser has to decide
+
+    Field order matches dateparser: the 4-digit year comes first or last, and
+    day/month are ordered as in date_order with the year removed. So 4/1/1999
+    and 1999-4-1 are both April 1st for MDY, but January 4th for DMY.
+    """
+
+    def __init__(self, babel_locale: str, date_order: typing.Optional[str] = None):
+        self.babel_locale = babel_locale
+        self.date_order = date_order
+
+        # Month name (lower-cased) -> month number
+        self.months: typing.Dict[str, int] = {}
+
+        self._month_patterns: typing.List[
+            typing.Tuple[REGEX_PATTERN, typing.Tuple[str, str, str]]
+        ] = []
+        self._loaded = False
+        self._enabled = True
+
+    def __call__(self, text: str) -> typing.Tuple[bool, typing.Optional[datetime]]:
+        if not self._loaded:
+            self._load()
+
+        if not self._enabled:
+            # Leave everything to dateparser
+            return True, None
+
+        match = NUMERIC_DATE_PATTERN.match(text)
+        if match is not None:
+            first, _sep, middle, last = match.groups()
+            return True, self._parse_numeric(first, middle, last)
+
+        for pattern, field_order in self._month_patterns:
+            match = pattern.match(text)
+            if match is not None:
+                fields = dict(zip(field_order, match.groups()))
+                month = self.months[fields["M"].lower()]
+                return True, self._make_date(fields["Y"], month, fields["D"])
+
+        if PLAIN_NUMBER_PATTERN.match(text) is not None:
+            return False, None
+
+        # Day, month, and year are needed (month may be a name)
+        num_digit_runs = len(DIGIT_RUN_PATTERN.findall(text))
+        if (num_digit_runs >= 3) or (
+            (num_digit_runs == 2) and any(c.isalpha() for c in text)
+        ):
+            return True, None
+
+        return False, None
+
+    def _parse_numeric(
+        self, first: str, middle: str, last: str
+    ) -> typing.Optional[datetime]:
+        assert self.date_order is not None
+
+        if len(first) == 4:
+            year_str, day_month = first, (middle, last)
+        elif (len(last) == 4) and (not self.date_order.startswith("Y")):
+            # dateparser is inconsistent with a trailing year in YMD locales
+            year_str, day_month = last, (first, middle)
+        else:
+            # Two digit years, etc.
+            return None
+
+        if len(day_month[1]) > 2:
+            return None
+
+        if self.date_order.index("D") < self.date_order.index("M"):
+            day_str, month_str = day_month
+        else:
+            month_str, day_str = day_month
+
+        return self._make_date(year_str, int(month_str), day_str)
+
+    def _make_date(
+        self, year_str: str, month: int, day_str: str
+    ) -> typing.Optional[datetime]:
+        if len(year_str) != 4:
+            return None
+
+        try:
+            return datetime(int(year_str), month, int(day_str))
+        except ValueError:
+            # Invalid date (dateparser may swap day and month)
+            return None
+
+    def _load(self):
+        try:
+            import babel
+
+            locale_obj = babel.Locale.parse(self.babel_locale)
+
+            if self.date_order is None:
+                # M/d/yy -> MDY
+                short_pattern = locale_obj.date_formats["short"].pattern
+                self.date_order = "".join(
+                    sorted("DMY", key=lambda c: short_pattern.upper().index(c))
+                )
+
+            # Only full names, since abbreviations differ from dateparser's
+            for context in ("format", "stand-alone"):
+                for month_num, month_name in locale_obj.months[context][
+                    "wide"
+                ].items():
+                    month_name = month_name.strip().lower()
+                    if month_name and (not has_digit(month_name)):
+                        self.months.setdefault(month_name, month_num)
+        except Exception:
+            # Unknown locale, so leave everything to dateparser
+            self._enabled = False
+        else:
+            if self.months:
+                month_str = "|".join(
+                    re.escape(m) for m in sorted(self.months, key=len, reverse=True)
+                )
+                day, month, year = (
+                    r"([0-9]{1,2})",
+                    f"({month_str})",
+                    r"([0-9]{4})",
+                )
+                sep = DATE_SEPARATOR
+
+                # 1-Apr-1999, Apr-1-1999, 1999-Apr-01
+                self._month_patterns = [
+                    (
+                        re.compile(f"^{day}{sep}{month}{sep}{year}$", re.IGNORECASE),
+                        ("D", "M", "Y"),
+                    ),
+                    (
+                        re.compile(f"^{month}{sep}{day}{sep}{year}$", re.IGNORECASE),
+                        ("M", "D", "Y"),
+                    ),
+                    (
+                        re.compile(f"^{year}{sep}{month}{sep}{day}$", re.IGNORECASE),
+                        ("Y", "M", "D"),
+                    ),
+                ]
+
+        self._loaded = True
+
+
+# -----------------------------------------------------------------------------
+
+# Everything decimal.Decimal accepts after stripping whitespace and underscores
+DECIMAL_STRING_PATTERN = re.compile(
+    r"^[-+]?(?:(?:\d+(?:\.\d*)?|\.\d+)(?:e[-+]?\d+)?|inf(?:inity)?|s?nan\d*)$",
+    re.IGNORECASE,
+)
+
+
+class NumberParser:
+    """Parses numbers and currency amounts like babel.numbers.parse_decimal.
+
+    The locale's group/decimal symbols are looked up once, and each string is
+    checked with a single regex instead of relying on exceptions. Currency
+    symbols are matched by prefix with one dictionary lookup per symbol length.
+    """
+
+    def __init__(
+        self, babel_locale: str, currency_symbols: typing.Sequence[str] = ()
+    ):
+        self.babel_locale = babel_locale
+
+        self.group_symbol = ","
+        self.decimal_symbol = "."
+
+        # Used when group symbol is a kind of space (see parse_decimal)
+        self._space_chars_pattern: typing.Optional[REGEX_PATTERN] = None
+
+        # symbol -> order in which it's tried
+        self._currency_order = {
+            symbol: symbol_idx for symbol_idx, symbol in enumerate(currency_symbols)
+        }
+        self._currency_lengths = sorted(
+            {len(symbol) for symbol in currency_symbols if symbol}, reverse=True
+        )
+
+        self._loaded = False
+
+    def __call__(self, text: str) -> typing.Optional[Decimal]:
+        """Parse text as a decimal number, or return None"""
+        if not self._loaded:
+            self._load()
+
+        if (
+            (self._space_chars_pattern is not None)
+            and (self.group_symbol not in text)
+            and (self._space_chars_pattern.search(text) is not None)
+        ):
+            # Other kinds of spaces take the place of the group symbol
+            text = self._space_chars_pattern.sub(self.group_symbol, text)
+
+        num_str = text.replace(self.group_symbol, "").replace(self.decimal_symbol, ".")
+        if DECIMAL_STRING_PATTERN.match(num_str.strip().replace("_", "")) is None:
+            return None
+
+        return Decimal(num_str)
+
+    def parse_currency(
+        self, text: str
+    ) -> typing.Optional[typing.Tuple[str, Decimal]]:
+        """Parse text as currency symbol + number, or return None"""
+        # Symbols that text starts with, in the order they would be tried
+        symbols = [
+            text[:symbol_len]
+            for symbol_len in self._currency_lengths
+            if text[:symbol_len] in self._currency_order
+        ]
+        symbols.sort(key=self._currency_order.__getitem__)
+
+        for symbol in symbols:
+            number = self(text[len(symbol) :])
+            if number is not None:
+                return symbol, number
+
+        return None
+
+    def _load(self):
+        try:
+            import babel.numbers
+
+            self.group_symbol = babel.numbers.get_group_symbol(self.babel_locale)
+            self.decimal_symbol = babel.numbers.get_decimal_symbol(self.babel_locale)
+
+            # Only in newer versions of babel
+            space_chars = getattr(babel.numbers, "SPACE_CHARS", None)
+            if space_chars and (self.group_symbol in space_chars):
+                self._space_chars_pattern = getattr(
+                    babel.numbers, "SPACE_CHARS_RE", None
+                )
+        except Exception:
+            # Unknown locale, so keep default symbols
+            pass
+
+        self._loaded = True
+
+
+# -----------------------------------------------------------------------------
+
+# Named groups of TextProcessorSettings.abbreviations_pattern
+ABBREVIATION_GROUP_PREFIX = "abbr"
+
 
 @dataclass
 class TextProcessorSettings:
@@ -627,15 +997,29 @@ class TextProcessorSettings:
     end_punctuations_pattern: typing.Optional[REGEX_TYPE] = None
     """Regex that overrides end_punctuations"""
 
+    any_punctuations_pattern: typing.Optional[REGEX_PATTERN] = None
+    """Regex that matches wherever begin/end punctuations do (combined if None)"""
+
     # Replacements/abbreviations
     replacements: typing.Sequence[typing.Tuple[REGEX_TYPE, str]] = field(
         default_factory=list
     )
     """Regex, replacement template pairs that are applied in order right after tokenization on each word"""
 
+    any_replacement_pattern: typing.Optional[REGEX_PATTERN] = None
+    """Regex that matches wherever any replacement would (combined if None)"""
+
     abbreviations: typing.Dict[REGEX_TYPE, str] = field(default_factory=dict)
     """Regex, replacement template pairs that may expand words after minor breaks are matched"""
 
+    abbreviations_pattern: typing.Optional[REGEX_PATTERN] = None
+    """Regex with a named group (abbr0, abbr1, ...) per abbreviation"""
+
+    abbreviation_rules: typing.List[typing.Tuple[REGEX_PATTERN, str]] = field(
+        default_factory=list
+    )
+    """Compiled abbreviations in order (indexed by abbreviations_pattern groups)"""
+
     spell_out_words: typing.Dict[str, str] = field(default_factory=dict)
     """Written form, spoken form pairs that are applied with interpret-as="spell-out" in <say-as>"""
 
@@ -676,9 +1060,15 @@ class TextProcessorSettings:
     currencies: typing.MutableMapping[str, str] = field(default_factory=dict)
     """Mapping from currency symbol ($) to currency name (USD)"""
 
+    load_currencies: bool = True
+    """True if currencies should be looked up from the babel locale when empty"""
+
     currency_symbols: typing.Sequence[str] = field(default_factory=list)
     """Ordered list of currency symbols (decreasing length)"""
 
+    number_parser: typing.Optional[NumberParser] = None
+    """Parses numbers/currency amounts with the babel locale's symbols (built if None)"""
+
     is_maybe_currency: typing.Optional[typing.Callable[[str], bool]] = has_digit
     """True if a word may be an amount of currency (parsing will be attempted)"""
 
@@ -689,6 +1079,12 @@ class TextProcessorSettings:
     is_maybe_date: typing.Optional[typing.Callable[[str], bool]] = has_digit
     """True if a word may be a date (parsing will be attempted)"""
 
+    date_order: typing.Optional[str] = None
+    """Order of day, month, year in numeric dates (e.g., MDY, defaults to babel locale)"""
+
+    date_shapes: typing.Optional[DateShapes] = None
+    """Recognizes common date formats before dateparser (built from babel locale if None)"""
+
     default_date_format: typing.Union[
         str, InterpretAsFormat
     ] = InterpretAsFormat.DATE_MDY_ORDINAL
@@ -752,6 +1148,9 @@ class TextProcessorSettings:
             # en_US -> en
             self.dateparser_lang = self.babel_locale.split("_")[0]
 
+        if self.date_shapes is None:
+            self.date_shapes = DateShapes(self.babel_locale, date_order=self.date_order)
+
         # Pre-compiled regular expressions
         self.replacements = [
             (maybe_compile_regex(pattern), template)
@@ -776,6 +1175,18 @@ class TextProcessorSettings:
             compiled_abbreviations[pattern] = template
 
         self.abbreviations = compiled_abbreviations
+        self.abbreviation_rules = list(compiled_abbreviations.items())
+
+        # Scan each word once per stage instead of once per rule
+        if self.any_replacement_pattern is None:
+            self.any_replacement_pattern = combine_regexes(
+                [pattern for pattern, _template in self.replacements]
+            )
+
+        if self.abbreviations_pattern is None:
+            self.abbreviations_pattern = combine_regexes(
+                list(self.abbreviations), group_prefix=ABBREVIATION_GROUP_PREFIX
+            )
 
         # Strings that should be separated from words, but do not cause any breaks
         if (self.begin_punctuations_pattern is None) and self.begin_punctuations:
@@ -800,6 +1211,18 @@ class TextProcessorSettings:
                 self.end_punctuations_pattern
             )
 
+        if self.any_punctuations_pattern is None:
+            self.any_punctuations_pattern = combine_regexes(
+                [
+                    pattern
+                    for pattern in (
+                        self.begin_punctuations_pattern,
+                        self.end_punctuations_pattern,
+                    )
+                    if pattern is not None
+                ]
+            )
+
         # Major breaks (split sentences)
         if (self.major_breaks_pattern is None) and self.major_breaks:
             pattern_str = "|".join(re.escape(b) for b in self.major_breaks)
@@ -830,8 +1253,11 @@ class TextProcessorSettings:
             self.word_breaks_pattern = maybe_compile_regex(self.word_breaks_pattern)
 
         # Currency
-        if not self.currencies:
+        if (not self.currencies) and self.load_currencies:
             try:
+                import babel
+                import babel.numbers
+
                 # Look up currencies for locale
                 locale_obj = babel.Locale(self.babel_locale)
 
@@ -850,5 +1276,20 @@ class TextProcessorSettings:
                 self.currencies, key=operator.length_hint, reverse=True
             )
 
+        if self.number_parser is None:
+            self.number_parser = NumberParser(
+                self.babel_locale, currency_symbols=self.currency_symbols
+            )
+
+    def stats(self, reset: bool = False) -> typing.Dict[str, typing.Any]:
+        """Get stats from lexicon, guesser, and part of speech tagger (if available)"""
+        settings_stats: typing.Dict[str, typing.Any] = {}
+        for func_name in ("lookup_phonemes", "guess_phonemes", "get_parts_of_speech"):
+            stats_func = getattr(getattr(self, func_name), "stats", None)
+            if callable(stats_func):
+                settings_stats[func_name] = stats_func(reset=reset)
+
+        return settings_stats
+
 
 # -----------------------------------------------------------------------------
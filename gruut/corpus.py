@@ -0,0 +1,553 @@
+"""Sharded, resumable processing of large text or CSV corpora.
+
+Usage: python -m gruut corpus <INPUT> --output-dir <DIR> [gruut options]
+
+The input file is split into shards by byte offset (on line boundaries).
+Shards are processed in parallel (--workers), and each finished shard is
+recorded in a manifest so an interrupted job can be resumed by running the
+same command again.
+"""
+import argparse
+import csv
+import dataclasses
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import time
+import typing
+from dataclasses import dataclass
+from pathlib import Path
+
+import jsonlines
+
+from gruut.__main__ import (
+    get_args,
+    make_text_processor,
+    process_text,
+    sentences_to_csv_row,
+)
+from gruut.text_processor import TextProcessor
+
+# -----------------------------------------------------------------------------
+
+_LOGGER = logging.getLogger("gruut.corpus")
+
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+
+# line<TAB>id<TAB>first_id for each line whose text was seen earlier
+DUPLICATES_NAME = "duplicates.tsv"
+
+# gruut arguments that don't change the output (may differ when resuming)
+RUNTIME_ARGS = {
+    "chunk_size",
+    "debug",
+    "no_fail",
+    "profile",
+    "profile_memory",
+    "profile_top",
+    "stage_timings",
+    "stats_file",
+    "text",
+    "workers",
+}
+
+# Text processor for each worker process
+_TEXT_PROCESSOR: typing.Optional[TextProcessor] = None
+
+
+class ShardStatus:
+    """Status of a shard in the manifest"""
+
+    PENDING = "pending"
+    DONE = "done"
+    FAILED = "failed"
+
+
+@dataclass
+class Shard:
+    """Byte range of the input file that is processed as a unit"""
+
+    idx: int
+    """Index of shard in input file"""
+
+    start: int
+    """Byte offset of first line"""
+
+    end: int
+    """Byte offset after last line"""
+
+    first_line: int = 0
+    """Line number of first line in input file"""
+
+    num_lines: int = 0
+    """Number of lines in shard"""
+
+    num_duplicates: int = 0
+    """Number of lines whose text was seen earlier in the corpus (not processed)"""
+
+    status: str = ShardStatus.PENDING
+    """pending, done, or failed"""
+
+    num_errors: int = 0
+    """Number of lines that failed (with --no-fail)"""
+
+    seconds: float = 0.0
+    """Time spent processing shard"""
+
+    error: typing.Optional[str] = None
+    """Error message if shard failed"""
+
+    @property
+    def name(self) -> str:
+        """Name of shard output file (without extension)"""
+        return f"shard-{self.idx:05}"
+
+
+# -----------------------------------------------------------------------------
+
+
+def main(argv: typing.Optional[typing.Sequence[str]] = None):
+    """Main entry point"""
+    parser = argparse.ArgumentParser(
+        prog="gruut corpus",
+        description="Process a text or CSV (--csv) corpus in resumable shards. "
+        + "Other arguments are passed to gruut.",
+    )
+    parser.add_argument("input", help="Path to text or CSV corpus (one item per line)")
+    parser.add_argument(
+        "--output-dir", required=True, help="Directory for shard outputs and manifest"
+    )
+    parser.add_argument(
+        "--shard-size",
+        type=float,
+        default=16,
+        help="Approximate size of each shard in megabytes (default: 16)",
+    )
+    parser.add_argument(
+        "--shards", type=int, help="Number of shards (overrides --shard-size)"
+    )
+    parser.add_argument(
+        "--no-dedup",
+        action="store_true",
+        help="Process every line, even if its text was seen earlier in the corpus",
+    )
+    parser.add_argument(
+        "--restart",
+        action="store_true",
+        help="Discard existing manifest and shard outputs, and start over",
+    )
+    corpus_args, gruut_argv = parser.parse_known_args(argv)
+    args = get_args(gruut_argv)
+
+    if args.debug:
+        logging.basicConfig(level=logging.DEBUG)
+    else:
+        logging.basicConfig(level=logging.INFO)
+
+    if args.espeak:
+        args.model_prefix = "espeak"
+
+    try:
+        num_failed = run_corpus(
+            input_path=Path(corpus_args.input),
+            output_dir=Path(corpus_args.output_dir),
+            args=args,
+            shard_size=int(corpus_args.shard_size * 1024 * 1024),
+            num_shards=corpus_args.shards,
+            dedup=(not corpus_args.no_dedup),
+            restart=corpus_args.restart,
+        )
+    except ValueError as e:
+        _LOGGER.fatal(e)
+        sys.exit(1)
+
+    if num_failed > 0:
+        _LOGGER.error("%s shard(s) failed. Run again to retry.", num_failed)
+        sys.exit(1)
+
+
+def run_corpus(
+    input_path: Path,
+    output_dir: Path,
+    args: argparse.Namespace,
+    shard_size: int = 16 * 1024 * 1024,
+    num_shards: typing.Optional[int] = None,
+    dedup: bool = True,
+    restart: bool = False,
+) -> int:
+    """Process all unfinished shards of a corpus. Returns number of failed shards."""
+    output_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = output_dir / MANIFEST_NAME
+    output_ext = "csv" if args.csv else "jsonl"
+
+    input_stat = input_path.stat()
+    corpus_info = {
+        "input": str(input_path.absolute()),
+        "input_size": input_stat.st_size,
+        "input_mtime_ns": input_stat.st_mtime_ns,
+        "dedup": dedup,
+        "args": get_output_args(args),
+    }
+
+    duplicates_path = output_dir / DUPLICATES_NAME
+    resume = manifest_path.is_file() and not restart
+
+    if resume:
+        with open(manifest_path, "r", encoding="utf-8") as manifest_file:
+            manifest = json.load(manifest_file)
+
+        if manifest.get("version") != MANIFEST_VERSION or any(
+            manifest.get(key) != value for key, value in corpus_info.items()
+        ):
+            raise ValueError(
+                f"{manifest_path} is for a different input or settings "
+                + "(use --restart to start over)"
+            )
+
+        shards = [Shard(**shard_dict) for shard_dict in manifest["shards"]]
+    else:
+        # New job
+        for shard_path in output_dir.glob(f"shard-*.{output_ext}"):
+            shard_path.unlink()
+
+        if num_shards is None:
+            num_shards = max(1, -(-input_stat.st_size // max(1, shard_size)))
+
+        shards = split_shards(input_path, num_shards)
+        scan_shards(input_path, shards, args, duplicates_path, dedup=dedup)
+
+        manifest = {
+            "version": MANIFEST_VERSION,
+            **corpus_info,
+            "shards": [dataclasses.asdict(shard) for shard in shards],
+        }
+        write_manifest(manifest_path, manifest)
+
+    shard_duplicates = load_duplicate_lines(duplicates_path, shards)
+
+    todo_shards = [
+        shard
+        for shard in shards
+        if (shard.status != ShardStatus.DONE)
+        or (not (output_dir / f"{shard.name}.{output_ext}").is_file())
+    ]
+
+    if resume:
+        _LOGGER.info(
+            "Resuming: %s/%s shard(s) left to process", len(todo_shards), len(shards)
+        )
+
+    start_time = time.perf_counter()
+    num_done_lines = 0
+    tasks = [
+        (input_path, shard, shard_duplicates.get(shard.idx, []), output_dir, args)
+        for shard in todo_shards
+    ]
+
+    def finish_shard(shard: Shard):
+        nonlocal num_done_lines
+
+        shards[shard.idx] = shard
+        manifest["shards"][shard.idx] = dataclasses.asdict(shard)
+        write_manifest(manifest_path, manifest)
+
+        if shard.status == ShardStatus.DONE:
+            num_done_lines += shard.num_lines
+            elapsed_seconds = max(1e-9, time.perf_counter() - start_time)
+            print(
+                f"{shard.name}: {shard.num_lines} line(s),",
+                f"{shard.num_duplicates} duplicate(s),",
+                f"{shard.num_errors} error(s) in {shard.seconds:.2f} second(s)",
+                f"[{sum(1 for s in shards if s.status == ShardStatus.DONE)}",
+                f"/ {len(shards)} shard(s), {num_done_lines / elapsed_seconds:.1f}",
+                "lines/sec]",
+                file=sys.stderr,
+            )
+        else:
+            _LOGGER.error("%s failed: %s", shard.name, shard.error)
+
+    if args.workers > 1:
+        with multiprocessing.Pool(
+            processes=args.workers, initializer=_init_worker, initargs=(args,)
+        ) as pool:
+            for shard in pool.imap_unordered(_process_shard_task, tasks):
+                finish_shard(shard)
+    else:
+        _init_worker(args)
+        for task in tasks:
+            finish_shard(_process_shard_task(task))
+
+    return sum(1 for shard in shards if shard.status == ShardStatus.FAILED)
+
+
+# -----------------------------------------------------------------------------
+
+
+def get_output_args(args: argparse.Namespace) -> typing.Dict[str, typing.Any]:
+    """Get gruut arguments that affect the output (stored in manifest)"""
+    output_args = {
+        key: value for key, value in vars(args).items() if key not in RUNTIME_ARGS
+    }
+
+    # Round-trip so values (e.g., enums) compare equal to a loaded manifest
+    return json.loads(json.dumps(output_args, default=str))
+
+
+def write_manifest(manifest_path: Path, manifest: typing.Dict[str, typing.Any]):
+    """Write manifest atomically so it is never partially written"""
+    temp_path = manifest_path.with_name(f".{manifest_path.name}.tmp")
+    with open(temp_path, "w", encoding="utf-8") as manifest_file:
+        json.dump(manifest, manifest_file, indent=4, ensure_ascii=False)
+
+    os.replace(temp_path, manifest_path)
+
+
+def split_shards(input_path: Path, num_shards: int) -> typing.List[Shard]:
+    """Split a file into shards of about equal size at line boundaries"""
+    file_size = input_path.stat().st_size
+    boundaries = [0]
+
+    with open(input_path, "rb") as input_file:
+        for shard_idx in range(1, max(1, num_shards)):
+            offset = (file_size * shard_idx) // num_shards
+            if offset <= boundaries[-1]:
+                continue
+
+            # Move to start of next line
+            input_file.seek(offset - 1)
+            input_file.readline()
+            offset = input_file.tell()
+
+            if boundaries[-1] < offset < file_size:
+                boundaries.append(offset)
+
+    boundaries.append(file_size)
+
+    return [
+        Shard(idx=idx, start=start, end=end)
+        for idx, (start, end) in enumerate(zip(boundaries[:-1], boundaries[1:]))
+    ]
+
+
+def iter_shard_lines(input_path: Path, shard: Shard) -> typing.Iterable[str]:
+    """Yield lines (with newlines) from a shard"""
+    with open(input_path, "rb") as input_file:
+        input_file.seek(shard.start)
+        offset = shard.start
+
+        while offset < shard.end:
+            line_bytes = input_file.readline()
+            if not line_bytes:
+                break
+
+            offset += len(line_bytes)
+            yield line_bytes.decode("utf-8")
+
+
+def get_line_text(
+    line: str, line_num: int, args: argparse.Namespace
+) -> typing.Optional[typing.Tuple[str, str, typing.Any]]:
+    """Get (id, text, text_data) for a line of input (None for empty CSV rows).
+
+    Raises ValueError for a CSV row without both an id and text.
+    """
+    if args.csv:
+        row = next(csv.reader([line], delimiter=args.csv_delimiter), None)
+        if not row:
+            return None
+
+        if len(row) < 2:
+            raise ValueError(f"Expected id and text in CSV row: {line!r}")
+
+        return (row[0], row[1], row)
+
+    return (str(line_num), line, None)
+
+
+def scan_shards(
+    input_path: Path,
+    shards: typing.List[Shard],
+    args: argparse.Namespace,
+    duplicates_path: Path,
+    dedup: bool = True,
+):
+    """Count lines in each shard and find duplicate texts across the corpus.
+
+    Duplicates are written to duplicates_path as line<TAB>id<TAB>first_id.
+    """
+    # hash of text -> id of first line with text
+    first_ids: typing.Dict[bytes, str] = {}
+    line_num = 0
+
+    with open(duplicates_path, "w", encoding="utf-8") as duplicates_file:
+        for shard in shards:
+            shard.first_line = line_num
+            shard.num_lines = 0
+            shard.num_duplicates = 0
+
+            for line in iter_shard_lines(input_path, shard):
+                shard.num_lines += 1
+                line_num += 1
+
+                if not dedup:
+                    continue
+
+                try:
+                    line_text = get_line_text(line, line_num - 1, args)
+                except ValueError:
+                    if not args.no_fail:
+                        raise
+
+                    # Counted as an error when the shard is processed
+                    _LOGGER.warning("Skipping line %s: %r", line_num - 1, line)
+                    continue
+
+                if line_text is None:
+                    continue
+
+                line_id, text, _ = line_text
+                text_hash = hashlib.blake2b(
+                    text.rstrip("\r\n").encode("utf-8"), digest_size=16
+                ).digest()
+
+                first_id = first_ids.get(text_hash)
+                if first_id is None:
+                    first_ids[text_hash] = line_id
+                else:
+                    shard.num_duplicates += 1
+                    print(
+                        line_num - 1, line_id, first_id, sep="\t", file=duplicates_file
+                    )
+
+
+def load_duplicate_lines(
+    duplicates_path: Path, shards: typing.Sequence[Shard]
+) -> typing.Dict[int, typing.List[int]]:
+    """Load indexes of duplicate lines within each shard"""
+    shard_duplicates: typing.Dict[int, typing.List[int]] = {}
+    if not duplicates_path.is_file():
+        return shard_duplicates
+
+    shard_iter = iter(shards)
+    shard = next(shard_iter)
+
+    with open(duplicates_path, "r", encoding="utf-8") as duplicates_file:
+        for line in duplicates_file:
+            line_num = int(line.split("\t", maxsplit=1)[0])
+            while line_num >= (shard.first_line + shard.num_lines):
+                shard = next(shard_iter)
+
+            shard_duplicates.setdefault(shard.idx, []).append(
+                line_num - shard.first_line
+            )
+
+    return shard_duplicates
+
+
+# -----------------------------------------------------------------------------
+
+
+def _init_worker(args: argparse.Namespace):
+    """Create one text processor per worker process"""
+    global _TEXT_PROCESSOR
+
+    if args.debug:
+        logging.basicConfig(level=logging.DEBUG)
+    else:
+        logging.basicConfig(level=logging.INFO)
+
+    _TEXT_PROCESSOR = make_text_processor(args)
+
+
+def _process_shard_task(
+    task: typing.Tuple[Path, Shard, typing.List[int], Path, argparse.Namespace]
+) -> Shard:
+    """Process a shard, returning it with updated status"""
+    input_path, shard, duplicate_lines, output_dir, args = task
+    start_time = time.perf_counter()
+
+    try:
+        shard.num_errors = process_shard(
+            input_path, shard, output_dir, args, duplicate_lines=duplicate_lines
+        )
+        shard.status = ShardStatus.DONE
+        shard.error = None
+    except Exception as e:
+        _LOGGER.exception(shard.name)
+        shard.status = ShardStatus.FAILED
+        shard.error = repr(e)
+
+    shard.seconds = time.perf_counter() - start_time
+
+    return shard
+
+
+def process_shard(
+    input_path: Path,
+    shard: Shard,
+    output_dir: Path,
+    args: argparse.Namespace,
+    duplicate_lines: typing.Iterable[int] = (),
+) -> int:
+    """Process the lines of one shard, skipping duplicates. Returns number of errors.
+
+    Output is written to a temporary file that replaces the shard output only
+    when the whole shard is done.
+    """
+    assert _TEXT_PROCESSOR is not None
+
+    output_ext = "csv" if args.csv else "jsonl"
+    output_path = output_dir / f"{shard.name}.{output_ext}"
+    temp_path = output_dir / f".{shard.name}.{output_ext}.tmp"
+    duplicate_lines = set(duplicate_lines)
+    num_errors = 0
+
+    with open(temp_path, "w", encoding="utf-8", newline="") as output_file:
+        if args.csv:
+            csv_writer = csv.writer(output_file, delimiter=args.csv_delimiter)
+        else:
+            jsonl_writer = jsonlines.Writer(output_file)
+
+        for line_idx, line in enumerate(iter_shard_lines(input_path, shard)):
+            if line_idx in duplicate_lines:
+                continue
+
+            try:
+                line_text = get_line_text(line, shard.first_line + line_idx, args)
+                if line_text is None:
+                    # Empty CSV row
+                    continue
+
+                line_id, text, text_data = line_text
+                sentences = process_text(_TEXT_PROCESSOR, text, args)
+            except Exception:
+                if not args.no_fail:
+                    raise
+
+                _LOGGER.exception(line)
+                num_errors += 1
+                continue
+
+            if args.csv:
+                csv_writer.writerow(sentences_to_csv_row(text_data, sentences, args))
+            else:
+                jsonl_writer.write(
+                    {
+                        "line": int(line_id),
+                        "sentences": [dataclasses.asdict(s) for s in sentences],
+                    }
+                )
+
+    os.replace(temp_path, output_path)
+
+    return num_errors
+
+
+# -----------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,349 @@
+"""Persistent gruut process behind a Unix domain socket.
+
+Usage: gruut --daemon [--daemon-socket PATH] [gruut options]
+
+While the daemon is running, the gruut command sends its arguments and standard
+input to the daemon instead of loading its own models. Output, errors, and the
+exit code are sent back, so the command behaves the same either way.
+
+Protocol: the client sends one line of JSON ({"argv": [...]}) followed by its
+standard input. The daemon replies with frames of (type, length, payload), where
+type is "o" (stdout), "e" (stderr), or "x" (exit code as text, always last).
+"""
+import argparse
+import io
+import json
+import logging
+import os
+import signal
+import socket
+import socketserver
+import stat
+import struct
+import sys
+import tempfile
+import threading
+import typing
+from pathlib import Path
+
+from gruut.__main__ import (
+    TextProcessingError,
+    get_args,
+    make_text_processor,
+    process_text,
+    read_lines,
+    write_output,
+)
+from gruut.text_processor import TextProcessor
+
+# -----------------------------------------------------------------------------
+
+_LOGGER = logging.getLogger("gruut.daemon")
+
+SOCKET_ENV_VAR = "GRUUT_DAEMON_SOCKET"
+SOCKET_NAME = "gruut.sock"
+
+# type, payload length
+FRAME_HEADER = struct.Struct("!cI")
+
+FRAME_STDOUT = b"o"
+FRAME_STDERR = b"e"
+FRAME_EXIT = b"x"
+
+# Bytes of stdin read at a time by the client
+STDIN_CHUNK_SIZE = 64 * 1024
+
+
+def get_socket_path(
+    socket_path: typing.Optional[typing.Union[str, Path]] = None
+) -> Path:
+    """Path to daemon socket (argument, environment, or per-user default)"""
+    if socket_path:
+        return Path(socket_path)
+
+    env_path = os.environ.get(SOCKET_ENV_VAR)
+    if env_path:
+        return Path(env_path)
+
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return Path(runtime_dir) / SOCKET_NAME
+
+    # Private directory, created by the daemon
+    return Path(tempfile.gettempdir()) / f"gruut-{os.getuid()}" / SOCKET_NAME
+
+
+def is_trusted_socket(path: Path) -> bool:
+    """True if path is a socket owned by and only accessible to this user"""
+    try:
+        path_stat = path.lstat()
+    except OSError:
+        return False
+
+    return (
+        stat.S_ISSOCK(path_stat.st_mode)
+        and (path_stat.st_uid == os.getuid())
+        and not (path_stat.st_mode & (stat.S_IRWXG | stat.S_IRWXO))
+    )
+
+
+# -----------------------------------------------------------------------------
+# Client
+# -----------------------------------------------------------------------------
+
+
+def forward_to_daemon(
+    argv: typing.Sequence[str],
+    socket_path: typing.Optional[typing.Union[str, Path]] = None,
+    send_stdin: bool = True,
+    stdin_tty: bool = False,
+    stdin: typing.Optional[typing.BinaryIO] = None,
+    stdout: typing.Optional[typing.BinaryIO] = None,
+    stderr: typing.Optional[typing.BinaryIO] = None,
+) -> typing.Optional[int]:
+    """Run a gruut command in the daemon.
+
+    Returns the command's exit code, or None if no daemon is running.
+    """
+    path = get_socket_path(socket_path)
+    if not path.exists():
+        return None
+
+    if not is_trusted_socket(path):
+        # Could be another user's socket
+        _LOGGER.warning(
+            "Not using gruut daemon at %s "
+            + "(must be a socket owned by and only accessible to this user)",
+            path,
+        )
+        return None
+
+    daemon_socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        daemon_socket.connect(str(path))
+    except OSError:
+        # Stale socket
+        daemon_socket.close()
+        return None
+
+    stdin = stdin if stdin is not None else sys.stdin.buffer
+    stdout = stdout if stdout is not None else sys.stdout.buffer
+    stderr = stderr if stderr is not None else sys.stderr.buffer
+
+    with daemon_socket:
+        daemon_socket.sendall(json.dumps({"argv": list(argv)}).encode() + b"\n")
+
+        def send_input():
+            try:
+                if send_stdin:
+                    while True:
+                        if stdin_tty:
+                            # Send each line as it's typed
+                            data = stdin.readline()
+                        else:
+                            data = stdin.read1(STDIN_CHUNK_SIZE)  # type: ignore
+
+                        if not data:
+                            break
+
+                        daemon_socket.sendall(data)
+
+                daemon_socket.shutdown(socket.SHUT_WR)
+            except OSError:
+                # Daemon closed connection
+                pass
+
+        input_thread = threading.Thread(target=send_input, daemon=True)
+        input_thread.start()
+
+        with daemon_socket.makefile("rb") as daemon_file:
+            while True:
+                header = daemon_file.read(FRAME_HEADER.size)
+                if len(header) < FRAME_HEADER.size:
+                    stderr.write(b"gruut daemon closed connection unexpectedly\n")
+                    stderr.flush()
+                    return 1
+
+                frame_type, length = FRAME_HEADER.unpack(header)
+                payload = daemon_file.read(length)
+
+                if frame_type == FRAME_EXIT:
+                    return int(payload.decode())
+
+                out_file = stdout if frame_type == FRAME_STDOUT else stderr
+                out_file.write(payload)
+                out_file.flush()
+
+
+# -----------------------------------------------------------------------------
+# Daemon
+# -----------------------------------------------------------------------------
+
+
+class FrameWriter(io.TextIOBase):
+    """Text stream that sends each write as a frame"""
+
+    def __init__(self, out_file: typing.BinaryIO, frame_type: bytes):
+        super().__init__()
+        self.out_file = out_file
+        self.frame_type = frame_type
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        if text:
+            write_frame(self.out_file, self.frame_type, text.encode())
+
+        return len(text)
+
+
+def write_frame(out_file: typing.BinaryIO, frame_type: bytes, payload: bytes):
+    """Write a single frame and flush"""
+    out_file.write(FRAME_HEADER.pack(frame_type, len(payload)) + payload)
+    out_file.flush()
+
+
+class _ThreadFilter(logging.Filter):
+    """Only passes records from one thread"""
+
+    def __init__(self, thread_id: int):
+        super().__init__()
+        self.thread_id = thread_id
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return record.thread == self.thread_id
+
+
+class DaemonRequestHandler(socketserver.StreamRequestHandler):
+    """Runs one gruut command"""
+
+    server: "DaemonServer"
+
+    def handle(self):
+        exit_code = 0
+        stderr = FrameWriter(self.wfile, FRAME_STDERR)
+
+        # Send this command's log messages to the client
+        log_handler = logging.StreamHandler(stderr)
+        log_handler.setFormatter(logging.Formatter(logging.BASIC_FORMAT))
+        log_handler.addFilter(_ThreadFilter(threading.get_ident()))
+        gruut_logger = logging.getLogger("gruut")
+        gruut_logger.addHandler(log_handler)
+
+        stdin = io.TextIOWrapper(self.rfile, encoding="utf-8")  # type: ignore
+
+        try:
+            request = json.loads(stdin.readline())
+            args = get_args(request["argv"])
+            if args.espeak:
+                args.model_prefix = "espeak"
+
+            write_output(
+                args,
+                self.server.get_text_processor(args),
+                read_lines(args, stdin),
+                FrameWriter(self.wfile, FRAME_STDOUT),
+            )
+        except SystemExit as e:
+            # Bad arguments
+            exit_code = e.code if isinstance(e.code, int) else 1
+        except TextProcessingError:
+            # Already logged
+            exit_code = 1
+        except Exception:
+            _LOGGER.exception("Command failed")
+            exit_code = 1
+        finally:
+            gruut_logger.removeHandler(log_handler)
+
+            # Don't close socket with the wrapper
+            stdin.detach()
+
+        try:
+            write_frame(self.wfile, FRAME_EXIT, str(exit_code).encode())
+        except OSError:
+            # Client is gone
+            pass
+
+
+class DaemonServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Serves gruut commands with warm text processors"""
+
+    daemon_threads = True
+
+    def __init__(self, socket_path: typing.Union[str, Path]):
+        super().__init__(str(socket_path), DaemonRequestHandler)
+
+        # (language, model prefix, g2p engine) -> processor
+        self.text_processors: typing.Dict[typing.Tuple[str, ...], TextProcessor] = {}
+        self.text_processors_lock = threading.Lock()
+
+    def server_bind(self):
+        # Socket is only accessible to this user from the start
+        old_umask = os.umask(0o077)
+        try:
+            super().server_bind()
+        finally:
+            os.umask(old_umask)
+
+    def get_text_processor(self, args: argparse.Namespace) -> TextProcessor:
+        """Get or create a processor for command-line arguments"""
+        key = (args.language, args.model_prefix or "", args.g2p_engine)
+        with self.text_processors_lock:
+            text_processor = self.text_processors.get(key)
+            if text_processor is None:
+                _LOGGER.debug("Creating text processor for %s", key)
+                text_processor = make_text_processor(args)
+                self.text_processors[key] = text_processor
+
+        return text_processor
+
+
+def run_daemon(args: argparse.Namespace):
+    """Serve gruut commands on a Unix socket until interrupted"""
+    socket_path = get_socket_path(args.daemon_socket)
+
+    socket_dir = socket_path.parent
+    socket_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+    if socket_dir.stat().st_uid not in (os.getuid(), 0):
+        _LOGGER.fatal("Socket directory %s is owned by another user", socket_dir)
+        sys.exit(1)
+
+    if socket_path.exists():
+        if not is_trusted_socket(socket_path):
+            _LOGGER.fatal("Refusing to replace untrusted file at %s", socket_path)
+            sys.exit(1)
+
+        probe_socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe_socket.connect(str(socket_path))
+            _LOGGER.fatal("gruut daemon is already running at %s", socket_path)
+            sys.exit(1)
+        except OSError:
+            # Left over from a daemon that didn't exit cleanly
+            socket_path.unlink()
+        finally:
+            probe_socket.close()
+
+    server = DaemonServer(socket_path)
+
+    try:
+        # Load models now so the first command is fast too
+        process_text(server.get_text_processor(args), "Warm up.", args)
+    except Exception:
+        _LOGGER.exception("Failed to load models for %s", args.language)
+
+    def stop(*_args):
+        raise KeyboardInterrupt()
+
+    signal.signal(signal.SIGTERM, stop)
+    _LOGGER.info("Listening on %s", socket_path)
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        socket_path.unlink()
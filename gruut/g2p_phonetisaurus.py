@@ -1,15 +1,17 @@
 #!/usr/bin/env python3
 """Guess word pronunciations using a Phonetisaurus FST
 
-See bin/fst2npz.py to convert an FST to a numpy graph.
+See bin/fst2npy.py to convert an FST to a numpy graph.
 """
 import argparse
+import heapq
 import logging
 import os
+import struct
 import sys
 import time
 import typing
-from collections import defaultdict
+import zipfile
 from pathlib import Path
 
 import numpy as np
@@ -76,10 +78,16 @@ def main():
         default=" ",
         help="Separator between output phonemes (default: space)",
     )
+    predict_parser.add_argument(
+        "--batch-size",
+        default=0,
+        type=int,
+        help="Search words in batches that share common prefixes (default: 0, off)",
+    )
     predict_parser.add_argument(
         "--preload-graph",
         action="store_true",
-        help="Preload graph into memory before starting",
+        help="Read graph into memory instead of memory-mapping it",
     )
     predict_parser.set_defaults(func=do_predict)
 
@@ -114,14 +122,67 @@ def main():
     test_parser.add_argument(
         "--preload-graph",
         action="store_true",
-        help="Preload graph into memory before starting",
+        help="Read graph into memory instead of memory-mapping it",
     )
     test_parser.set_defaults(func=do_test)
 
+    # ---------
+    # Benchmark
+    # ---------
+    bench_parser = sub_parsers.add_parser(
+        "bench", help="Measure search speed across beam widths"
+    )
+    bench_parser.add_argument(
+        "--graph", required=True, help="Path to graph npz file from fst2npy.py"
+    )
+    bench_parser.add_argument("words", nargs="*", help="Words to guess")
+    bench_parser.add_argument(
+        "--beam",
+        nargs="+",
+        default=[10, 50, 100, 500, 1000],
+        type=int,
+        help="Initial widths of search beam (default: 10 50 100 500 1000)",
+    )
+    bench_parser.add_argument(
+        "--min-beam",
+        default=100,
+        type=int,
+        help="Minimum width of search beam (default: 100)",
+    )
+    bench_parser.add_argument(
+        "--beam-scale",
+        default=0.6,
+        type=float,
+        help="Scalar multiplied by beam after each step (default: 0.6)",
+    )
+    bench_parser.add_argument(
+        "--max-guesses",
+        default=1,
+        type=int,
+        help="Maximum number of guesses per word (default: 1)",
+    )
+    bench_parser.add_argument(
+        "--batch-size",
+        default=10000,
+        type=int,
+        help="Number of words per batch search (default: 10000)",
+    )
+    bench_parser.add_argument(
+        "--python",
+        action="store_true",
+        help="Also measure reference (one edge at a time) search",
+    )
+    bench_parser.add_argument(
+        "--preload-graph",
+        action="store_true",
+        help="Read graph into memory instead of memory-mapping it",
+    )
+    bench_parser.set_defaults(func=do_bench)
+
     # ----------------
     # Shared arguments
     # ----------------
-    for sub_parser in [predict_parser, test_parser]:
+    for sub_parser in [predict_parser, test_parser, bench_parser]:
         sub_parser.add_argument(
             "--debug", action="store_true", help="Print DEBUG messages to console"
         )
@@ -159,15 +220,21 @@ def do_predict(args):
         if os.isatty(sys.stdin.fileno()):
             print("Reading words from stdin...", file=sys.stderr)
 
+    g2p_args = {
+        "grapheme_separator": args.grapheme_separator,
+        "max_guesses": args.max_guesses,
+        "beam": args.beam,
+        "min_beam": args.min_beam,
+        "beam_scale": args.beam_scale,
+    }
+
+    if args.batch_size > 0:
+        guesses = phon_graph.g2p_batch(words, batch_size=args.batch_size, **g2p_args)
+    else:
+        guesses = phon_graph.g2p(words, **g2p_args)
+
     # Guess pronunciations
-    for word, graphemes, phonemes in phon_graph.g2p(
-        words,
-        grapheme_separator=args.grapheme_separator,
-        max_guesses=args.max_guesses,
-        beam=args.beam,
-        min_beam=args.min_beam,
-        beam_scale=args.beam_scale,
-    ):
+    for word, graphemes, phonemes in guesses:
         if not phonemes:
             _LOGGER.warning("No pronunciation for %s (%s)", word, graphemes)
             continue
@@ -258,15 +325,161 @@ def do_test(args):
 
 # -----------------------------------------------------------------------------
 
-_NOT_FINAL = object()
+
+def do_bench(args):
+    """Compare search speed across beam widths"""
+    args.graph = Path(args.graph)
+
+    _LOGGER.debug("Loading graph from %s", args.graph)
+    phon_graph = PhonetisaurusGraph.load(args.graph, preload=args.preload_graph)
+
+    if args.words:
+        lines = args.words
+    else:
+        lines = sys.stdin
+
+        if os.isatty(sys.stdin.fileno()):
+            print("Reading words from stdin...", file=sys.stderr)
+
+    # Only the first column is used, so lexicon files work too
+    words = [line.split()[0] for line in lines if line.strip()]
+    assert words, "No words were read"
+
+    all_graphemes = [PhonetisaurusGraph._split_graphemes(word) for word in words]
+
+    columns = ["beam", "word (words/sec)", "batch (words/sec)"]
+    if args.python:
+        columns.append("python (words/sec)")
+
+    columns.append("mismatches")
+    print(*columns)
+
+    for beam in args.beam:
+        search_args = {
+            "beam": beam,
+            "min_beam": min(args.min_beam, beam),
+            "beam_scale": args.beam_scale,
+            "max_guesses": args.max_guesses,
+        }
+
+        # Word by word
+        start_time = time.perf_counter()
+        word_guesses = [
+            phon_graph._search(graphemes, **search_args) for graphemes in all_graphemes
+        ]
+        word_seconds = time.perf_counter() - start_time
+        results = [round(len(words) / word_seconds, 2)]
+
+        # Batches with shared prefixes
+        start_time = time.perf_counter()
+        batch_guesses: typing.List[typing.List[typing.Tuple[str, ...]]] = []
+        for batch_start in range(0, len(all_graphemes), args.batch_size):
+            batch_guesses.extend(
+                phon_graph._search_batch(
+                    all_graphemes[batch_start : batch_start + args.batch_size],
+                    **search_args,
+                )
+            )
+
+        batch_seconds = time.perf_counter() - start_time
+        results.append(round(len(words) / batch_seconds, 2))
+        num_mismatches = sum(1 for w, b in zip(word_guesses, batch_guesses) if w != b)
+
+        if args.python:
+            # Reference implementation
+            start_time = time.perf_counter()
+            python_guesses = [
+                phon_graph._search_python(graphemes, **search_args)
+                for graphemes in all_graphemes
+            ]
+            python_seconds = time.perf_counter() - start_time
+            results.append(round(len(words) / python_seconds, 2))
+            num_mismatches += sum(
+                1 for w, p in zip(word_guesses, python_guesses) if w != p
+            )
+
+        print(beam, *results, num_mismatches)
+
+
+# -----------------------------------------------------------------------------
+
+# Size of a zip local file header (without file name and extra field)
+_ZIP_LOCAL_HEADER_SIZE = 30
+
+
+def load_npz(
+    npz_path: typing.Union[str, Path], mmap_mode: typing.Optional[str] = "r"
+) -> NUMPY_GRAPH:
+    """Load arrays from an .npz file, memory-mapping them when possible.
+
+    np.load ignores mmap_mode for .npz archives, so uncompressed members are
+    located inside the zip file and mapped directly. Compressed members (or
+    mmap_mode=None) are read into memory. Pickled arrays are never loaded.
+    """
+    arrays: NUMPY_GRAPH = {}
+
+    with zipfile.ZipFile(npz_path, "r") as npz_zip, open(npz_path, "rb") as npz_file:
+        for info in npz_zip.infolist():
+            name = info.filename
+            if name.endswith(".npy"):
+                name = name[: -len(".npy")]
+
+            if (mmap_mode is None) or (info.compress_type != zipfile.ZIP_STORED):
+                with npz_zip.open(info) as member_file:
+                    arrays[name] = np.lib.format.read_array(
+                        member_file, allow_pickle=False
+                    )
+
+                continue
+
+            # Skip past local file header to .npy data
+            npz_file.seek(info.header_offset)
+            local_header = npz_file.read(_ZIP_LOCAL_HEADER_SIZE)
+            name_length, extra_length = struct.unpack("<HH", local_header[26:30])
+            npz_file.seek(
+                info.header_offset + _ZIP_LOCAL_HEADER_SIZE + name_length + extra_length
+            )
+
+            version = np.lib.format.read_magic(npz_file)
+            if version == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(
+                    npz_file
+                )
+            else:
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(
+                    npz_file
+                )
+
+            if dtype.hasobject:
+                raise ValueError(
+                    f"Array {name} in {npz_path} requires pickle (re-create with fst2npy.py)"
+                )
+
+            if int(np.prod(shape)) == 0:
+                # Can't memory-map empty arrays
+                arrays[name] = np.empty(shape, dtype=dtype)
+                continue
+
+            # numpy's stubs want Literal modes/orders (typing.Literal needs 3.8+)
+            arrays[name] = np.memmap(  # type: ignore[call-overload]
+                str(npz_path),
+                dtype=dtype,
+                mode=mmap_mode,
+                shape=tuple(shape),
+                order="F" if fortran_order else "C",
+                offset=npz_file.tell(),
+            )
+
+    return arrays
 
 
 class PhonetisaurusGraph:
     """Graph of numpy arrays that represents a Phonetisaurus FST
 
-    Also contains shared cache of edges and final state probabilities.
-    These caches are necessary to ensure that the .npz file stays small and fast
-    to load.
+    Out-edges of each node are found in constant time with a CSR offsets array
+    (edge_offsets), and final state probabilities are stored per node
+    (node_final_probs). Both are created by bin/fst2npy.py, so arrays can be
+    memory-mapped and shared between processes without a preloading step.
     """
 
     def __init__(self, graph: NUMPY_GRAPH, preload: bool = False):
@@ -281,7 +494,7 @@ class PhonetisaurusGraph:
         # int -> [str]
         self.symbols = []
         for symbol_str in self.graph["symbols"]:
-            symbol_list = symbol_str.replace("_", "").split("|")
+            symbol_list = str(symbol_str).replace("_", "").split("|")
             self.symbols.append((len(symbol_list), symbol_list))
 
         # nodes that are accepting states
@@ -290,23 +503,59 @@ class PhonetisaurusGraph:
         # node -> probability
         self.final_probs = self.graph["final_probs"]
 
-        # Cache
-        self.preloaded = preload
-        self.out_edges: typing.Dict[int, typing.List[int]] = defaultdict(list)
-        self.final_node_probs: typing.Dict[int, typing.Any] = {}
+        if ("edge_offsets" in self.graph) and ("node_final_probs" in self.graph):
+            # node -> first edge index (edges are sorted by from_node)
+            self.edge_offsets = self.graph["edge_offsets"]
 
-        if preload:
-            # Load out edges
-            for edge_idx, (from_node, *_) in enumerate(self.edges):
-                self.out_edges[from_node].append(edge_idx)
+            # node -> final probability (inf if not final)
+            self.node_final_probs = self.graph["node_final_probs"]
+        else:
+            # Older graph from fst2npy.py without CSR offsets
+            _LOGGER.debug("Computing edge offsets (re-create graph with fst2npy.py)")
+            num_nodes = 1 + max(
+                self.start_node,
+                int(self.edges[:, :2].max()) if len(self.edges) > 0 else 0,
+                int(self.final_nodes.max()) if len(self.final_nodes) > 0 else 0,
+            )
+
+            self.edge_offsets = np.searchsorted(
+                self.edges[:, 0], np.arange(num_nodes + 1), side="left"
+            )
+
+            self.node_final_probs = np.full(num_nodes, np.inf, dtype=np.float32)
+            self.node_final_probs[self.final_nodes] = self.final_probs
+
+        # eps -> label arrays for vectorized search (see _get_label_arrays)
+        self._label_arrays: typing.Dict[
+            str,
+            typing.Tuple[typing.Dict[str, int], np.ndarray, np.ndarray, np.ndarray],
+        ] = {}
 
-            # Load final probabilities
-            self.final_node_probs.update(zip(self.final_nodes, self.final_probs))
+        self.preloaded = preload
+        if preload:
+            # Read memory-mapped arrays into memory
+            self.edges = np.array(self.edges)
+            self.edge_probs = np.array(self.edge_probs)
+            self.edge_offsets = np.array(self.edge_offsets)
+            self.node_final_probs = np.array(self.node_final_probs)
 
     @staticmethod
-    def load(graph_path: typing.Union[str, Path], **kwargs) -> "PhonetisaurusGraph":
-        """Load .npz file with numpy graph"""
-        np_graph = np.load(graph_path, allow_pickle=True)
+    def load(
+        graph_path: typing.Union[str, Path],
+        mmap_mode: typing.Optional[str] = "r",
+        allow_pickle: bool = False,
+        **kwargs,
+    ) -> "PhonetisaurusGraph":
+        """Load .npz file with numpy graph (memory-mapped by default).
+
+        allow_pickle is only needed for graphs created by older versions of
+        fst2npy.py, which stored symbols as an object array.
+        """
+        if allow_pickle:
+            np_graph = dict(np.load(graph_path, allow_pickle=True))
+        else:
+            np_graph = load_npz(graph_path, mmap_mode=mmap_mode)
+
         return PhonetisaurusGraph(np_graph, **kwargs)
 
     def g2p(
@@ -323,6 +572,63 @@ class PhonetisaurusGraph:
             for graphemes, phonemes in self.g2p_one(word, **kwargs):
                 yield word, graphemes, phonemes
 
+    def g2p_batch(
+        self,
+        words: typing.Iterable[typing.Union[str, typing.Sequence[str]]],
+        eps: str = "<eps>",
+        beam: int = 5000,
+        min_beam: int = 100,
+        beam_scale: float = 0.6,
+        grapheme_separator: str = "",
+        max_guesses: int = 1,
+        batch_size: int = 10000,
+    ) -> typing.Iterable[
+        typing.Tuple[
+            typing.Union[str, typing.Sequence[str]],
+            typing.Sequence[str],
+            typing.Sequence[str],
+        ],
+    ]:
+        """Guess phonemes for words, sharing search work between common prefixes.
+
+        Words are searched batch_size at a time. Output is the same (and in the
+        same order) as g2p.
+        """
+        batch: typing.List[typing.Union[str, typing.Sequence[str]]] = []
+
+        def search_batch():
+            batch_graphemes = [
+                self._split_graphemes(word, grapheme_separator) for word in batch
+            ]
+            batch_guesses = self._search_batch(
+                batch_graphemes,
+                eps=eps,
+                beam=beam,
+                min_beam=min_beam,
+                beam_scale=beam_scale,
+                max_guesses=max_guesses,
+            )
+
+            for word, graphemes, guesses in zip(batch, batch_graphemes, batch_guesses):
+                if not graphemes:
+                    continue
+
+                if guesses:
+                    for guess_phonemes in guesses:
+                        yield word, graphemes, [p for p in guess_phonemes if p]
+                else:
+                    # No guesses
+                    yield word, graphemes, []
+
+        for word in words:
+            batch.append(word)
+            if len(batch) >= batch_size:
+                yield from search_batch()
+                batch = []
+
+        if batch:
+            yield from search_batch()
+
     def g2p_one(
         self,
         word: typing.Union[str, typing.Sequence[str]],
@@ -334,21 +640,422 @@ class PhonetisaurusGraph:
         max_guesses: int = 1,
     ) -> typing.Iterable[typing.Tuple[typing.Sequence[str], typing.Sequence[str]]]:
         """Guess phonemes for word"""
-        current_beam = beam
-        graphemes: typing.Sequence[str] = []
+        graphemes = self._split_graphemes(word, grapheme_separator)
+        if not graphemes:
+            return
+
+        guesses = self._search(
+            graphemes,
+            eps=eps,
+            beam=beam,
+            min_beam=min_beam,
+            beam_scale=beam_scale,
+            max_guesses=max_guesses,
+        )
 
+        if guesses:
+            for guess_phonemes in guesses:
+                yield graphemes, [p for p in guess_phonemes if p]
+        else:
+            # No guesses
+            yield graphemes, []
+
+    @staticmethod
+    def _split_graphemes(
+        word: typing.Union[str, typing.Sequence[str]], grapheme_separator: str = ""
+    ) -> typing.List[str]:
+        """Split word into a list of graphemes"""
         if isinstance(word, str):
             word = word.strip()
 
             if grapheme_separator:
-                graphemes = word.split(grapheme_separator)
-            else:
-                graphemes = list(word)
-        else:
-            graphemes = word
+                return word.split(grapheme_separator)
 
-        if not graphemes:
-            return graphemes, []
+            return list(word)
+
+        return list(word)
+
+    # -------------------------------------------------------------------------
+    # Search
+    # -------------------------------------------------------------------------
+
+    def _get_label_arrays(
+        self, eps: str
+    ) -> typing.Tuple[typing.Dict[str, int], np.ndarray, np.ndarray, np.ndarray]:
+        """Integer-encoded input labels for vectorized matching.
+
+        Returns:
+            grapheme_ids: grapheme -> int
+            label_ids: symbol -> grapheme ids (padded with -1)
+            label_lens: symbol -> number of graphemes
+            label_is_eps: symbol -> True if symbol is eps
+        """
+        label_arrays = self._label_arrays.get(eps)
+        if label_arrays is not None:
+            return label_arrays
+
+        grapheme_ids: typing.Dict[str, int] = {}
+        max_len = max((num_graphemes for num_graphemes, _ in self.symbols), default=1)
+        label_ids = np.full((len(self.symbols), max_len), -1, dtype=np.int32)
+        label_lens = np.zeros(len(self.symbols), dtype=np.int32)
+        label_is_eps = np.zeros(len(self.symbols), dtype=bool)
+
+        for symbol_idx, (num_graphemes, symbol_graphemes) in enumerate(self.symbols):
+            label_lens[symbol_idx] = num_graphemes
+            if symbol_graphemes == [eps]:
+                label_is_eps[symbol_idx] = True
+
+            for grapheme_idx, grapheme in enumerate(symbol_graphemes):
+                grapheme_id = grapheme_ids.get(grapheme)
+                if grapheme_id is None:
+                    grapheme_id = len(grapheme_ids)
+                    grapheme_ids[grapheme] = grapheme_id
+
+                label_ids[symbol_idx, grapheme_idx] = grapheme_id
+
+        label_arrays = (grapheme_ids, label_ids, label_lens, label_is_eps)
+        self._label_arrays[eps] = label_arrays
+
+        return label_arrays
+
+    def _search(
+        self,
+        graphemes: typing.Sequence[str],
+        eps: str = "<eps>",
+        beam: int = 5000,
+        min_beam: int = 100,
+        beam_scale: float = 0.6,
+        max_guesses: int = 1,
+    ) -> typing.List[typing.Tuple[str, ...]]:
+        """Beam search over numpy edge slices.
+
+        Each step expands every hypothesis in the beam at once: out-edges are
+        gathered with the CSR offsets, input labels are compared against the
+        integer-encoded graphemes, and the beam is pruned with argpartition.
+        Output phonemes are kept as back-pointers and only materialized for
+        complete hypotheses.
+
+        Ties are broken exactly like a stable sort of the candidates in
+        expansion order, so guesses match _search_python.
+        """
+        state = _SearchState(self.start_node, beam)
+        self._advance(
+            state,
+            graphemes,
+            eps=eps,
+            min_beam=min_beam,
+            beam_scale=beam_scale,
+            max_guesses=max_guesses,
+        )
+
+        return state.guesses(max_guesses)
+
+    def _search_batch(
+        self,
+        words_graphemes: typing.Sequence[typing.Sequence[str]],
+        eps: str = "<eps>",
+        beam: int = 5000,
+        min_beam: int = 100,
+        beam_scale: float = 0.6,
+        max_guesses: int = 1,
+    ) -> typing.List[typing.List[typing.Tuple[str, ...]]]:
+        """Beam search for many words, sharing work between common prefixes.
+
+        Words are grouped into a grapheme trie. A search step only reads the
+        graphemes within max_label_len of each hypothesis' position, so
+        every word below a trie node of depth d gets the same step as long as
+        no hypothesis has consumed more than d - max_label_len graphemes.
+        When that stops being true, the search is forked into the node's
+        children. Guesses are identical to _search for each word.
+        """
+        _, label_ids, _, _ = self._get_label_arrays(eps)
+        max_label_len = label_ids.shape[1]
+
+        # Identical words share a single search
+        unique_idxs: typing.Dict[typing.Tuple[str, ...], int] = {}
+        unique_graphemes: typing.List[typing.Tuple[str, ...]] = []
+        word_unique_idxs: typing.List[int] = []
+        for graphemes in words_graphemes:
+            graphemes = tuple(graphemes)
+            unique_idx = unique_idxs.get(graphemes)
+            if unique_idx is None:
+                unique_idx = len(unique_graphemes)
+                unique_idxs[graphemes] = unique_idx
+                unique_graphemes.append(graphemes)
+
+            word_unique_idxs.append(unique_idx)
+
+        unique_guesses: typing.List[typing.List[typing.Tuple[str, ...]]] = [
+            [] for _ in unique_graphemes
+        ]
+
+        # (word indexes in trie node, trie node depth, search state)
+        stack: typing.List[typing.Tuple[typing.List[int], int, _SearchState]] = [
+            (
+                [i for i, g in enumerate(unique_graphemes) if g],
+                0,
+                _SearchState(self.start_node, beam),
+            )
+        ]
+
+        while stack:
+            word_idxs, depth, state = stack.pop()
+            if not word_idxs:
+                continue
+
+            if len(word_idxs) == 1:
+                # Finish search for a single word
+                self._advance(
+                    state,
+                    unique_graphemes[word_idxs[0]],
+                    eps=eps,
+                    min_beam=min_beam,
+                    beam_scale=beam_scale,
+                    max_guesses=max_guesses,
+                )
+                unique_guesses[word_idxs[0]] = state.guesses(max_guesses)
+                continue
+
+            # Any word in the trie node can stand in for the shared prefix
+            finished = self._advance(
+                state,
+                unique_graphemes[word_idxs[0]],
+                eps=eps,
+                min_beam=min_beam,
+                beam_scale=beam_scale,
+                max_guesses=max_guesses,
+                max_position=depth - max_label_len,
+            )
+
+            if finished:
+                shared_guesses = state.guesses(max_guesses)
+                for word_idx in word_idxs:
+                    unique_guesses[word_idx] = list(shared_guesses)
+
+                continue
+
+            # Fork into child trie nodes
+            child_idxs: typing.Dict[str, typing.List[int]] = {}
+            for word_idx in word_idxs:
+                graphemes = unique_graphemes[word_idx]
+                if len(graphemes) == depth:
+                    # Word ends at this trie node
+                    stack.append(([word_idx], depth, state.copy()))
+                else:
+                    child_idxs.setdefault(graphemes[depth], []).append(word_idx)
+
+            for next_word_idxs in child_idxs.values():
+                stack.append((next_word_idxs, depth + 1, state.copy()))
+
+        return [unique_guesses[unique_idx] for unique_idx in word_unique_idxs]
+
+    def _advance(
+        self,
+        state: "_SearchState",
+        graphemes: typing.Sequence[str],
+        eps: str = "<eps>",
+        min_beam: int = 100,
+        beam_scale: float = 0.6,
+        max_guesses: int = 1,
+        max_position: typing.Optional[int] = None,
+    ) -> bool:
+        """Run search steps until the search is finished (returns True).
+
+        If max_position is set, stops early (returns False) before expanding
+        a hypothesis that has consumed more than max_position graphemes.
+        """
+        if state.finished:
+            return True
+
+        grapheme_ids, label_ids, label_lens, label_is_eps = self._get_label_arrays(eps)
+        max_label_len = label_ids.shape[1]
+        num_graphemes = len(graphemes)
+
+        # Graphemes not used by any edge never match (-2).
+        # Window k of row i is grapheme i + k, or -3 past the end of the word.
+        word_ids = np.array(
+            [grapheme_ids.get(g, -2) for g in graphemes] + ([-3] * max_label_len),
+            dtype=np.int32,
+        )
+        word_windows = np.stack(
+            [word_ids[k : k + num_graphemes + 1] for k in range(max_label_len)],
+            axis=1,
+        )
+
+        while len(state.probs) > 0:
+            probs = state.probs
+            nodes = state.nodes
+            positions = state.positions
+            is_final = state.is_final
+            out_ptrs = state.out_ptrs
+
+            # Expand hypotheses that are not complete
+            parents = np.flatnonzero(~is_final)
+            if (
+                (max_position is not None)
+                and (len(parents) > 0)
+                and (int(positions[parents].max()) > max_position)
+            ):
+                return False
+
+            # Complete guesses (in beam order)
+            for final_idx in np.flatnonzero(is_final):
+                phonemes = self._get_output(state, int(out_ptrs[final_idx]))
+                if phonemes not in state.guessed_phonemes:
+                    heapq.heappush(
+                        state.best_heap,
+                        (float(probs[final_idx]), len(state.best_heap), phonemes),
+                    )
+                    state.guessed_phonemes.add(phonemes)
+
+                if len(state.best_heap) >= max_guesses:
+                    # Done with word
+                    state.finished = True
+                    return True
+
+            if len(parents) == 0:
+                break
+
+            parent_nodes = nodes[parents]
+            parent_positions = positions[parents]
+
+            # Transition to final state when all graphemes are consumed
+            final_probs = self.node_final_probs[parent_nodes]
+            final_mask = (parent_positions == num_graphemes) & (final_probs != np.inf)
+            final_parents = np.flatnonzero(final_mask)
+
+            # Gather out-edges for all parents
+            edge_starts = self.edge_offsets[parent_nodes].astype(np.int64)
+            edge_counts = (
+                self.edge_offsets[parent_nodes + 1].astype(np.int64) - edge_starts
+            )
+            num_edges = int(edge_counts.sum())
+
+            edge_parents = np.repeat(np.arange(len(parents)), edge_counts)
+            edge_idxs = (
+                np.arange(num_edges)
+                - np.repeat(np.cumsum(edge_counts) - edge_counts, edge_counts)
+                + np.repeat(edge_starts, edge_counts)
+            )
+
+            edges = self.edges[edge_idxs]
+            ilabels = edges[:, 2]
+            edge_positions = parent_positions[edge_parents]
+            remaining = num_graphemes - edge_positions
+
+            # Label must fit in the remaining graphemes
+            fits = label_lens[ilabels] <= remaining
+            edge_is_eps = label_is_eps[ilabels] & fits
+
+            # Compare label graphemes to the graphemes at each position
+            edge_label_ids = label_ids[ilabels]
+            matches = (
+                fits
+                & ~label_is_eps[ilabels]
+                & np.all(
+                    (edge_label_ids == word_windows[edge_positions])
+                    | (edge_label_ids < 0),
+                    axis=1,
+                )
+            )
+
+            keep = edge_is_eps | matches
+            kept = np.flatnonzero(keep)
+            kept_parents = edge_parents[kept]
+            kept_edges = edges[kept]
+            kept_matches = matches[kept]
+
+            # New outputs for edges that consume graphemes
+            match_idxs = np.flatnonzero(kept_matches)
+            kept_out_ptrs = out_ptrs[parents[kept_parents]]
+            state.out_parents = np.concatenate(
+                [state.out_parents, kept_out_ptrs[match_idxs]]
+            )
+            state.out_labels = np.concatenate(
+                [state.out_labels, kept_edges[match_idxs, 3].astype(np.int64)]
+            )
+            kept_out_ptrs[match_idxs] = np.arange(
+                len(state.out_parents) - len(match_idxs), len(state.out_parents)
+            )
+
+            # Candidates in expansion order: for each parent, its final
+            # transition (if any) and then its out-edges in order.
+            cand_order_keys = np.concatenate(
+                [final_parents * 2, (kept_parents * 2) + 1]
+            )
+            cand_order = np.argsort(cand_order_keys, kind="stable")
+
+            cand_probs = np.concatenate(
+                [
+                    probs[parents[final_parents]]
+                    + final_probs[final_parents].astype(np.float64),
+                    probs[parents[kept_parents]]
+                    + self.edge_probs[edge_idxs[kept]].astype(np.float64),
+                ]
+            )[cand_order]
+            cand_nodes = np.concatenate(
+                [parent_nodes[final_parents], kept_edges[:, 1].astype(np.int64)]
+            )[cand_order]
+            cand_positions = np.concatenate(
+                [
+                    parent_positions[final_parents],
+                    edge_positions[kept]
+                    + (label_lens[kept_edges[:, 2]] * kept_matches),
+                ]
+            )[cand_order]
+            cand_is_final = np.concatenate(
+                [
+                    np.ones(len(final_parents), dtype=bool),
+                    np.zeros(len(kept), dtype=bool),
+                ]
+            )[cand_order]
+            cand_out_ptrs = np.concatenate(
+                [out_ptrs[parents[final_parents]], kept_out_ptrs]
+            )[cand_order]
+
+            # Prune beam
+            beam_idxs = _stable_smallest(cand_probs, state.current_beam)
+
+            state.probs = cand_probs[beam_idxs]
+            state.nodes = cand_nodes[beam_idxs]
+            state.positions = cand_positions[beam_idxs]
+            state.is_final = cand_is_final[beam_idxs]
+            state.out_ptrs = cand_out_ptrs[beam_idxs]
+
+            state.current_beam = max(min_beam, (int(state.current_beam * beam_scale)))
+
+        state.finished = True
+        return True
+
+    def _get_output(
+        self, state: "_SearchState", out_ptr: int
+    ) -> typing.Tuple[str, ...]:
+        """Follow back-pointers to get the phonemes of a hypothesis"""
+        olabel_idxs = []
+        while out_ptr >= 0:
+            olabel_idxs.append(int(state.out_labels[out_ptr]))
+            out_ptr = int(state.out_parents[out_ptr])
+
+        output: typing.List[str] = []
+        for olabel_idx in reversed(olabel_idxs):
+            output.extend(self.symbols[olabel_idx][1])
+
+        return tuple(output)
+
+    def _search_python(
+        self,
+        graphemes: typing.Sequence[str],
+        eps: str = "<eps>",
+        beam: int = 5000,
+        min_beam: int = 100,
+        beam_scale: float = 0.6,
+        max_guesses: int = 1,
+    ) -> typing.List[typing.Tuple[str, ...]]:
+        """Beam search one hypothesis and edge at a time.
+
+        Reference implementation for _search (used in tests and benchmarks).
+        """
+        current_beam = beam
 
         # (prob, node, graphemes, phonemes, final, beam)
         q: typing.List[
@@ -372,7 +1079,7 @@ class PhonetisaurusGraph:
         ] = []
 
         # (prob, phonemes)
-        best_heap: typing.List[typing.Tuple[float, typing.Sequence[str]]] = []
+        best_heap: typing.List[typing.Tuple[float, typing.Tuple[str, ...]]] = []
 
         # Avoid duplicate guesses
         guessed_phonemes: typing.Set[typing.Tuple[str, ...]] = set()
@@ -398,47 +1105,20 @@ class PhonetisaurusGraph:
                 assert node is not None
 
                 if not next_graphemes:
-                    if self.preloaded:
-                        final_prob = self.final_node_probs.get(node, _NOT_FINAL)
-                    else:
-                        final_prob = self.final_node_probs.get(node)
-                        if final_prob is None:
-                            final_idx = int(np.searchsorted(self.final_nodes, node))
-                            if self.final_nodes[final_idx] == node:
-                                # Cache
-                                final_prob = float(self.final_probs[final_idx])
-                                self.final_node_probs[node] = final_prob
-                            else:
-                                # Not a final state
-                                final_prob = _NOT_FINAL
-                                self.final_node_probs[node] = final_prob
-
-                    if final_prob != _NOT_FINAL:
-                        final_prob = typing.cast(float, final_prob)
+                    final_prob = float(self.node_final_probs[node])
+                    if final_prob != np.inf:
                         q_next.append((prob + final_prob, None, [], output, True))
 
                 len_next_graphemes = len(next_graphemes)
-                if self.preloaded:
-                    # Was pre-loaded in __init__
-                    edge_idxs = self.out_edges[node]
-                else:
-                    # Build cache during search
-                    maybe_edge_idxs = self.out_edges.get(node)
-                    if maybe_edge_idxs is None:
-                        edge_idx = int(np.searchsorted(self.edges[:, 0], node))
-                        edge_idxs = []
-                        while self.edges[edge_idx][0] == node:
-                            edge_idxs.append(edge_idx)
-                            edge_idx += 1
-
-                        # Cache
-                        self.out_edges[node] = edge_idxs
-                    else:
-                        edge_idxs = maybe_edge_idxs
 
-                for edge_idx in edge_idxs:
-                    _, to_node, ilabel_idx, olabel_idx = self.edges[edge_idx]
-                    out_prob = self.edge_probs[edge_idx]
+                # Out-edges of node (CSR)
+                edge_start = int(self.edge_offsets[node])
+                edge_end = int(self.edge_offsets[node + 1])
+
+                for (_, to_node, ilabel_idx, olabel_idx), out_prob in zip(
+                    self.edges[edge_start:edge_end].tolist(),
+                    self.edge_probs[edge_start:edge_end].tolist(),
+                ):
 
                     len_igraphemes, igraphemes = self.symbols[ilabel_idx]
 
@@ -449,7 +1129,7 @@ class PhonetisaurusGraph:
                         item = (prob + out_prob, to_node, next_graphemes, output, False)
                         q_next.append(item)
                     else:
-                        sub_graphemes = next_graphemes[:len_igraphemes]
+                        sub_graphemes = list(next_graphemes[:len_igraphemes])
                         if igraphemes == sub_graphemes:
                             _, olabel = self.symbols[olabel_idx]
                             item = (
@@ -469,15 +1149,77 @@ class PhonetisaurusGraph:
 
             current_beam = max(min_beam, (int(current_beam * beam_scale)))
 
-        # Yield guesses
-        if best_heap:
+        return [
+            guess_phonemes
             for _, guess_phonemes in sorted(best_heap, key=lambda item: item[0])[
                 :max_guesses
-            ]:
-                yield graphemes, [p for p in guess_phonemes if p]
-        else:
-            # No guesses
-            yield graphemes, []
+            ]
+        ]
+
+
+class _SearchState:
+    """Beam and completed guesses of a search in progress"""
+
+    def __init__(self, start_node: int, beam: int):
+        self.probs = np.zeros(1, dtype=np.float64)
+        self.nodes = np.array([start_node], dtype=np.int64)
+        self.positions = np.zeros(1, dtype=np.int64)  # graphemes consumed
+        self.is_final = np.zeros(1, dtype=bool)
+        self.out_ptrs = np.full(1, -1, dtype=np.int64)  # index into output history
+
+        # Output history (back-pointers)
+        self.out_parents = np.zeros(0, dtype=np.int64)
+        self.out_labels = np.zeros(0, dtype=np.int64)
+
+        # (prob, order, phonemes)
+        self.best_heap: typing.List[
+            typing.Tuple[float, int, typing.Tuple[str, ...]]
+        ] = []
+
+        # Avoid duplicate guesses
+        self.guessed_phonemes: typing.Set[typing.Tuple[str, ...]] = set()
+
+        self.current_beam = beam
+        self.finished = False
+
+    def copy(self) -> "_SearchState":
+        """Copy state so it can be advanced separately.
+
+        Arrays are replaced (never modified in place) during search, so only
+        the guesses need to be copied.
+        """
+        state = _SearchState.__new__(_SearchState)
+        state.__dict__.update(self.__dict__)
+        state.best_heap = list(self.best_heap)
+        state.guessed_phonemes = set(self.guessed_phonemes)
+
+        return state
+
+    def guesses(self, max_guesses: int) -> typing.List[typing.Tuple[str, ...]]:
+        """Best guesses found so far"""
+        return [
+            guess_phonemes
+            for _, _, guess_phonemes in heapq.nsmallest(max_guesses, self.best_heap)
+        ]
+
+
+def _stable_smallest(values: np.ndarray, k: int) -> np.ndarray:
+    """Indexes of the k smallest values in the same order as a stable sort"""
+    if len(values) <= k:
+        return np.argsort(values, kind="stable")
+
+    if k <= 0:
+        return np.zeros(0, dtype=np.int64)
+
+    # Value of the k-th smallest item
+    kth_value = values[np.argpartition(values, k - 1)[k - 1]]
+
+    # Everything smaller, plus the earliest items equal to the k-th value
+    smaller_idxs = np.flatnonzero(values < kth_value)
+    equal_idxs = np.flatnonzero(values == kth_value)[: k - len(smaller_idxs)]
+    selected_idxs = np.sort(np.concatenate([smaller_idxs, equal_idxs]))
+
+    return selected_idxs[np.argsort(values[selected_idxs], kind="stable")]
 
 
 # -----------------------------------------------------------------------------
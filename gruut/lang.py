@@ -3,22 +3,47 @@
 import logging
 import re
 import sqlite3
+import threading
+import time
 import typing
 from pathlib import Path
 
-import networkx as nx
-
 from gruut.const import PHONEMES_TYPE, GraphType, SentenceNode, Time
-from gruut.g2p import GraphemesToPhonemes
 from gruut.phonemize import SqlitePhonemizer
-from gruut.pos import PartOfSpeechTagger
 from gruut.text_processor import InterpretAsFormat, TextProcessorSettings
-from gruut.utils import find_lang_dir, remove_non_word_chars, resolve_lang
+from gruut.utils import (
+    STATS_TYPE,
+    LRUCache,
+    StatsCounters,
+    find_lang_dir,
+    get_stats,
+    remove_non_word_chars,
+    resolve_lang,
+)
 
 #from gruut.g2p_transformer  import Encoder, Decoder, Seq2Seq
 
+if typing.TYPE_CHECKING:
+    # Model modules (numpy, pycrfsuite) are imported when models are loaded
+    from gruut.g2p import GraphemesToPhonemes
+    from gruut.g2p_phonetisaurus import PhonetisaurusGraph
+    from gruut.pos import PartOfSpeechTagger
+
 _LOGGER = logging.getLogger("gruut")
 
+# Number of sentences whose part of speech tags are cached (shared by all taggers)
+DEFAULT_POS_CACHE_SIZE = 4096
+
+# (lang, model path, words) -> tags
+POS_CACHE = LRUCache(max_size=DEFAULT_POS_CACHE_SIZE)
+
+# Engines for guessing word pronunciations (see get_settings)
+G2P_ENGINES = {"crf", "fst", "auto"}
+
+# graph path -> loaded Phonetisaurus graph (shared by all guessers)
+_G2P_GRAPHS: typing.Dict[str, "PhonetisaurusGraph"] = {}
+_G2P_GRAPHS_LOCK = threading.Lock()
+
 # -----------------------------------------------------------------------------
 
 
@@ -30,11 +55,23 @@ def get_settings(
     load_pos_tagger: bool = True,
     load_phoneme_lexicon: bool = True,
     load_g2p_guesser: bool = True,
+    g2p_engine: str = "auto",
     **settings_args,
 ) -> TextProcessorSettings:
-    """Get settings for a specific language"""
+    """Get settings for a specific language.
+
+    g2p_engine selects how unknown words are guessed: "crf" (g2p/model.crf),
+    "fst" (Phonetisaurus graph in g2p/graph.npz), or "auto" (fst if available,
+    crf otherwise).
+    """
     model_prefix = model_prefix or ""
 
+    if g2p_engine not in G2P_ENGINES:
+        raise ValueError(
+            f"Unknown grapheme to phoneme engine: {g2p_engine} "
+            f"(expected one of {sorted(G2P_ENGINES)})"
+        )
+
     # Resolve language
     if model_prefix:
         # espeak
@@ -64,7 +101,7 @@ def get_settings(
             if pos_model_path.is_file():
                 # POS tagger model will load on first use
                 settings_args["get_parts_of_speech"] = DelayedPartOfSpeechTagger(
-                    pos_model_path
+                    pos_model_path, lang=lang_only
                 )
             else:
                 _LOGGER.debug(
@@ -96,18 +133,35 @@ def get_settings(
 
         # Grapheme to phoneme mode
         if load_g2p_guesser and ("guess_phonemes" not in settings_args):
-            g2p_model_path = lang_dir / lang_model_prefix / "g2p" / "model.crf"
-            if g2p_model_path.is_file():
-                settings_args["guess_phonemes"] = DelayedGraphemesToPhonemes(
-                    g2p_model_path, transform_func=str.lower
-                )
+            g2p_dir = lang_dir / lang_model_prefix / "g2p"
+            g2p_model_path = g2p_dir / "model.crf"
+            g2p_graph_path = g2p_dir / "graph.npz"
+
+            if g2p_engine in {"fst", "auto"}:
+                if g2p_graph_path.is_file():
+                    # Graph will load on first use
+                    settings_args["guess_phonemes"] = DelayedPhonetisaurusGraph(
+                        g2p_graph_path, transform_func=str.lower
+                    )
+                elif g2p_engine == "fst":
+                    _LOGGER.warning(
+                        "(%s) no grapheme to phoneme graph found at %s (using CRF)",
+                        lang,
+                        g2p_graph_path,
+                    )
+
+            if "guess_phonemes" not in settings_args:
+                if g2p_model_path.is_file():
+                    settings_args["guess_phonemes"] = DelayedGraphemesToPhonemes(
+                        g2p_model_path, transform_func=str.lower
+                    )
 
-            else:
-                _LOGGER.debug(
-                    "(%s) no grapheme to phoneme CRF model found at %s",
-                    lang,
-                    g2p_model_path,
-                )
+                else:
+                    _LOGGER.debug(
+                        "(%s) no grapheme to phoneme CRF model found at %s",
+                        lang,
+                        g2p_model_path,
+                    )
     # ---------------------------------
     # Create language-specific settings
     # ---------------------------------
@@ -467,6 +521,8 @@ def fa_post_process_sentence(
     graph: GraphType, sent_node: SentenceNode, settings: TextProcessorSettings
 ):
     """Add e̞ for genitive case"""
+    import networkx as nx
+
     from gruut.text_processor import DATA_PROP, WordNode
 
     for dfs_node in nx.dfs_preorder_nodes(graph, sent_node.node):
@@ -513,6 +569,8 @@ def fr_post_process_sentence(
     graph: GraphType, sent_node: SentenceNode, settings: TextProcessorSettings
 ):
     """Add liasons to phonemes"""
+    import networkx as nx
+
     from gruut.text_processor import DATA_PROP, WordNode
     from gruut.utils import sliding_window
 
@@ -797,9 +855,10 @@ class DelayedGraphemesToPhonemes:
         **g2p_args,
     ):
         self.model_path = model_path
-        self.g2p: typing.Optional[GraphemesToPhonemes] = None
+        self.g2p: typing.Optional["GraphemesToPhonemes"] = None
         self.transform_func = transform_func
         self.g2p_args = g2p_args
+        self.counters = StatsCounters("guesses", "load_seconds")
 
     def __call__(
         self, word: str, role: typing.Optional[str] = None
@@ -808,32 +867,168 @@ class DelayedGraphemesToPhonemes:
             _LOGGER.debug(
                 "Loading grapheme to phoneme CRF model from %s", self.model_path
             )
+            from gruut.g2p import GraphemesToPhonemes
+
+            start_time = time.perf_counter()
             self.g2p = GraphemesToPhonemes(self.model_path, **self.g2p_args)
+            self.counters.add("load_seconds", time.perf_counter() - start_time)
 
         assert self.g2p is not None
 
         if self.transform_func is not None:
             word = self.transform_func(word)
 
+        self.counters.add("guesses")
         return self.g2p(word)
 
+    def stats(self, reset: bool = False) -> STATS_TYPE:
+        """Get number of guesses and model load time"""
+        return self.counters.stats(reset=reset)
+
+
+class DelayedPhonetisaurusGraph:
+    """Grapheme to phoneme guesser using a Phonetisaurus graph that loads on first use.
+
+    Graphs are memory-mapped and shared by all guessers with the same path.
+    """
+
+    def __init__(
+        self,
+        graph_path: typing.Union[str, Path],
+        transform_func: typing.Optional[typing.Callable[[str], str]] = None,
+        preload: bool = False,
+        **g2p_args,
+    ):
+        self.graph_path = Path(graph_path)
+        self.graph: typing.Optional["PhonetisaurusGraph"] = None
+        self.transform_func = transform_func
+        self.preload = preload
+        self.g2p_args = g2p_args
+        self.counters = StatsCounters("guesses", "load_seconds")
+
+    def __call__(
+        self, word: str, role: typing.Optional[str] = None
+    ) -> typing.Optional[PHONEMES_TYPE]:
+        if self.graph is None:
+            start_time = time.perf_counter()
+            self.graph = self.load_graph(self.graph_path, preload=self.preload)
+            self.counters.add("load_seconds", time.perf_counter() - start_time)
+
+        if self.transform_func is not None:
+            word = self.transform_func(word)
+
+        self.counters.add("guesses")
+        for _, phonemes in self.graph.g2p_one(word, **self.g2p_args):
+            if phonemes:
+                return phonemes
+
+        return None
+
+    def stats(self, reset: bool = False) -> STATS_TYPE:
+        """Get number of guesses and graph load time (near zero if shared)"""
+        return self.counters.stats(reset=reset)
+
+    @staticmethod
+    def load_graph(
+        graph_path: typing.Union[str, Path], preload: bool = False
+    ) -> "PhonetisaurusGraph":
+        """Load graph or get already loaded graph for path"""
+        graph_key = str(Path(graph_path).absolute())
+        graph = _G2P_GRAPHS.get(graph_key)
+        if graph is None:
+            with _G2P_GRAPHS_LOCK:
+                graph = _G2P_GRAPHS.get(graph_key)
+                if graph is None:
+                    from gruut.g2p_phonetisaurus import PhonetisaurusGraph
+
+                    _LOGGER.debug(
+                        "Loading grapheme to phoneme graph from %s", graph_path
+                    )
+                    graph = PhonetisaurusGraph.load(graph_path, preload=preload)
+                    _G2P_GRAPHS[graph_key] = graph
+
+        return graph
+
 
 class DelayedPartOfSpeechTagger:
-    """POS tagger that loads on first use"""
+    """POS tagger that loads on first use.
+
+    Tags for whole sentences are cached by (lang, model, words), so repeated
+    sentences are only tagged once. The cache is shared by all taggers unless
+    one is provided (or use_cache is False).
+    """
 
-    def __init__(self, model_path: typing.Union[str, Path], **tagger_args):
+    def __init__(
+        self,
+        model_path: typing.Union[str, Path],
+        lang: str = "",
+        use_cache: bool = True,
+        cache: typing.Optional[LRUCache] = None,
+        **tagger_args,
+    ):
 
         self.model_path = Path(model_path)
-        self.tagger: typing.Optional[PartOfSpeechTagger] = None
+        self.lang = lang
+        self.tagger: typing.Optional["PartOfSpeechTagger"] = None
         self.tagger_args = tagger_args
 
+        self.cache: typing.Optional[LRUCache] = None
+        if use_cache:
+            self.cache = cache if cache is not None else POS_CACHE
+
+        self._cache_prefix = (self.lang, str(self.model_path))
+        self._load_lock = threading.Lock()
+
+        # Counted per tagger, since the sentence cache may be shared
+        self.counters = StatsCounters(
+            "calls", "cache_hits", "cache_misses", "load_seconds"
+        )
+
     def __call__(self, words: typing.Sequence[str]) -> typing.Sequence[str]:
+        self.counters.add("calls")
+
+        cache_key: typing.Optional[typing.Tuple[typing.Any, ...]] = None
+        if self.cache is not None:
+            cache_key = (*self._cache_prefix, tuple(words))
+            cached_tags = self.cache.get(cache_key)
+            if cached_tags is not None:
+                self.counters.add("cache_hits")
+                return list(cached_tags)
+
+            self.counters.add("cache_misses")
+
         if self.tagger is None:
-            _LOGGER.debug("Loading part of speech tagger from %s", self.model_path)
-            self.tagger = PartOfSpeechTagger(self.model_path, **self.tagger_args)
+            with self._load_lock:
+                if self.tagger is None:
+                    from gruut.pos import PartOfSpeechTagger
+
+                    _LOGGER.debug(
+                        "Loading part of speech tagger from %s", self.model_path
+                    )
+                    start_time = time.perf_counter()
+                    self.tagger = PartOfSpeechTagger(
+                        self.model_path, **self.tagger_args
+                    )
+                    self.counters.add("load_seconds", time.perf_counter() - start_time)
 
         assert self.tagger is not None
-        return self.tagger(words)
+        tags = self.tagger(words)
+
+        if (self.cache is not None) and (cache_key is not None):
+            self.cache.put(cache_key, tuple(tags))
+
+        return tags
+
+    def cache_stats(self) -> typing.Dict[str, typing.Any]:
+        """Get hit/miss statistics for the sentence cache"""
+        if self.cache is None:
+            return {}
+
+        return self.cache.stats()
+
+    def stats(self, reset: bool = False) -> STATS_TYPE:
+        """Get number of calls, sentence cache hits/misses, and model load time"""
+        return self.counters.stats(reset=reset)
 
 
 class DelayedSqlitePhonemizer:
@@ -844,16 +1039,39 @@ class DelayedSqlitePhonemizer:
         self.db_path = Path(db_path)
         self.phonemizer: typing.Optional[SqlitePhonemizer] = None
         self.phonemizer_args = phonemizer_args
+        self.counters = StatsCounters("load_seconds")
+        self._load_lock = threading.Lock()
 
     def __call__(
         self, word: str, role: typing.Optional[str] = None, do_transforms: bool = True
     ) -> typing.Optional[PHONEMES_TYPE]:
         if self.phonemizer is None:
-            _LOGGER.debug("Connecting to lexicon database at %s", self.db_path)
-            db_conn = sqlite3.connect(str(self.db_path))
-            self.phonemizer = SqlitePhonemizer(db_conn=db_conn, **self.phonemizer_args)
+            with self._load_lock:
+                if self.phonemizer is None:
+                    self._connect()
 
         assert self.phonemizer is not None
         return self.phonemizer(word, role=role, do_transforms=do_transforms)
+
+    def _connect(self):
+        _LOGGER.debug("Connecting to lexicon database at %s", self.db_path)
+        start_time = time.perf_counter()
+
+        # Read-only queries are serialized by the phonemizer, so the connection
+        # can be shared between threads (e.g., TextProcessor.sentences_chunked).
+        db_conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self.phonemizer = SqlitePhonemizer(db_conn=db_conn, **self.phonemizer_args)
+        self.counters.add("load_seconds", time.perf_counter() - start_time)
+
+    def stats(self, reset: bool = False) -> STATS_TYPE:
+        """Get lexicon cache hits/misses, database queries, and connect time"""
+        phonemizer_stats = {
+            "lexicon_hits": 0,
+            "lexicon_misses": 0,
+            "sql_queries": 0,
+            **(get_stats(self.phonemizer, reset=reset) or {}),
+        }
+
+        return {**phonemizer_stats, **self.counters.stats(reset=reset)}
     
 
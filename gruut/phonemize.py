@@ -2,10 +2,12 @@
 import itertools
 import logging
 import sqlite3
+import threading
 import typing
 from pathlib import Path
 
 from gruut.const import PHONEMES_TYPE
+from gruut.utils import STATS_TYPE, StatsCounters
 
 # -----------------------------------------------------------------------------
 
@@ -36,6 +38,9 @@ class SqlitePhonemizer:
     ):
         self.db_conn = db_conn
 
+        # Connection may be shared between threads (check_same_thread=False)
+        self._db_lock = threading.Lock()
+
         # word -> role -> [phonemes]
         self.lexicon = lexicon if lexicon is not None else {}
 
@@ -44,6 +49,9 @@ class SqlitePhonemizer:
 
         self.casing_func = casing_func
 
+        # Lexicon cache hits/misses and database queries (see stats)
+        self.counters = StatsCounters("lexicon_hits", "lexicon_misses", "sql_queries")
+
     def __call__(
         self, word: str, role: typing.Optional[str] = None, do_transforms: bool = True
     ) -> typing.Optional[PHONEMES_TYPE]:
@@ -54,23 +62,10 @@ class SqlitePhonemizer:
         role_to_word = self.lexicon.get(word)
 
         if role_to_word is not None:
-            if role is not None:
-                # Exact role
-                phonemes = role_to_word.get(role)
-                if phonemes is not None:
-                    return phonemes
-
-            # Default role
-            phonemes = role_to_word.get(SqlitePhonemizer.DEFAULT_ROLE)
-            if phonemes is not None:
-                return phonemes
+            self.counters.add("lexicon_hits")
+            return SqlitePhonemizer._get_role_phonemes(role_to_word, role)
 
-            # Any role
-            if role_to_word:
-                return next(iter(role_to_word.values()))
-
-            # Not in lexicon (or database) for sure because role_to_word was present.
-            return None
+        self.counters.add("lexicon_misses")
 
         transforms = self.word_transform_funcs
         if not do_transforms:
@@ -91,12 +86,14 @@ class SqlitePhonemizer:
             #
             # Ordered by pronunciation descending because so duplicate roles
             # will be overwritten by earlier pronunciation.
-            cursor = self.db_conn.execute(
-                "SELECT role, phonemes FROM word_phonemes WHERE word = ? ORDER BY pron_order DESC",
-                (lookup_word,),
-            )
-
-            for row in cursor:
+            self.counters.add("sql_queries")
+            with self._db_lock:
+                rows = self.db_conn.execute(
+                    "SELECT role, phonemes FROM word_phonemes WHERE word = ? ORDER BY pron_order DESC",
+                    (lookup_word,),
+                ).fetchall()
+
+            for row in rows:
                 if role_to_word is None:
                     # Create new lexicon entry for original word
                     role_to_word = {}
@@ -110,7 +107,33 @@ class SqlitePhonemizer:
                 self.lexicon[lookup_word] = self.lexicon[word]
 
                 # Successfully looked up in the database
-                return self(word, role=role)
+                return SqlitePhonemizer._get_role_phonemes(role_to_word, role)
 
         # Not in lexicon
         return None
+
+    def stats(self, reset: bool = False) -> STATS_TYPE:
+        """Get lexicon cache hits/misses and number of database queries"""
+        return self.counters.stats(reset=reset)
+
+    @staticmethod
+    def _get_role_phonemes(
+        role_to_word: ROLE_TO_PHONEMES, role: typing.Optional[str] = None
+    ) -> typing.Optional[PHONEMES_TYPE]:
+        if role is not None:
+            # Exact role
+            phonemes = role_to_word.get(role)
+            if phonemes is not None:
+                return phonemes
+
+        # Default role
+        phonemes = role_to_word.get(SqlitePhonemizer.DEFAULT_ROLE)
+        if phonemes is not None:
+            return phonemes
+
+        # Any role
+        if role_to_word:
+            return next(iter(role_to_word.values()))
+
+        # Not in lexicon (or database) for sure because role_to_word was present.
+        return None
@@ -147,14 +147,63 @@ class PartOfSpeechTagger:
 
     @staticmethod
     def sent2features(
-        sentence: typing.Sequence[str], **kwargs
+        sentence: typing.Sequence[str],
+        add_bos: bool = True,
+        add_eos: bool = True,
+        words_backward: int = 2,
+        words_forward: int = 2,
+        **kwargs,
     ) -> typing.List[FEATURES_TYPE]:
-        """Get features for all words in a sentence"""
-        return [
-            PartOfSpeechTagger.word2features(sentence, i, **kwargs)
-            for i in range(len(sentence))
+        """Get features for all words in a sentence.
+
+        Produces the same output as calling word2features for each word, but
+        local features are only computed once per word and then re-used (with
+        prefixed keys) as context for surrounding words.
+        """
+        num_words = len(sentence)
+        if num_words < 1:
+            return []
+
+        # Local features for each word (no prefix)
+        local_features = [
+            PartOfSpeechTagger.local_features(word, **kwargs) for word in sentence
+        ]
+
+        # Keys are the same for every word, so prefixed keys are built only once
+        local_keys = list(local_features[0].keys())
+        local_values = [
+            list(word_features.values()) for word_features in local_features
         ]
 
+        prev_keys = [
+            [f"-{j}:{key}" for key in local_keys] for j in range(1, words_backward + 1)
+        ]
+        next_keys = [
+            [f"+{j}:{key}" for key in local_keys] for j in range(1, words_forward + 1)
+        ]
+
+        sentence_features: typing.List[FEATURES_TYPE] = []
+        for i, word_features in enumerate(local_features):
+            features = dict(word_features)
+
+            if (i == 0) and add_bos:
+                features["BOS"] = True
+
+            if (i == (num_words - 1)) and add_eos:
+                features["EOS"] = True
+
+            for j, keys in enumerate(prev_keys, start=1):
+                if i >= j:
+                    features.update(zip(keys, local_values[i - j]))
+
+            for j, keys in enumerate(next_keys, start=1):
+                if i < (num_words - j):
+                    features.update(zip(keys, local_values[i + j]))
+
+            sentence_features.append(features)
+
+        return sentence_features
+
     @staticmethod
     def encode_string(s: str) -> str:
         """Encodes string in a form that crfsuite will accept (ASCII) and can be decoded"""
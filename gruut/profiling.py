@@ -0,0 +1,288 @@
+"""Profiling for gruut command-line workloads"""
+import cProfile
+import logging
+import os
+import pstats
+import sys
+import threading
+import tracemalloc
+import typing
+from collections import OrderedDict
+from pathlib import Path
+
+from gruut.const import StageTiming
+
+# -----------------------------------------------------------------------------
+
+_LOGGER = logging.getLogger("gruut.profiling")
+
+_GRUUT_DIR = str(Path(__file__).parent.absolute())
+
+# (file, line, function) as used by pstats
+FUNC_KEY = typing.Tuple[str, int, str]
+
+# Stacks whose time is below this fraction of the total are not expanded
+MIN_STACK_FRACTION = 1e-3
+
+
+class Profiler:
+    """Runs code under cProfile, with optional tracemalloc at stage boundaries.
+
+    Use as a context manager around the workload. Pass as on_stage_timing to
+    TextProcessor (with trace_memory=True) to record traced memory for each
+    pipeline stage.
+    """
+
+    def __init__(
+        self,
+        pstats_path: typing.Optional[typing.Union[str, Path]] = None,
+        collapsed_path: typing.Optional[typing.Union[str, Path]] = None,
+        top: int = 20,
+        trace_memory: bool = False,
+        memory_frames: int = 1,
+    ):
+        self.pstats_path = pstats_path
+        self.collapsed_path = collapsed_path
+        self.top = top
+        self.trace_memory = trace_memory
+        self.memory_frames = memory_frames
+
+        self.profile = cProfile.Profile()
+
+        # stage -> {calls, max_current_bytes, max_peak_bytes}
+        self.stage_memory: "OrderedDict[str, typing.Dict[str, int]]" = OrderedDict()
+        self.memory_snapshot: typing.Optional[tracemalloc.Snapshot] = None
+        self._started_tracemalloc = False
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+        if self.pstats_path:
+            self.write_pstats(self.pstats_path)
+
+        if self.collapsed_path:
+            self.write_collapsed(self.collapsed_path)
+
+        self.print_summary()
+
+    def __call__(self, timing: StageTiming):
+        """Record traced memory at the end of a pipeline stage"""
+        if not self.trace_memory or not tracemalloc.is_tracing():
+            return
+
+        current_bytes, peak_bytes = tracemalloc.get_traced_memory()
+
+        if hasattr(tracemalloc, "reset_peak"):
+            # Next stage's peak starts from here (Python 3.9+)
+            tracemalloc.reset_peak()
+
+        with self._lock:
+            stage = self.stage_memory.get(timing.stage)
+            if stage is None:
+                stage = {"calls": 0, "max_current_bytes": 0, "max_peak_bytes": 0}
+                self.stage_memory[timing.stage] = stage
+
+            stage["calls"] += 1
+            stage["max_current_bytes"] = max(stage["max_current_bytes"], current_bytes)
+            stage["max_peak_bytes"] = max(stage["max_peak_bytes"], peak_bytes)
+
+    def start(self):
+        """Start profiling (and memory tracing)"""
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start(self.memory_frames)
+            self._started_tracemalloc = True
+
+        self.profile.enable()
+
+    def stop(self):
+        """Stop profiling (and memory tracing)"""
+        self.profile.disable()
+
+        if self.trace_memory and tracemalloc.is_tracing():
+            self.memory_snapshot = tracemalloc.take_snapshot()
+
+            if self._started_tracemalloc:
+                tracemalloc.stop()
+                self._started_tracemalloc = False
+
+    # -------------------------------------------------------------------------
+
+    def get_stats(self) -> pstats.Stats:
+        """Get collected profile statistics"""
+        return pstats.Stats(self.profile)
+
+    def write_pstats(self, pstats_path: typing.Union[str, Path]):
+        """Write statistics for pstats/snakeviz"""
+        self.profile.dump_stats(str(pstats_path))
+        _LOGGER.debug("Wrote profile statistics to %s", pstats_path)
+
+    def write_collapsed(self, collapsed_path: typing.Union[str, Path]):
+        """Write collapsed stacks for flamegraph.pl/speedscope"""
+        with open(collapsed_path, "w", encoding="utf-8") as collapsed_file:
+            for stack, micros in collapsed_stacks(self.get_stats()).items():
+                print(stack, micros, file=collapsed_file)
+
+        _LOGGER.debug("Wrote collapsed stacks to %s", collapsed_path)
+
+    def print_summary(self, file: typing.TextIO = sys.stderr):
+        """Print hottest gruut functions (and memory use) as tables"""
+        rows = hottest_functions(self.get_stats(), top=self.top)
+        func_width = max([len("function")] + [len(row["function"]) for row in rows])
+
+        print(
+            "function".ljust(func_width),
+            "calls".rjust(10),
+            "self ms".rjust(10),
+            "total ms".rjust(10),
+            file=file,
+        )
+
+        for row in rows:
+            print(
+                row["function"].ljust(func_width),
+                str(row["calls"]).rjust(10),
+                f"{row['self_seconds'] * 1000:.2f}".rjust(10),
+                f"{row['total_seconds'] * 1000:.2f}".rjust(10),
+                file=file,
+            )
+
+        if self.stage_memory:
+            print("", file=file)
+            stage_width = max([len("stage")] + [len(s) for s in self.stage_memory])
+            print(
+                "stage".ljust(stage_width),
+                "calls".rjust(8),
+                "current MB".rjust(12),
+                "peak MB".rjust(12),
+                file=file,
+            )
+
+            for stage_name, stage in self.stage_memory.items():
+                print(
+                    stage_name.ljust(stage_width),
+                    str(stage["calls"]).rjust(8),
+                    f"{stage['max_current_bytes'] / (1024 * 1024):.2f}".rjust(12),
+                    f"{stage['max_peak_bytes'] / (1024 * 1024):.2f}".rjust(12),
+                    file=file,
+                )
+
+        if self.memory_snapshot is not None:
+            print("", file=file)
+            top_stats = self.memory_snapshot.statistics("lineno")[: self.top]
+            for stat in top_stats:
+                print(stat, file=file)
+
+
+# -----------------------------------------------------------------------------
+
+
+def func_label(func: FUNC_KEY) -> str:
+    """Short label for a profiled function (module.py:line:name)"""
+    file_name, line_num, func_name = func
+    if file_name == "~":
+        # Built-in function
+        label = func_name
+    else:
+        label = f"{os.path.basename(file_name)}:{line_num}:{func_name}"
+
+    # Semicolons separate frames in collapsed stacks
+    return label.replace(";", ":")
+
+
+def is_gruut_func(func: FUNC_KEY) -> bool:
+    """True if function is part of the gruut package (excluding this module)"""
+    file_path = os.path.abspath(func[0])
+    return file_path.startswith(_GRUUT_DIR + os.sep) and (
+        file_path != os.path.abspath(__file__)
+    )
+
+
+def hottest_functions(
+    stats: pstats.Stats, top: int = 20
+) -> typing.List[typing.Dict[str, typing.Any]]:
+    """Get gruut functions with the most time spent in the function itself"""
+    func_stats = stats.stats  # type: ignore
+
+    rows = []
+    for func, (_, num_calls, self_seconds, total_seconds, _) in func_stats.items():
+        if not is_gruut_func(func):
+            continue
+
+        rows.append(
+            {
+                "function": func_label(func),
+                "calls": num_calls,
+                "self_seconds": self_seconds,
+                "total_seconds": total_seconds,
+            }
+        )
+
+    rows.sort(key=lambda row: row["self_seconds"], reverse=True)
+
+    return rows[:top]
+
+
+def collapsed_stacks(stats: pstats.Stats) -> typing.Dict[str, int]:
+    """Approximate collapsed stacks (frame;frame;frame -> microseconds).
+
+    cProfile only records caller/callee pairs, so time for a function is split
+    across its callers in proportion to the cumulative time of each call edge.
+    Recursive calls are not expanded again (this includes distinct functions
+    that share a key, such as generated dataclass __init__ methods).
+    """
+    func_stats = stats.stats  # type: ignore
+
+    # caller -> [(callee, cumulative seconds from caller)]
+    callees: typing.Dict[FUNC_KEY, typing.List[typing.Tuple[FUNC_KEY, float]]] = {}
+    roots: typing.List[FUNC_KEY] = []
+    for func, (_, _, _, _, callers) in func_stats.items():
+        if not callers:
+            roots.append(func)
+
+        for caller, caller_stats in callers.items():
+            callees.setdefault(caller, []).append((func, caller_stats[3]))
+
+    total_seconds = sum(func_stats[root][3] for root in roots) or 1.0
+    min_seconds = total_seconds * MIN_STACK_FRACTION
+
+    stacks: typing.Dict[str, int] = {}
+
+    def add_stack(stack: typing.List[str], seconds: float):
+        micros = int(seconds * 1e6)
+        if micros > 0:
+            stack_str = ";".join(stack)
+            stacks[stack_str] = stacks.get(stack_str, 0) + micros
+
+    # (func, stack labels, funcs on stack, fraction of func's time)
+    todo = [(root, [func_label(root)], {root}, 1.0) for root in roots]
+    while todo:
+        func, stack, on_stack, fraction = todo.pop()
+        _, _, self_seconds, func_total_seconds, _ = func_stats[func]
+        add_stack(stack, self_seconds * fraction)
+
+        for callee, edge_seconds in callees.get(func, []):
+            callee_total_seconds = func_stats[callee][3]
+            if (callee in on_stack) or (callee_total_seconds <= 0):
+                continue
+
+            callee_fraction = fraction * (edge_seconds / callee_total_seconds)
+            if (callee_total_seconds * callee_fraction) < min_seconds:
+                # Fold small subtrees into the caller
+                add_stack(stack, callee_total_seconds * callee_fraction)
+                continue
+
+            todo.append(
+                (
+                    callee,
+                    stack + [func_label(callee)],
+                    on_stack | {callee},
+                    callee_fraction,
+                )
+            )
+
+    return stacks
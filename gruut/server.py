@@ -0,0 +1,491 @@
+"""Local HTTP/JSON server with micro-batching.
+
+Usage: python -m gruut serve [--host HOST] [--port PORT] [gruut options]
+
+POST /sentences with {"text": "...", "lang": "en-us", "ssml": false, ...}
+returns {"sentences": [...]} (same objects as gruut's JSON output).
+Other keys override processing options (see PROCESS_OPTIONS and SENTENCES_OPTIONS).
+
+GET /metrics returns runtime stats in the Prometheus text format.
+
+Requests that arrive within --batch-window milliseconds are grouped into a batch,
+which is processed by one of --threads workers sharing a single TextProcessor
+(so models, lexicon cache, and part of speech cache are shared). Identical
+requests in a batch are only processed once.
+"""
+import argparse
+import concurrent.futures
+import dataclasses
+import json
+import logging
+import queue
+import socketserver
+import threading
+import time
+import typing
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+from gruut.__main__ import get_args, make_text_processor
+from gruut.const import Sentence
+from gruut.text_processor import TextProcessor
+from gruut.utils import STATS_TYPE, StatsCounters, stats_to_prometheus
+
+# -----------------------------------------------------------------------------
+
+_LOGGER = logging.getLogger("gruut.server")
+
+# Request keys passed to TextProcessor.process
+PROCESS_OPTIONS = {
+    "pos",
+    "phonemize",
+    "post_process",
+    "detect_numbers",
+    "detect_currency",
+    "detect_dates",
+    "detect_times",
+    "verbalize_numbers",
+    "verbalize_currency",
+    "verbalize_dates",
+    "verbalize_times",
+}
+
+# Request keys passed to TextProcessor.sentences
+SENTENCES_OPTIONS = {
+    "major_breaks",
+    "minor_breaks",
+    "punctuations",
+    "explicit_lang",
+    "phonemes",
+    "break_phonemes",
+    "pos",
+}
+
+
+class QueueFullError(Exception):
+    """Raised when too many requests are waiting to be batched"""
+
+
+@dataclass
+class SentencesRequest:
+    """Text to process, and a future for its sentences"""
+
+    text: str
+    """Input text or SSML"""
+
+    lang: typing.Optional[str] = None
+    """Default language of input text"""
+
+    ssml: bool = False
+    """True if input text is SSML"""
+
+    process_args: typing.Dict[str, typing.Any] = field(default_factory=dict)
+    """Keyword arguments for TextProcessor.process"""
+
+    sentences_args: typing.Dict[str, typing.Any] = field(default_factory=dict)
+    """Keyword arguments for TextProcessor.sentences"""
+
+    future: concurrent.futures.Future = field(default_factory=concurrent.futures.Future)
+    """Receives list of sentences (cancelled if client timed out)"""
+
+    @property
+    def key(self) -> typing.Tuple[typing.Any, ...]:
+        """Requests with the same key have the same sentences"""
+        return (
+            self.text,
+            self.lang,
+            self.ssml,
+            tuple(sorted(self.process_args.items())),
+            tuple(sorted(self.sentences_args.items())),
+        )
+
+
+class MicroBatcher:
+    """Groups requests that arrive close together and processes them on a pool.
+
+    Identical requests in a batch are processed once. Distinct requests are
+    processed in parallel.
+    """
+
+    def __init__(
+        self,
+        text_processor: TextProcessor,
+        max_workers: int = 4,
+        batch_window: float = 0.005,
+        max_batch_size: int = 32,
+        max_queue_size: int = 1024,
+    ):
+        self.text_processor = text_processor
+        self.max_workers = max(1, max_workers)
+        self.batch_window = batch_window
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_queue_size = max_queue_size
+
+        self.counters = StatsCounters(
+            "requests",
+            "rejected_requests",
+            "timeouts",
+            "errors",
+            "batches",
+            "batched_requests",
+            "deduplicated_requests",
+            "request_seconds",
+        )
+
+        self._queue: "queue.Queue[typing.Optional[SentencesRequest]]" = queue.Queue(
+            maxsize=max_queue_size
+        )
+
+        # Requests wait for a free worker instead of piling up in the executor
+        self._free_workers = threading.Semaphore(self.max_workers)
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.max_workers
+        )
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def submit(self, request: SentencesRequest) -> concurrent.futures.Future:
+        """Queue request for the next batch (raises QueueFullError)"""
+        try:
+            self._queue.put_nowait(request)
+        except queue.Full:
+            self.counters.add("rejected_requests")
+            raise QueueFullError()
+
+        self.counters.add("requests")
+
+        return request.future
+
+    def stats(self, reset: bool = False) -> STATS_TYPE:
+        """Get request/batch counters and queue size"""
+        return {
+            **self.counters.stats(reset=reset),
+            "queue": {"size": self._queue.qsize(), "max_size": self.max_queue_size},
+        }
+
+    def close(self):
+        """Stop batching after queued requests are processed"""
+        self._queue.put(None)
+        self._thread.join()
+        self._executor.shutdown(wait=True)
+
+    # -------------------------------------------------------------------------
+
+    def _run(self):
+        """Collect requests into batches"""
+        while True:
+            request = self._queue.get()
+            if request is None:
+                break
+
+            batch = [request]
+            deadline = time.monotonic() + self.batch_window
+            stopping = False
+
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+
+                try:
+                    request = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+
+                if request is None:
+                    stopping = True
+                    break
+
+                batch.append(request)
+
+            self.counters.add("batches")
+            self.counters.add("batched_requests", len(batch))
+
+            # key -> identical requests (processed once)
+            requests_by_key: typing.Dict[typing.Any, typing.List[SentencesRequest]] = {}
+            for request in batch:
+                requests_by_key.setdefault(request.key, []).append(request)
+
+            # Distinct requests are processed in parallel
+            for same_requests in requests_by_key.values():
+                self._free_workers.acquire()
+                self._executor.submit(self._process_requests, same_requests)
+
+            if stopping:
+                break
+
+    def _process_requests(self, same_requests: typing.List[SentencesRequest]):
+        """Process identical requests once for all clients that are still waiting"""
+        try:
+            # Skip clients that timed out while this request was waiting
+            same_requests = [
+                request
+                for request in same_requests
+                if request.future.set_running_or_notify_cancel()
+            ]
+            if not same_requests:
+                return
+
+            self.counters.add("deduplicated_requests", len(same_requests) - 1)
+            request = same_requests[0]
+
+            try:
+                graph, root = self.text_processor(
+                    request.text,
+                    lang=request.lang,
+                    ssml=request.ssml,
+                    **request.process_args,
+                )
+                sentences = list(
+                    self.text_processor.sentences(graph, root, **request.sentences_args)
+                )
+
+                for same_request in same_requests:
+                    same_request.future.set_result(sentences)
+            except Exception as e:
+                _LOGGER.exception(request.text)
+                self.counters.add("errors", len(same_requests))
+
+                for same_request in same_requests:
+                    same_request.future.set_exception(e)
+        finally:
+            self._free_workers.release()
+
+
+# -----------------------------------------------------------------------------
+# HTTP
+# -----------------------------------------------------------------------------
+
+
+class GruutHTTPServer(socketserver.ThreadingMixIn, HTTPServer):
+    """HTTP server with one thread per connection"""
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        server_address: typing.Tuple[str, int],
+        batcher: MicroBatcher,
+        timeout: float = 30.0,
+        default_options: typing.Optional[typing.Mapping[str, typing.Any]] = None,
+    ):
+        super().__init__(server_address, GruutRequestHandler)
+        self.batcher = batcher
+        self.request_timeout = timeout
+        self.default_options = dict(default_options or {})
+
+
+class GruutRequestHandler(BaseHTTPRequestHandler):
+    """Handles /sentences and /metrics"""
+
+    server: GruutHTTPServer
+
+    def do_GET(self):
+        """Handle GET /metrics"""
+        if self.path.split("?", maxsplit=1)[0] != "/metrics":
+            self.send_json(404, {"error": f"Not found: {self.path}"})
+            return
+
+        batcher = self.server.batcher
+        metrics_text = stats_to_prometheus(
+            {**batcher.text_processor.stats(), "server": batcher.stats()}
+        )
+        self.send_body(200, metrics_text.encode(), "text/plain; version=0.0.4")
+
+    def do_POST(self):
+        """Handle POST /sentences"""
+        if self.path.split("?", maxsplit=1)[0] != "/sentences":
+            self.send_json(404, {"error": f"Not found: {self.path}"})
+            return
+
+        start_time = time.perf_counter()
+        batcher = self.server.batcher
+
+        try:
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            request, timeout = self.make_request(json.loads(body))
+        except (ValueError, TypeError) as e:
+            self.send_json(400, {"error": str(e)})
+            return
+
+        try:
+            future = batcher.submit(request)
+        except QueueFullError:
+            self.send_json(503, {"error": "Too many requests"})
+            return
+
+        try:
+            sentences: typing.List[Sentence] = future.result(timeout=timeout)
+        except concurrent.futures.TimeoutError:
+            # Skipped if it hasn't started processing yet
+            future.cancel()
+            batcher.counters.add("timeouts")
+            self.send_json(504, {"error": f"Timed out after {timeout} second(s)"})
+            return
+        except Exception as e:
+            self.send_json(500, {"error": str(e)})
+            return
+        finally:
+            batcher.counters.add("request_seconds", time.perf_counter() - start_time)
+
+        self.send_json(
+            200, {"sentences": [dataclasses.asdict(sentence) for sentence in sentences]}
+        )
+
+    def make_request(
+        self, request_dict: typing.Any
+    ) -> typing.Tuple[SentencesRequest, float]:
+        """Create request and timeout from JSON (raises ValueError)"""
+        if not isinstance(request_dict, dict):
+            raise ValueError("Expected JSON object")
+
+        options = {**self.server.default_options, **request_dict}
+        text = options.pop("text", None)
+        if not isinstance(text, str):
+            raise ValueError("text is required")
+
+        timeout = min(
+            float(options.pop("timeout", self.server.request_timeout)),
+            self.server.request_timeout,
+        )
+        request = SentencesRequest(
+            text=text,
+            lang=options.pop("lang", None),
+            ssml=bool(options.pop("ssml", False)),
+        )
+
+        for key, value in options.items():
+            if key not in (PROCESS_OPTIONS | SENTENCES_OPTIONS):
+                raise ValueError(f"Unknown option: {key}")
+
+            if not isinstance(value, bool):
+                raise ValueError(f"Expected true or false for {key}")
+
+            if key in PROCESS_OPTIONS:
+                request.process_args[key] = value
+
+            if key in SENTENCES_OPTIONS:
+                request.sentences_args[key] = value
+
+        return request, timeout
+
+    def send_json(self, status: int, value: typing.Any):
+        """Send JSON response"""
+        self.send_body(
+            status, json.dumps(value, ensure_ascii=False).encode(), "application/json"
+        )
+
+    def send_body(self, status: int, body: bytes, content_type: str):
+        """Send response with body"""
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        _LOGGER.debug(format, *args)
+
+
+# -----------------------------------------------------------------------------
+
+
+def main(argv: typing.Optional[typing.Sequence[str]] = None):
+    """Main entry point"""
+    parser = argparse.ArgumentParser(
+        prog="gruut serve",
+        description="Serve sentences over HTTP/JSON. "
+        + "Other arguments are passed to gruut (and used as request defaults).",
+    )
+    parser.add_argument(
+        "--host", default="127.0.0.1", help="Address to listen on (default: 127.0.0.1)"
+    )
+    parser.add_argument(
+        "--port", type=int, default=5100, help="Port to listen on (default: 5100)"
+    )
+    parser.add_argument(
+        "--threads",
+        type=int,
+        default=4,
+        help="Number of worker threads processing batches (default: 4)",
+    )
+    parser.add_argument(
+        "--batch-window",
+        type=float,
+        default=5,
+        help="Milliseconds to wait for more requests in a batch (default: 5)",
+    )
+    parser.add_argument(
+        "--max-batch-size",
+        type=int,
+        default=32,
+        help="Maximum number of requests in a batch (default: 32)",
+    )
+    parser.add_argument(
+        "--max-queue-size",
+        type=int,
+        default=1024,
+        help="Maximum number of waiting requests before 503 (default: 1024)",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=30,
+        help="Seconds before a request fails with 504 (default: 30)",
+    )
+    server_args, gruut_argv = parser.parse_known_args(argv)
+    args = get_args(gruut_argv)
+
+    if args.debug:
+        logging.basicConfig(level=logging.DEBUG)
+    else:
+        logging.basicConfig(level=logging.INFO)
+
+    if args.espeak:
+        args.model_prefix = "espeak"
+
+    batcher = MicroBatcher(
+        make_text_processor(args),
+        max_workers=server_args.threads,
+        batch_window=server_args.batch_window / 1000,
+        max_batch_size=server_args.max_batch_size,
+        max_queue_size=server_args.max_queue_size,
+    )
+
+    http_server = GruutHTTPServer(
+        (server_args.host, server_args.port),
+        batcher,
+        timeout=server_args.timeout,
+        default_options=get_default_options(args),
+    )
+
+    _LOGGER.info(
+        "Listening on http://%s:%s",
+        *http_server.server_address[:2],
+    )
+
+    try:
+        http_server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        http_server.server_close()
+        batcher.close()
+
+
+def get_default_options(args: argparse.Namespace) -> typing.Dict[str, typing.Any]:
+    """Request defaults from gruut command-line arguments"""
+    return {
+        "lang": args.language,
+        "ssml": args.ssml,
+        "pos": not args.no_pos,
+        "phonemize": not (args.no_lexicon and args.no_g2p),
+        "post_process": not args.no_post_process,
+        "verbalize_numbers": not args.no_numbers,
+        "verbalize_currency": not args.no_currency,
+        "verbalize_dates": not args.no_dates,
+        "verbalize_times": not args.no_times,
+        "major_breaks": not args.no_major_breaks,
+        "minor_breaks": not args.no_minor_breaks,
+        "punctuations": not args.no_punctuation,
+    }
@@ -1,24 +1,25 @@
 #!/usr/bin/env python3
 """Tokenizes, verbalizes, and phonemizes text and SSML"""
+import collections
+import concurrent.futures
+import functools
 import itertools
 import logging
+import os
 import re
+import time
 import typing
 import xml.etree.ElementTree as etree
+from datetime import datetime
 from decimal import Decimal
 from pathlib import Path
 
-import babel
-import babel.numbers
-import dateparser
-import networkx as nx
-from gruut_ipa import IPA
-from num2words import num2words
-
 from gruut.const import (
+    ABBREVIATION_GROUP_PREFIX,
     DATA_PROP,
     PHONEMES_TYPE,
     REGEX_PATTERN,
+    STAGE_TIMING_CALLBACK,
     BreakNode,
     BreakType,
     BreakWordNode,
@@ -37,6 +38,7 @@ from gruut.const import (
     SentenceNode,
     SpeakNode,
     SSMLParsingState,
+    StageTiming,
     TextProcessorSettings,
     Word,
     WordNode,
@@ -44,14 +46,24 @@ from gruut.const import (
 )
 from gruut.lang import get_settings
 from gruut.utils import (
+    STATS_TYPE,
+    TEXT_CHUNK,
+    LRUCache,
+    StatsCounters,
+    TokenList,
     attrib_no_namespace,
     leaves,
     maybe_split_ipa,
     pipeline_split,
     pipeline_transform,
     resolve_lang,
+    split_ssml_chunks,
+    split_text_chunks,
     tag_no_namespace,
     text_and_elements,
+    timed_stage,
+    tokens_split,
+    tokens_transform,
 )
 
 # -----------------------------------------------------------------------------
@@ -60,6 +72,21 @@ _LOGGER = logging.getLogger("gruut.text_processor")
 
 DEFAULT_LEXICON_ID = ""
 
+# (sentences, number of paragraphs) for one chunk of a document
+CHUNK_RESULT = typing.Tuple[typing.List[Sentence], int]
+
+# Number of parsed dates that are memoized per processor
+DEFAULT_DATE_CACHE_SIZE = 1024
+
+# Number of verbalized numbers/dates/times/currency amounts cached per processor
+DEFAULT_VERBALIZE_CACHE_SIZE = 4096
+
+# (text, text with whitespace) for one verbalized word
+VERBALIZED_WORD = typing.Tuple[str, str]
+
+# Sentinel for texts that are not in a cache
+_NOT_CACHED = object()
+
 
 # -----------------------------------------------------------------------------
 
@@ -104,6 +131,7 @@ class TextProcessor:
         settings: typing.Optional[
             typing.MutableMapping[str, TextProcessorSettings]
         ] = None,
+        on_stage_timing: typing.Optional[STAGE_TIMING_CALLBACK] = None,
         **kwargs,
     ):
         
@@ -128,6 +156,56 @@ class TextProcessor:
 
         self.settings = settings
 
+        # Receives a StageTiming record for each pipeline stage call (None to disable).
+        # See gruut.utils.StageTimingAggregator.
+        self.on_stage_timing = on_stage_timing
+
+        # Runtime counters (see stats)
+        self.counters = StatsCounters(
+            "documents",
+            "sentences",
+            "words",
+            "dateparser_parses",
+            "date_shape_parses",
+            "babel_parses",
+            "verbalize_cache_hits",
+            "verbalize_cache_misses",
+        )
+
+        # (lang, text, strict) -> parsed date or None
+        self.date_cache = LRUCache(max_size=DEFAULT_DATE_CACHE_SIZE)
+
+        # (lang, interpret_as, format, value, whitespace) -> verbalized words
+        self.verbalize_cache = LRUCache(max_size=DEFAULT_VERBALIZE_CACHE_SIZE)
+
+        # (lang, text, role) -> phonemes of verbalized words (one, twenty, dollars)
+        self.verbalized_phonemes_cache = LRUCache(
+            max_size=DEFAULT_VERBALIZE_CACHE_SIZE
+        )
+
+    def stats(self, reset: bool = False) -> STATS_TYPE:
+        """
+        Gets runtime counters for this processor and each loaded language.
+
+        Includes documents/sentences/words processed, dateparser/locale number parse attempts,
+        and (per language) lexicon queries, guesses, tagger calls, and model load times.
+        Use gruut.utils.stats_to_prometheus to export.
+
+        Args:
+            reset: True if counters should be set back to zero after reading
+
+        Returns:
+            stats: counters with per-language stats under "languages"
+        """
+        lang_stats: typing.Dict[str, STATS_TYPE] = {}
+
+        # Settings are stored under multiple keys (e.g., en and en_US)
+        settings_by_id = {id(s): s for s in self.settings.values()}
+        for lang_settings in settings_by_id.values():
+            lang_stats[lang_settings.lang] = lang_settings.stats(reset=reset)
+
+        return {**self.counters.stats(reset=reset), "languages": lang_stats}
+
     def sentences(
         self,
         graph: GraphType,
@@ -141,6 +219,10 @@ class TextProcessor:
         pos: bool = True,
     ) -> typing.Iterable[Sentence]:
         """Processes text and returns each sentence"""
+        import networkx as nx
+
+        on_stage = self.on_stage_timing
+        start_time = time.perf_counter() if on_stage is not None else 0.0
 
         def get_lang(lang: str) -> str:
             if explicit_lang or (lang != self.default_lang):
@@ -372,6 +454,21 @@ class TextProcessor:
                                 sent_marks_before.append(mark_name)
 
         # Post-process sentences to fix up text, voice, etc.
+        self._finish_sentences(sentences)
+
+        if on_stage is not None:
+            on_stage(
+                StageTiming(
+                    stage="sentences",
+                    seconds=time.perf_counter() - start_time,
+                    leaves_visited=sum(len(sentence.words) for sentence in sentences),
+                )
+            )
+
+        return sentences
+
+    def _finish_sentences(self, sentences: typing.List[Sentence]):
+        """Fix up text, voice, etc. of sentences once all words are added"""
         for sentence in sentences:
             settings = self.get_settings(sentence.lang)
             if settings.keep_whitespace:
@@ -418,14 +515,528 @@ class TextProcessor:
                 for word in sentence.words:
                     word.voice = sent_voice
 
-        return sentences
-
     def words(self, graph: GraphType, root: Node, **kwargs) -> typing.Iterable[Word]:
         """Processes text and returns each word"""
         for sent in self.sentences(graph, root, **kwargs):
             for word in sent:
                 yield word
 
+    def process_sentences(
+        self,
+        text: str,
+        lang: typing.Optional[str] = None,
+        ssml: bool = False,
+        sentences_args: typing.Optional[typing.Mapping[str, typing.Any]] = None,
+        **process_args,
+    ) -> typing.List[Sentence]:
+        """
+        Processes text or SSML and returns its sentences
+
+        Same as process followed by sentences, but plain text goes through a flat
+        list of tokens instead of a graph. The graph is still used for SSML and
+        when sentence/graph post-processing needs it (e.g., French liaisons).
+
+        Args:
+            text: input text or SSML (ssml=True)
+            lang: default language of input text
+            ssml: True if input text is SSML
+            sentences_args: keyword arguments passed to TextProcessor.sentences
+            **process_args: keyword arguments passed to TextProcessor.process
+
+        Returns:
+            sentences: Sentence objects
+        """
+        sentences_args = dict(sentences_args or {})
+        post_process = process_args.pop("post_process", True)
+        add_speak_tag = process_args.pop("add_speak_tag", True)
+
+        if ssml or (post_process and self._needs_graph(lang)):
+            graph, root = self.process(
+                text,
+                lang=lang,
+                ssml=ssml,
+                post_process=post_process,
+                add_speak_tag=add_speak_tag,
+                **process_args,
+            )
+            return list(self.sentences(graph, root, **sentences_args))
+
+        sentence_nodes = self._process_tokens(text, lang=lang, **process_args)
+
+        return self._token_sentences(sentence_nodes, lang=lang, **sentences_args)
+
+    def segment(
+        self,
+        text: str,
+        lang: typing.Optional[str] = None,
+        major_breaks: bool = True,
+        minor_breaks: bool = True,
+        punctuations: bool = True,
+        explicit_lang: bool = True,
+        max_passes: int = 5,
+    ) -> typing.List[Sentence]:
+        """
+        Splits plain text into sentences and words without building a graph.
+
+        Applies the same splits as process (replacements, punctuations,
+        breaks, abbreviations, initialisms, word breaks), but numbers, dates,
+        times, and currency are left as-is and there is no part of speech
+        tagging, phonemization, or post-processing. Words are only checked
+        against a lexicon if the language settings have one (see gruut.segment).
+
+        Args:
+            text: input text (not SSML)
+            lang: default language of input text
+            major_breaks: False if no sentence-breaking symbols in output
+            minor_breaks: False if no phrase-breaking symbols in output
+            punctuations: False if no word-surrounding symbols in output
+            explicit_lang: False if lang should be empty for the default language
+            max_passes: maximum number of passes over the tokens
+
+        Returns:
+            sentences: Sentence objects (as from sentences with phonemes=False)
+        """
+        sentence_nodes = self._process_tokens(
+            text,
+            lang=lang,
+            pos=False,
+            phonemize=False,
+            detect_numbers=False,
+            detect_currency=False,
+            detect_dates=False,
+            detect_times=False,
+            verbalize_numbers=False,
+            verbalize_currency=False,
+            verbalize_dates=False,
+            verbalize_times=False,
+            max_passes=max_passes,
+        )
+
+        return self._token_sentences(
+            sentence_nodes,
+            lang=lang,
+            major_breaks=major_breaks,
+            minor_breaks=minor_breaks,
+            punctuations=punctuations,
+            explicit_lang=explicit_lang,
+            phonemes=False,
+            pos=False,
+        )
+
+    def _needs_graph(self, lang: typing.Optional[str] = None) -> bool:
+        """True if post-processing plain text requires a graph"""
+        if type(self).post_process_graph is not TextProcessor.post_process_graph:
+            # Overridden in a sub-class
+            return True
+
+        # Sentences split off at major breaks use the default language
+        return any(
+            self.get_settings(settings_lang).post_process_sentence is not None
+            for settings_lang in (lang, self.default_lang)
+        )
+
+    def _process_tokens(
+        self,
+        text: str,
+        lang: typing.Optional[str] = None,
+        pos: bool = True,
+        phonemize: bool = True,
+        detect_numbers: bool = True,
+        detect_currency: bool = True,
+        detect_dates: bool = True,
+        detect_times: bool = True,
+        verbalize_numbers: bool = True,
+        verbalize_currency: bool = True,
+        verbalize_dates: bool = True,
+        verbalize_times: bool = True,
+        max_passes: int = 5,
+    ) -> typing.List[typing.List[Node]]:
+        """Processes plain text as a flat list of tokens (see process).
+
+        Returns:
+            sentence_nodes: leaf nodes of each sentence
+        """
+        on_stage = self.on_stage_timing
+        start_time = time.perf_counter() if on_stage is not None else 0.0
+        self.counters.add("documents")
+
+        lang = lang or self.default_lang
+        settings = self.get_settings(lang)
+
+        if settings.pre_process_text is not None:
+            # Pre-process text
+            text = settings.pre_process_text(text)
+
+        # Split into separate words (preseving whitespace)
+        token_list = TokenList()
+        for word_text in settings.split_words(text):
+            word_text_norm = settings.normalize_whitespace(word_text)
+            if not word_text_norm:
+                continue
+
+            if not settings.keep_whitespace:
+                word_text = word_text_norm
+
+            token_list.add_word(
+                WordNode(
+                    node=len(token_list),
+                    text=word_text_norm,
+                    text_with_ws=word_text,
+                    implicit=True,
+                    lang=lang,
+                    in_lexicon=self._is_word_in_lexicon(word_text_norm, settings),
+                )
+            )
+
+        if on_stage is not None:
+            on_stage(
+                StageTiming(
+                    stage="parse",
+                    seconds=time.perf_counter() - start_time,
+                    leaves_visited=len(token_list.tokens),
+                )
+            )
+
+        # Same stages and order as process.
+        # Sentences are broken apart at the end, and spell-out only comes from SSML.
+        stages: typing.List[typing.Tuple[typing.Callable[..., bool], typing.Any]] = [
+            (tokens_split, self._split_replacements),
+            (tokens_split, self._split_punctuations),
+            (tokens_split, self._split_minor_breaks),
+            (tokens_split, self._split_abbreviations),
+            (tokens_split, self._split_initialism),
+            (tokens_split, self._split_major_breaks),
+        ]
+
+        for is_enabled, transform_func in [
+            (detect_dates, self._transform_date),
+            (detect_currency, self._transform_currency),
+            (detect_numbers, self._transform_number),
+            (detect_times, self._transform_time),
+            (verbalize_dates, self._verbalize_date),
+            (verbalize_times, self._verbalize_time),
+            (verbalize_numbers, self._verbalize_number),
+            (verbalize_currency, self._verbalize_currency),
+        ]:
+            if is_enabled:
+                stages.append((tokens_transform, transform_func))
+
+        stages.append((tokens_split, self._break_words))
+        stages.append((tokens_split, self._split_ignore_non_words))
+
+        for _ in range(max_passes):
+            was_changed = False
+            for stage_func, pipeline_func in stages:
+                if stage_func(pipeline_func, token_list, on_stage):
+                    was_changed = True
+
+            if not was_changed:
+                # No changes, so we can stop
+                break
+
+        # Like _break_sentences, a new sentence starts after the original word
+        # that contains a major break.
+        sentence_nodes: typing.List[typing.List[Node]] = [[]]
+        last_word_idx = -1
+        is_sentence_broken = False
+
+        for word_idx, node in token_list.tokens:
+            if is_sentence_broken and (word_idx != last_word_idx):
+                sentence_nodes.append([])
+                is_sentence_broken = False
+
+            last_word_idx = word_idx
+            sentence_nodes[-1].append(node)
+
+            if isinstance(node, BreakWordNode) and (
+                node.break_type == BreakType.MAJOR
+            ):
+                is_sentence_broken = True
+
+        for nodes in sentence_nodes:
+            sentence_words = [node for node in nodes if isinstance(node, WordNode)]
+            if sentence_words:
+                self._process_sentence_words(
+                    sentence_words, pos=pos, phonemize=phonemize
+                )
+
+        return sentence_nodes
+
+    def _token_sentences(
+        self,
+        sentence_nodes: typing.List[typing.List[Node]],
+        lang: typing.Optional[str] = None,
+        major_breaks: bool = True,
+        minor_breaks: bool = True,
+        punctuations: bool = True,
+        explicit_lang: bool = True,
+        phonemes: bool = True,
+        break_phonemes: bool = True,
+        pos: bool = True,
+    ) -> typing.List[Sentence]:
+        """Creates sentences from the output of _process_tokens (see sentences)"""
+        on_stage = self.on_stage_timing
+        start_time = time.perf_counter() if on_stage is not None else 0.0
+        lang = lang or self.default_lang
+
+        def get_lang(lang: str) -> str:
+            if explicit_lang or (lang != self.default_lang):
+                return lang
+
+            # Implicit default language
+            return ""
+
+        sentences: typing.List[Sentence] = []
+        for sent_idx, nodes in enumerate(sentence_nodes):
+            sentence = Sentence(
+                idx=sent_idx,
+                par_idx=0,
+                text="",
+                text_with_ws="",
+                text_spoken="",
+                # Sentences split off at major breaks have no language (like graph)
+                lang=get_lang(lang if sent_idx == 0 else ""),
+            )
+            sentences.append(sentence)
+
+            for node in nodes:
+                if isinstance(node, WordNode):
+                    word_node = typing.cast(WordNode, node)
+                    sentence.words.append(
+                        Word(
+                            idx=len(sentence.words),
+                            sent_idx=sentence.idx,
+                            par_idx=sentence.par_idx,
+                            text=word_node.text,
+                            text_with_ws=word_node.text_with_ws,
+                            phonemes=word_node.phonemes if phonemes else None,
+                            pos=word_node.pos if pos else None,
+                            lang=get_lang(word_node.lang),
+                            voice=word_node.voice,
+                        )
+                    )
+                elif isinstance(node, BreakWordNode):
+                    break_word_node = typing.cast(BreakWordNode, node)
+                    is_minor_break = break_word_node.break_type == BreakType.MINOR
+                    is_major_break = break_word_node.break_type == BreakType.MAJOR
+
+                    if (minor_breaks and is_minor_break) or (
+                        major_breaks and is_major_break
+                    ):
+                        sentence.words.append(
+                            Word(
+                                idx=len(sentence.words),
+                                sent_idx=sentence.idx,
+                                par_idx=sentence.par_idx,
+                                text=break_word_node.text,
+                                text_with_ws=break_word_node.text_with_ws,
+                                phonemes=self._phonemes_for_break(
+                                    break_word_node.break_type,
+                                    lang=break_word_node.lang,
+                                )
+                                if phonemes and break_phonemes
+                                else None,
+                                is_minor_break=is_minor_break,
+                                is_major_break=is_major_break,
+                                lang=get_lang(break_word_node.lang),
+                                voice=break_word_node.voice,
+                            )
+                        )
+                elif punctuations and isinstance(node, PunctuationWordNode):
+                    punct_word_node = typing.cast(PunctuationWordNode, node)
+                    sentence.words.append(
+                        Word(
+                            idx=len(sentence.words),
+                            sent_idx=sentence.idx,
+                            par_idx=sentence.par_idx,
+                            text=punct_word_node.text,
+                            text_with_ws=punct_word_node.text_with_ws,
+                            is_punctuation=True,
+                            lang=get_lang(punct_word_node.lang),
+                        )
+                    )
+
+        self._finish_sentences(sentences)
+
+        if on_stage is not None:
+            on_stage(
+                StageTiming(
+                    stage="sentences",
+                    seconds=time.perf_counter() - start_time,
+                    leaves_visited=sum(len(sentence.words) for sentence in sentences),
+                )
+            )
+
+        return sentences
+
+    def sentences_chunked(
+        self,
+        text: str,
+        lang: typing.Optional[str] = None,
+        ssml: bool = False,
+        max_chunk_chars: int = 10000,
+        max_workers: typing.Optional[int] = None,
+        use_processes: bool = False,
+        sentences_args: typing.Optional[typing.Mapping[str, typing.Any]] = None,
+        **process_args,
+    ) -> typing.Iterable[Sentence]:
+        """
+        Processes a long document in independent chunks on a thread/process pool
+
+        Plain text is split after blank lines that follow a major break, and SSML is
+        split at top-level <p> elements. Sentences are renumbered across chunks and
+        yielded in order as soon as each chunk (and the ones before it) is done.
+        Only a few chunks are in flight at once, so the whole document's graph is
+        never held in memory.
+
+        Args:
+            text: input text or SSML (ssml=True)
+            lang: default language of input text
+            ssml: True if input text is SSML
+            max_chunk_chars: approximate number of characters per chunk
+            max_workers: number of threads/processes (None for executor default)
+            use_processes: True if chunks should be processed in separate processes.
+                Each process creates its own TextProcessor from this one's
+                constructor arguments (settings objects are not copied).
+            sentences_args: keyword arguments passed to TextProcessor.sentences
+            **process_args: keyword arguments passed to TextProcessor.process
+
+        Returns:
+            sentences: iterable of Sentence objects
+        """
+        sentences_args = dict(sentences_args or {})
+        chunks = self.split_chunks(
+            text,
+            lang=lang,
+            ssml=ssml,
+            max_chunk_chars=max_chunk_chars,
+            add_speak_tag=process_args.get("add_speak_tag", True),
+        )
+
+        chunk_args = (lang, ssml, sentences_args, process_args)
+        stitcher = ChunkStitcher()
+
+        if len(chunks) < 2:
+            # Not worth a pool
+            for chunk_text, continues in chunks:
+                chunk_sentences, num_paragraphs = self._process_chunk(
+                    chunk_text, *chunk_args
+                )
+                yield from stitcher(chunk_sentences, num_paragraphs, continues)
+
+            return
+
+        executor: concurrent.futures.Executor
+        if use_processes:
+            executor = concurrent.futures.ProcessPoolExecutor(max_workers=max_workers)
+            chunk_func: typing.Callable[..., CHUNK_RESULT] = functools.partial(
+                _process_chunk_in_process, self.get_config()
+            )
+        else:
+            executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
+            chunk_func = self._process_chunk
+
+        # Limit chunks in flight so results (and graphs) don't pile up
+        max_pending = 2 * (max_workers or os.cpu_count() or 1)
+        chunks_iter = iter(chunks)
+        pending: typing.Deque[
+            typing.Tuple[concurrent.futures.Future, bool]
+        ] = collections.deque()
+
+        with executor:
+            try:
+                for chunk_text, continues in chunks_iter:
+                    future = executor.submit(chunk_func, chunk_text, *chunk_args)
+                    pending.append((future, continues))
+                    if len(pending) >= max_pending:
+                        break
+
+                while pending:
+                    future, continues = pending.popleft()
+                    chunk_sentences, num_paragraphs = future.result()
+
+                    next_chunk = next(chunks_iter, None)
+                    if next_chunk is not None:
+                        next_text, next_continues = next_chunk
+                        pending.append(
+                            (
+                                executor.submit(chunk_func, next_text, *chunk_args),
+                                next_continues,
+                            )
+                        )
+
+                    yield from stitcher(chunk_sentences, num_paragraphs, continues)
+            finally:
+                # Caller stopped early or a chunk failed
+                for future, _ in pending:
+                    future.cancel()
+
+    def split_chunks(
+        self,
+        text: str,
+        lang: typing.Optional[str] = None,
+        ssml: bool = False,
+        max_chunk_chars: int = 10000,
+        add_speak_tag: bool = True,
+    ) -> typing.List[TEXT_CHUNK]:
+        """Splits text or SSML into independent chunks (see sentences_chunked)"""
+        if not ssml:
+            settings = self.get_settings(lang)
+            return split_text_chunks(
+                text, max_chunk_chars, major_breaks=settings.major_breaks
+            )
+
+        try:
+            root_element = etree.fromstring(text)
+        except Exception as e:
+            if add_speak_tag:
+                # Try wrapping text in <speak> and parsing again
+                root_element = etree.fromstring(f"<speak>{text}</speak>")
+            else:
+                # Log and re-raise exception
+                _LOGGER.exception("TextProcessor.split_chunks")
+                raise e
+
+        return split_ssml_chunks(root_element, max_chunk_chars)
+
+    def get_config(self) -> typing.Dict[str, typing.Any]:
+        """Constructor arguments for an equivalent TextProcessor (without settings)"""
+        return {
+            "default_lang": self.default_lang,
+            "model_prefix": self.model_prefix,
+            "tokens_list": self.valid_tokens,
+            "lang_dirs": self.lang_dirs,
+            "search_dirs": (
+                list(self.search_dirs) if self.search_dirs is not None else None
+            ),
+            **self.default_settings_kwargs,
+        }
+
+    def _process_chunk(
+        self,
+        chunk_text: str,
+        lang: typing.Optional[str],
+        ssml: bool,
+        sentences_args: typing.Mapping[str, typing.Any],
+        process_args: typing.Mapping[str, typing.Any],
+    ) -> CHUNK_RESULT:
+        """Processes a single chunk, returning its sentences and paragraph count"""
+        if not ssml:
+            # Plain text is a single paragraph
+            chunk_sentences = self.process_sentences(
+                chunk_text, lang=lang, sentences_args=sentences_args, **process_args
+            )
+            return chunk_sentences, 1
+
+        graph, root = self.process(chunk_text, lang=lang, ssml=ssml, **process_args)
+        num_paragraphs = sum(
+            1
+            for node_data in graph.nodes.values()
+            if isinstance(node_data[DATA_PROP], ParagraphNode)
+        )
+
+        return list(self.sentences(graph, root, **sentences_args)), num_paragraphs
+
     def get_settings(self, lang: typing.Optional[str] = None) -> TextProcessorSettings:
         """Gets or creates settings for a language"""
         lang = lang or self.default_lang
@@ -513,6 +1124,12 @@ class TextProcessor:
             graph, root: text graph and root node
 
         """
+        import networkx as nx
+
+        on_stage = self.on_stage_timing
+        start_time = time.perf_counter() if on_stage is not None else 0.0
+        self.counters.add("documents")
+
         if ssml:
             try:
                 root_element = etree.fromstring(text)
@@ -1020,41 +1637,50 @@ class TextProcessor:
 
         assert root is not None
 
+        if on_stage is not None:
+            on_stage(
+                StageTiming(
+                    stage="parse",
+                    seconds=time.perf_counter() - start_time,
+                    leaves_visited=sum(1 for _ in leaves(graph, root)),
+                )
+            )
+
         # Do multiple passes over the graph
         num_passes_left = max_passes
         while num_passes_left > 0:
             was_changed = False
 
             # Do replacements before minor/major breaks
-            if pipeline_split(self._split_replacements, graph, root):
+            if pipeline_split(self._split_replacements, graph, root, on_stage):
                 was_changed = True
 
             # Split punctuations (quotes, etc.) before breaks
-            if pipeline_split(self._split_punctuations, graph, root):
+            if pipeline_split(self._split_punctuations, graph, root, on_stage):
                 was_changed = True
 
             # Split on minor breaks (commas, etc.)
-            if pipeline_split(self._split_minor_breaks, graph, root):
+            if pipeline_split(self._split_minor_breaks, graph, root, on_stage):
                 was_changed = True
 
             # Expand abbrevations before major breaks
-            if pipeline_split(self._split_abbreviations, graph, root):
+            if pipeline_split(self._split_abbreviations, graph, root, on_stage):
                 was_changed = True
 
             # Break apart initialisms (e.g., TTS or T.T.S.) before major breaks
-            if pipeline_split(self._split_initialism, graph, root):
+            if pipeline_split(self._split_initialism, graph, root, on_stage):
                 was_changed = True
 
             # Split on major breaks (periods, etc.)
-            if pipeline_split(self._split_major_breaks, graph, root):
+            if pipeline_split(self._split_major_breaks, graph, root, on_stage):
                 was_changed = True
 
             # Break apart sentences using BreakWordNodes
-            if self._break_sentences(graph, root):
+            if timed_stage(self._break_sentences, graph, root, on_stage=on_stage):
                 was_changed = True
 
             # spell-out (e.g., abc -> a b c) before number expansion
-            if pipeline_split(self._split_spell_out, graph, root):
+            if pipeline_split(self._split_spell_out, graph, root, on_stage):
                 was_changed = True
 
             # Transform text into known classes.
@@ -1066,44 +1692,44 @@ class TextProcessor:
             # as numbers by Babel (the de_DE locale will parse this as 112000).
             #
             if detect_dates:
-                if pipeline_transform(self._transform_date, graph, root):
+                if pipeline_transform(self._transform_date, graph, root, on_stage):
                     was_changed = True
 
             if detect_currency:
-                if pipeline_transform(self._transform_currency, graph, root):
+                if pipeline_transform(self._transform_currency, graph, root, on_stage):
                     was_changed = True
 
             if detect_numbers:
-                if pipeline_transform(self._transform_number, graph, root):
+                if pipeline_transform(self._transform_number, graph, root, on_stage):
                     was_changed = True
 
             if detect_times:
-                if pipeline_transform(self._transform_time, graph, root):
+                if pipeline_transform(self._transform_time, graph, root, on_stage):
                     was_changed = True
 
             # Verbalize known classes
             if verbalize_dates:
-                if pipeline_transform(self._verbalize_date, graph, root):
+                if pipeline_transform(self._verbalize_date, graph, root, on_stage):
                     was_changed = True
 
             if verbalize_times:
-                if pipeline_transform(self._verbalize_time, graph, root):
+                if pipeline_transform(self._verbalize_time, graph, root, on_stage):
                     was_changed = True
 
             if verbalize_numbers:
-                if pipeline_transform(self._verbalize_number, graph, root):
+                if pipeline_transform(self._verbalize_number, graph, root, on_stage):
                     was_changed = True
 
             if verbalize_currency:
-                if pipeline_transform(self._verbalize_currency, graph, root):
+                if pipeline_transform(self._verbalize_currency, graph, root, on_stage):
                     was_changed = True
 
             # Break apart words
-            if pipeline_split(self._break_words, graph, root):
+            if pipeline_split(self._break_words, graph, root, on_stage):
                 was_changed = True
 
             # Ignore non-words
-            if pipeline_split(self._split_ignore_non_words, graph, root):
+            if pipeline_split(self._split_ignore_non_words, graph, root, on_stage):
                 was_changed = True
 
             if not was_changed:
@@ -1112,75 +1738,6 @@ class TextProcessor:
 
             num_passes_left -= 1
 
-        # Gather words from leaves of the tree, group by sentence
-        def process_sentence(words: typing.List[WordNode]):
-            if pos:
-                pos_settings = self.get_settings(node.lang)
-                if pos_settings.get_parts_of_speech is not None:
-                    pos_tags = pos_settings.get_parts_of_speech(
-                        [word.text for word in words]
-                    )
-                    for word, pos_tag in zip(words, pos_tags):
-                        word.pos = pos_tag
-
-                        if not word.role:
-                            word.role = f"gruut:{pos_tag}"
-
-            if phonemize:
-                # Add phonemes to word
-                for word in words:
-                    if word.phonemes:
-                        # Word already has phonemes
-                        continue
-
-                    lexicon_ids: typing.List[str] = []
-
-                    if word.lexicon_ids:
-                        lexicon_ids.extend(word.lexicon_ids)
-
-                    lexicon_ids.append(DEFAULT_LEXICON_ID)
-
-                    # Look up phonemes from inline <lexicon>
-                    for lexicon_id in lexicon_ids:
-                        lexicon = inline_lexicons.get(lexicon_id)
-                        if lexicon is None:
-                            continue
-
-                        maybe_role_phonemes = lexicon.words.get(word.text)
-                        if maybe_role_phonemes is None:
-                            continue
-
-                        maybe_phonemes = maybe_role_phonemes.get(word.role)
-
-                        if (maybe_phonemes is None) and (word.role != WordRole.DEFAULT):
-                            # Try again with default role
-                            maybe_phonemes = maybe_role_phonemes.get(WordRole.DEFAULT)
-
-                        if maybe_phonemes is not None:
-                            # Found inline pronunciation
-                            word.phonemes = maybe_phonemes
-                            break
-
-                    if word.phonemes:
-                        # Got phonemes from inline lexicon
-                        continue
-
-                    phonemize_settings = self.get_settings(word.lang)
-                    if phonemize_settings.lookup_phonemes is not None:
-                        word.phonemes = phonemize_settings.lookup_phonemes(
-                            word.text, word.role
-                        )
-                       
-                    if (word.lang == 'en') and (word.text == 'A') and (word.role not in ['gruut:DT']):
-                        word.phonemes = ['e','ɪ']
-
-                    if (not word.phonemes) and (
-                        phonemize_settings.guess_phonemes is not None
-                    ):
-                        word.phonemes = phonemize_settings.guess_phonemes(
-                            word.text, word.role
-                        )
-
         # Process tree leaves
         sentence_words: typing.List[WordNode] = []
 
@@ -1188,7 +1745,12 @@ class TextProcessor:
             node = graph.nodes[dfs_node][DATA_PROP]
             if isinstance(node, SentenceNode):
                 if sentence_words:
-                    process_sentence(sentence_words)
+                    self._process_sentence_words(
+                        sentence_words,
+                        pos=pos,
+                        phonemize=phonemize,
+                        inline_lexicons=inline_lexicons,
+                    )
                     sentence_words = []
             elif graph.out_degree(dfs_node) == 0:
                 if isinstance(node, WordNode):
@@ -1197,7 +1759,12 @@ class TextProcessor:
 
         if sentence_words:
             # Final sentence
-            process_sentence(sentence_words)
+            self._process_sentence_words(
+                sentence_words,
+                pos=pos,
+                phonemize=phonemize,
+                inline_lexicons=inline_lexicons,
+            )
             sentence_words = []
 
         if post_process:
@@ -1208,15 +1775,172 @@ class TextProcessor:
                     sent_node = typing.cast(SentenceNode, node)
                     sent_settings = self.get_settings(sent_node.lang)
                     if sent_settings.post_process_sentence is not None:
-                        sent_settings.post_process_sentence(
-                            graph, sent_node, sent_settings
+                        timed_stage(
+                            sent_settings.post_process_sentence,
+                            graph,
+                            sent_node,
+                            sent_settings,
+                            on_stage=on_stage,
+                            stage="post_process_sentence",
                         )
 
             # Post process entire graph
-            self.post_process_graph(graph, root)
+            timed_stage(self.post_process_graph, graph, root, on_stage=on_stage)
 
         return graph, root
 
+    def _process_sentence_words(
+        self,
+        words: typing.List[WordNode],
+        pos: bool = True,
+        phonemize: bool = True,
+        inline_lexicons: typing.Optional[typing.Mapping[str, InlineLexicon]] = None,
+    ):
+        """Tags and phonemizes the words of a single sentence (in place)"""
+        on_stage = self.on_stage_timing
+        if inline_lexicons is None:
+            inline_lexicons = {}
+
+        def record_stage(
+            stage: str, stage_start_time: float, visited: int, changed: int
+        ):
+            assert on_stage is not None
+            on_stage(
+                StageTiming(
+                    stage=stage,
+                    seconds=time.perf_counter() - stage_start_time,
+                    leaves_visited=visited,
+                    leaves_changed=changed,
+                )
+            )
+
+        if on_stage is not None:
+            start_time = time.perf_counter()
+            num_without_phonemes = sum(1 for word in words if not word.phonemes)
+
+        self.counters.add("sentences")
+        self.counters.add("words", len(words))
+
+        if pos:
+            pos_settings = self.get_settings(words[0].lang)
+            if pos_settings.get_parts_of_speech is not None:
+                stage_start_time = time.perf_counter() if on_stage else 0.0
+                pos_tags = pos_settings.get_parts_of_speech(
+                    [word.text for word in words]
+                )
+
+                if on_stage is not None:
+                    record_stage(
+                        "process_sentence/get_parts_of_speech",
+                        stage_start_time,
+                        len(words),
+                        len(pos_tags),
+                    )
+
+                for word, pos_tag in zip(words, pos_tags):
+                    word.pos = pos_tag
+
+                    if not word.role:
+                        word.role = f"gruut:{pos_tag}"
+
+        if phonemize:
+            # Add phonemes to word
+            for word in words:
+                if word.phonemes:
+                    # Word already has phonemes
+                    continue
+
+                lexicon_ids: typing.List[str] = []
+
+                if word.lexicon_ids:
+                    lexicon_ids.extend(word.lexicon_ids)
+
+                lexicon_ids.append(DEFAULT_LEXICON_ID)
+
+                # Look up phonemes from inline <lexicon>
+                for lexicon_id in lexicon_ids:
+                    lexicon = inline_lexicons.get(lexicon_id)
+                    if lexicon is None:
+                        continue
+
+                    maybe_role_phonemes = lexicon.words.get(word.text)
+                    if maybe_role_phonemes is None:
+                        continue
+
+                    maybe_phonemes = maybe_role_phonemes.get(word.role)
+
+                    if (maybe_phonemes is None) and (word.role != WordRole.DEFAULT):
+                        # Try again with default role
+                        maybe_phonemes = maybe_role_phonemes.get(WordRole.DEFAULT)
+
+                    if maybe_phonemes is not None:
+                        # Found inline pronunciation
+                        word.phonemes = maybe_phonemes
+                        break
+
+                if word.phonemes:
+                    # Got phonemes from inline lexicon
+                    continue
+
+                verbalized_key: typing.Optional[typing.Tuple[str, ...]] = None
+                if word.is_verbalized:
+                    # Number words, etc. repeat a lot
+                    verbalized_key = (word.lang, word.text, word.role)
+                    maybe_phonemes = self.verbalized_phonemes_cache.get(
+                        verbalized_key
+                    )
+                    if maybe_phonemes:
+                        word.phonemes = list(maybe_phonemes)
+                        continue
+
+                phonemize_settings = self.get_settings(word.lang)
+                if phonemize_settings.lookup_phonemes is not None:
+                    stage_start_time = time.perf_counter() if on_stage else 0.0
+                    word.phonemes = phonemize_settings.lookup_phonemes(
+                        word.text, word.role
+                    )
+
+                    if on_stage is not None:
+                        record_stage(
+                            "process_sentence/lookup_phonemes",
+                            stage_start_time,
+                            1,
+                            1 if word.phonemes else 0,
+                        )
+                   
+                if (word.lang == 'en') and (word.text == 'A') and (word.role not in ['gruut:DT']):
+                    word.phonemes = ['e','ɪ']
+
+                if (not word.phonemes) and (
+                    phonemize_settings.guess_phonemes is not None
+                ):
+                    stage_start_time = time.perf_counter() if on_stage else 0.0
+                    word.phonemes = phonemize_settings.guess_phonemes(
+                        word.text, word.role
+                    )
+
+                    if on_stage is not None:
+                        record_stage(
+                            "process_sentence/guess_phonemes",
+                            stage_start_time,
+                            1,
+                            1 if word.phonemes else 0,
+                        )
+
+                if word.phonemes and (verbalized_key is not None):
+                    # Copy, since post-processing may modify word phonemes
+                    self.verbalized_phonemes_cache.put(
+                        verbalized_key, tuple(word.phonemes)
+                    )
+
+        if on_stage is not None:
+            record_stage(
+                "process_sentence",
+                start_time,
+                len(words),
+                num_without_phonemes - sum(1 for word in words if not word.phonemes),
+            )
+
     def post_process_graph(self, graph: GraphType, root: Node):
         """User-defined post-processing of entire graph"""
         pass
@@ -1348,6 +2072,7 @@ class TextProcessor:
                 "voice": word.voice,
                 "in_lexicon": self._is_word_in_lexicon(part_text_norm, settings),
                 "is_from_broken_word": True,
+                "is_verbalized": word.is_verbalized,
             }
 
     def _split_punctuations(self, graph: GraphType, node: Node):
@@ -1366,6 +2091,12 @@ class TextProcessor:
             # No punctuation patterns
             return
 
+        if (settings.any_punctuations_pattern is not None) and (
+            settings.any_punctuations_pattern.search(word.text) is None
+        ):
+            # No punctuations to split
+            return
+
         word_text = word.text
         first_ws, last_ws = settings.get_whitespace(word.text_with_ws)
         has_punctuation = False
@@ -1573,6 +2304,8 @@ class TextProcessor:
         break_type: typing.Union[str, BreakType],
         lang: typing.Optional[str] = None,
     ) -> typing.Optional[PHONEMES_TYPE]:
+        from gruut_ipa import IPA
+
         if break_type == BreakType.MAJOR:
             return [IPA.BREAK_MAJOR.value]
 
@@ -1715,6 +2448,12 @@ class TextProcessor:
             # No replacements
             return
 
+        if (settings.any_replacement_pattern is not None) and (
+            settings.any_replacement_pattern.search(word.text_with_ws) is None
+        ):
+            # No replacement applies (so none can apply to a replaced text either)
+            return
+
         matched = False
         new_text = word.text_with_ws
 
@@ -1762,13 +2501,29 @@ class TextProcessor:
             return
 
         new_text: typing.Optional[str] = None
-        for pattern, template in settings.abbreviations.items():
-            assert isinstance(pattern, REGEX_PATTERN), pattern
+        if settings.abbreviations_pattern is not None:
+            # Find the first matching abbreviation in a single scan
+            any_match = settings.abbreviations_pattern.match(word.text_with_ws)
+            if any_match is None:
+                return
+
+            assert any_match.lastgroup is not None
+            abbreviation_idx = int(
+                any_match.lastgroup[len(ABBREVIATION_GROUP_PREFIX) :]
+            )
+            pattern, template = settings.abbreviation_rules[abbreviation_idx]
+
+            # Group numbers in the template refer to the original pattern
             match = pattern.match(word.text_with_ws)
+            assert match is not None
+            new_text = match.expand(template)
+        else:
+            for pattern, template in settings.abbreviation_rules:
+                match = pattern.match(word.text_with_ws)
 
-            if match is not None:
-                new_text = match.expand(template)
-                break
+                if match is not None:
+                    new_text = match.expand(template)
+                    break
 
         if new_text is not None:
             # Tokenize new text (whitespace should be preserved by regex)
@@ -1880,30 +2635,29 @@ class TextProcessor:
                 word.number = Decimal(ordinal_num)
                 return False
 
-        try:
-            # Try to parse as a number
-            # This is important to handle thousand/decimal separators correctly.
-            number = babel.numbers.parse_decimal(
-                word.text, locale=settings.babel_locale
-            )
+        assert settings.number_parser is not None
 
-            if not number.is_finite():
-                raise ValueError("Not parsing nan or inf")
-
-            word.interpret_as = InterpretAs.NUMBER
-            word.format = InterpretAsFormat.NUMBER_CARDINAL
-            word.number = number
-
-            if (1000 < number < 3000) and (re.match(r"^\d+$", word.text) is not None):
-                # Interpret numbers in this range as years by default, but only
-                # if the text was entirely digits.
-                #
-                # So "2020" will become "twenty twenty", but "2,020" will become
-                # "two thousand and twenty".
-                word.format = InterpretAsFormat.NUMBER_YEAR
-        except ValueError:
-            # Probably not a number
+        # Try to parse as a number
+        # This is important to handle thousand/decimal separators correctly.
+        self.counters.add("babel_parses")
+        number = settings.number_parser(word.text)
+
+        if (number is None) or (not number.is_finite()):
+            # Probably not a number (not parsing nan or inf)
             word.is_maybe_number = False
+            return True
+
+        word.interpret_as = InterpretAs.NUMBER
+        word.format = InterpretAsFormat.NUMBER_CARDINAL
+        word.number = number
+
+        if (1000 < number < 3000) and (re.match(r"^\d+$", word.text) is not None):
+            # Interpret numbers in this range as years by default, but only
+            # if the text was entirely digits.
+            #
+            # So "2020" will become "twenty twenty", but "2,020" will become
+            # "two thousand and twenty".
+            word.format = InterpretAsFormat.NUMBER_YEAR
 
         return True
 
@@ -1926,41 +2680,24 @@ class TextProcessor:
             word.is_maybe_currency = False
             return False
 
-        assert settings.babel_locale
+        assert settings.number_parser is not None
 
         # Try to parse with known currency symbols
-        parsed = False
-        for currency_symbol in settings.currency_symbols:
-            if word.text.startswith(currency_symbol):
-                num_str = word.text[len(currency_symbol) :]
-                try:
-                    # Try to parse as a number
-                    # This is important to handle thousand/decimal separators correctly.
-                    number = babel.numbers.parse_decimal(
-                        num_str, locale=settings.babel_locale
-                    )
-                    word.interpret_as = InterpretAs.CURRENCY
-                    word.currency_symbol = currency_symbol
-                    word.number = number
-                    parsed = True
-                    break
-                except ValueError:
-                    pass
-
-        # If this *must* be a currency value, use the default currency
-        if (not parsed) and (word.interpret_as == InterpretAs.CURRENCY):
+        self.counters.add("babel_parses")
+        symbol_number = settings.number_parser.parse_currency(word.text)
+        if symbol_number is not None:
+            word.interpret_as = InterpretAs.CURRENCY
+            word.currency_symbol, word.number = symbol_number
+        elif word.interpret_as == InterpretAs.CURRENCY:
+            # If this *must* be a currency value, use the default currency
             default_currency = settings.default_currency
             if default_currency:
                 # Forced interpretation using default currency
-                try:
-                    number = babel.numbers.parse_decimal(
-                        word.text, locale=settings.babel_locale
-                    )
-                    word.interpret_as = InterpretAs.CURRENCY
+                self.counters.add("babel_parses")
+                number = settings.number_parser(word.text)
+                if number is not None:
                     word.currency_name = default_currency
                     word.number = number
-                except ValueError:
-                    pass
 
         return True
 
@@ -1983,26 +2720,76 @@ class TextProcessor:
             word.is_maybe_date = False
             return False
 
-        assert settings.dateparser_lang
-
-        dateparser_kwargs: typing.Dict[str, typing.Any] = {
-            "settings": {"STRICT_PARSING": True},
-            "languages": [settings.dateparser_lang],
-        }
-
-        date = dateparser.parse(word.text, **dateparser_kwargs)
+        date = self._parse_date(
+            word.text,
+            settings,
+            strict=True,
+            force=(word.interpret_as == InterpretAs.DATE),
+        )
         if date is not None:
             word.interpret_as = InterpretAs.DATE
             word.date = date
         elif word.interpret_as == InterpretAs.DATE:
             # Try again without strict parsing
-            dateparser_kwargs["settings"]["STRICT_PARSING"] = False
-            date = dateparser.parse(word.text, **dateparser_kwargs)
+            date = self._parse_date(word.text, settings, strict=False, force=True)
             if date is not None:
                 word.date = date
 
         return True
 
+    def _parse_date(
+        self,
+        text: str,
+        settings: TextProcessorSettings,
+        strict: bool = True,
+        force: bool = False,
+    ) -> typing.Optional[datetime]:
+        """Parse date with settings.date_shapes, falling back to dateparser.
+
+        Results are memoized per (language, text), and dateparser results only
+        for the current day. If force is True, dateparser is called even when
+        the text doesn't look like a date.
+        """
+        cache_key = (settings.lang, text, strict)
+        date = self.date_cache.get(cache_key, _NOT_CACHED)
+        if date is not _NOT_CACHED:
+            return date
+
+        # dateparser fills in missing parts (year, "yesterday", etc.) from the
+        # current date, so its results are only reused on the same day.
+        dateparser_key = (settings.lang, text, strict, datetime.now().date())
+        date = self.date_cache.get(dateparser_key, _NOT_CACHED)
+        if date is not _NOT_CACHED:
+            return date
+
+        if strict and (settings.date_shapes is not None):
+            maybe_date, date = settings.date_shapes(text)
+            if date is not None:
+                # Absolute date
+                self.counters.add("date_shape_parses")
+                self.date_cache.put(cache_key, date)
+                return date
+
+            if (not maybe_date) and (not force):
+                # Definitely not a date (cheap to check again)
+                return None
+
+        assert settings.dateparser_lang
+
+        # Only loaded once there's a date candidate
+        import dateparser
+
+        self.counters.add("dateparser_parses")
+        date = dateparser.parse(
+            text,
+            settings={"STRICT_PARSING": strict},
+            languages=[settings.dateparser_lang],
+        )
+
+        self.date_cache.put(dateparser_key, date)
+
+        return date
+
     def _transform_time(self, graph: GraphType, node: Node):
         if not isinstance(node, WordNode):
             return False
@@ -2046,6 +2833,54 @@ class TextProcessor:
     # Verbalization
     # -------------------------------------------------------------------------
 
+    def _get_verbalized_words(
+        self,
+        cache_key: typing.Tuple[typing.Any, ...],
+        verbalize: typing.Callable[
+            [], typing.Tuple[typing.List[VERBALIZED_WORD], bool]
+        ],
+    ) -> typing.List[VERBALIZED_WORD]:
+        """Get verbalized words from the cache, or verbalize and cache them.
+
+        verbalize returns (text, text with whitespace) for each word and True if
+        verbalization was successful. Failed verbalizations are not cached.
+        Phonemes of the words are cached separately (verbalized_phonemes_cache).
+        """
+        verbalized_words = self.verbalize_cache.get(cache_key)
+        if verbalized_words is not None:
+            self.counters.add("verbalize_cache_hits")
+            return verbalized_words
+
+        self.counters.add("verbalize_cache_misses")
+        word_texts, success = verbalize()
+        if success:
+            self.verbalize_cache.put(cache_key, word_texts)
+
+        return word_texts
+
+    def _add_verbalized_words(
+        self,
+        graph: GraphType,
+        word: WordNode,
+        verbalized_words: typing.Iterable[VERBALIZED_WORD],
+    ) -> typing.List[WordNode]:
+        """Add verbalized words as children of the original word"""
+        new_words: typing.List[WordNode] = []
+        for word_text, word_text_with_ws in verbalized_words:
+            new_word = WordNode(
+                node=len(graph),
+                implicit=True,
+                lang=word.lang,
+                text=word_text,
+                text_with_ws=word_text_with_ws,
+                is_verbalized=True,
+            )
+            graph.add_node(new_word.node, data=new_word)
+            graph.add_edge(word.node, new_word.node)
+            new_words.append(new_word)
+
+        return new_words
+
     def _verbalize_number(self, graph: GraphType, node: Node):
         """Split numbers into words"""
         if not isinstance(node, WordNode):
@@ -2064,62 +2899,76 @@ class TextProcessor:
             return
 
         assert settings.num2words_lang
-        num2words_kwargs = {"lang": settings.num2words_lang}
-        decimal_nums = [word.number]
-
-        if word.format == InterpretAsFormat.NUMBER_CARDINAL:
-            num2words_kwargs["to"] = "cardinal"
-        elif word.format == InterpretAsFormat.NUMBER_ORDINAL:
-            num2words_kwargs["to"] = "ordinal"
-        elif word.format == InterpretAsFormat.NUMBER_YEAR:
-            num2words_kwargs["to"] = "year"
-        elif word.format == InterpretAsFormat.NUMBER_DIGITS:
-            num2words_kwargs["to"] = "cardinal"
-            decimal_nums = [Decimal(d) for d in str(word.number.to_integral_value())]
-
-        for decimal_num in decimal_nums:
-            num_has_frac = (decimal_num % 1) != 0
+        number = word.number
+        first_ws, last_ws = settings.get_whitespace(word.text_with_ws)
 
-            # num2words uses the number as an index sometimes, so it *has* to be
-            # an integer, unless we're doing currency.
-            if num_has_frac:
-                final_num = float(decimal_num)
-            else:
-                final_num = int(decimal_num)
+        def verbalize():
+            from num2words import num2words
 
-            try:
-                # Convert to words (e.g., 100 -> one hundred)
-                num_str = num2words(final_num, **num2words_kwargs)
-            except NotImplementedError:
-                _LOGGER.exception(
-                    "Failed to convert number %s to words for language %s",
-                    word.text,
-                    word.lang,
-                )
-                return
+            num2words_kwargs = {"lang": settings.num2words_lang}
+            decimal_nums = [number]
 
-            # Add original whitespace back in
-            first_ws, last_ws = settings.get_whitespace(word.text_with_ws)
-            num_str = first_ws + num_str + last_ws
+            if word.format == InterpretAsFormat.NUMBER_CARDINAL:
+                num2words_kwargs["to"] = "cardinal"
+            elif word.format == InterpretAsFormat.NUMBER_ORDINAL:
+                num2words_kwargs["to"] = "ordinal"
+            elif word.format == InterpretAsFormat.NUMBER_YEAR:
+                num2words_kwargs["to"] = "year"
+            elif word.format == InterpretAsFormat.NUMBER_DIGITS:
+                num2words_kwargs["to"] = "cardinal"
+                decimal_nums = [Decimal(d) for d in str(number.to_integral_value())]
 
-            # Split into separate words
-            for number_word_text in settings.split_words(num_str):
-                number_word_text_norm = settings.normalize_whitespace(number_word_text)
-                if not number_word_text_norm:
-                    continue
+            word_texts: typing.List[VERBALIZED_WORD] = []
+            for decimal_num in decimal_nums:
+                num_has_frac = (decimal_num % 1) != 0
 
-                if not settings.keep_whitespace:
-                    number_word_text = number_word_text_norm
+                # num2words uses the number as an index sometimes, so it *has* to be
+                # an integer, unless we're doing currency.
+                if num_has_frac:
+                    final_num = float(decimal_num)
+                else:
+                    final_num = int(decimal_num)
 
-                number_word = WordNode(
-                    node=len(graph),
-                    implicit=True,
-                    lang=word.lang,
-                    text=number_word_text_norm,
-                    text_with_ws=number_word_text,
-                )
-                graph.add_node(number_word.node, data=number_word)
-                graph.add_edge(word.node, number_word.node)
+                try:
+                    # Convert to words (e.g., 100 -> one hundred)
+                    num_str = num2words(final_num, **num2words_kwargs)
+                except NotImplementedError:
+                    _LOGGER.exception(
+                        "Failed to convert number %s to words for language %s",
+                        word.text,
+                        word.lang,
+                    )
+                    return word_texts, False
+
+                # Add original whitespace back in
+                num_str = first_ws + num_str + last_ws
+
+                # Split into separate words
+                for number_word_text in settings.split_words(num_str):
+                    number_word_text_norm = settings.normalize_whitespace(
+                        number_word_text
+                    )
+                    if not number_word_text_norm:
+                        continue
+
+                    if not settings.keep_whitespace:
+                        number_word_text = number_word_text_norm
+
+                    word_texts.append((number_word_text_norm, number_word_text))
+
+            return word_texts, True
+
+        cache_key = (
+            word.lang,
+            InterpretAs.NUMBER,
+            word.format,
+            str(number),
+            first_ws,
+            last_ws,
+        )
+        self._add_verbalized_words(
+            graph, word, self._get_verbalized_words(cache_key, verbalize)
+        )
 
     def _verbalize_date(self, graph: GraphType, node: Node):
         """Split dates into words"""
@@ -2136,91 +2985,105 @@ class TextProcessor:
 
         date = word.date
         date_format = word.format or settings.default_date_format
+        first_ws, last_ws = settings.get_whitespace(word.text_with_ws)
 
-        if "{" not in date_format:
-            # Transform into Python format string
-            date_format = date_format.strip().upper()
-
-            # MDY -> {M} {D} {Y}
-            date_format_str = settings.join_str.join(f"{{{c}}}" for c in date_format)
-        else:
-            # Assumed to be a Python format string already
-            date_format_str = date_format
+        def verbalize():
+            import babel.dates
+            from num2words import num2words
 
-        day_card_str = ""
-        day_ord_str = ""
-        month_str = ""
-        year_str = ""
+            if "{" not in date_format:
+                # Transform into Python format string
+                date_format_chars = date_format.strip().upper()
 
-        try:
-            if ("{M}" in date_format_str) or ("{m}" in date_format_str):
-                month_str = babel.dates.format_date(
-                    date, "MMMM", locale=settings.babel_locale
+                # MDY -> {M} {D} {Y}
+                date_format_str = settings.join_str.join(
+                    f"{{{c}}}" for c in date_format_chars
                 )
+            else:
+                # Assumed to be a Python format string already
+                date_format_str = date_format
 
-            num2words_kwargs = {"lang": settings.num2words_lang}
+            day_card_str = ""
+            day_ord_str = ""
+            month_str = ""
+            year_str = ""
 
-            if ("{D}" in date_format_str) or ("{d}" in date_format_str):
-                # Cardinal day (1 -> one)
-                num2words_kwargs["to"] = "cardinal"
-                day_card_str = num2words(date.day, **num2words_kwargs)
+            try:
+                if ("{M}" in date_format_str) or ("{m}" in date_format_str):
+                    month_str = babel.dates.format_date(
+                        date, "MMMM", locale=settings.babel_locale
+                    )
 
-            if ("{O}" in date_format_str) or ("{o}" in date_format_str):
-                # Ordinal day (1 -> first)
-                num2words_kwargs["to"] = "ordinal"
-                day_ord_str = num2words(date.day, **num2words_kwargs)
+                num2words_kwargs = {"lang": settings.num2words_lang}
 
-            if ("{Y}" in date_format_str) or ("{y}" in date_format_str):
-                try:
-                    num2words_kwargs["to"] = "year"
-                    year_str = num2words(date.year, **num2words_kwargs)
-                except Exception:
-                    # Fall back to use cardinal number for year
+                if ("{D}" in date_format_str) or ("{d}" in date_format_str):
+                    # Cardinal day (1 -> one)
                     num2words_kwargs["to"] = "cardinal"
-                    year_str = num2words(date.year, **num2words_kwargs)
-        except Exception:
-            _LOGGER.exception(
-                "Failed to format date %s for language %s", word.text, word.lang
+                    day_card_str = num2words(date.day, **num2words_kwargs)
+
+                if ("{O}" in date_format_str) or ("{o}" in date_format_str):
+                    # Ordinal day (1 -> first)
+                    num2words_kwargs["to"] = "ordinal"
+                    day_ord_str = num2words(date.day, **num2words_kwargs)
+
+                if ("{Y}" in date_format_str) or ("{y}" in date_format_str):
+                    try:
+                        num2words_kwargs["to"] = "year"
+                        year_str = num2words(date.year, **num2words_kwargs)
+                    except Exception:
+                        # Fall back to use cardinal number for year
+                        num2words_kwargs["to"] = "cardinal"
+                        year_str = num2words(date.year, **num2words_kwargs)
+            except Exception:
+                _LOGGER.exception(
+                    "Failed to format date %s for language %s", word.text, word.lang
+                )
+                return [], False
+
+            date_str = date_format_str.format(
+                **{
+                    "M": month_str,
+                    "m": month_str,
+                    "D": day_card_str,
+                    "d": day_card_str,
+                    "O": day_ord_str,
+                    "o": day_ord_str,
+                    "Y": year_str,
+                    "y": year_str,
+                }
             )
-            return
 
-        date_str = date_format_str.format(
-            **{
-                "M": month_str,
-                "m": month_str,
-                "D": day_card_str,
-                "d": day_card_str,
-                "O": day_ord_str,
-                "o": day_ord_str,
-                "Y": year_str,
-                "y": year_str,
-            }
-        )
+            date_str = first_ws + date_str + last_ws
 
-        first_ws, last_ws = settings.get_whitespace(word.text_with_ws)
-        date_str = first_ws + date_str + last_ws
+            # Split into separate words
+            word_texts: typing.List[VERBALIZED_WORD] = []
+            for date_word_text in settings.split_words(date_str):
+                date_word_text_norm = settings.normalize_whitespace(date_word_text)
+                if not date_word_text_norm:
+                    continue
 
-        # Split into separate words
-        for date_word_text in settings.split_words(date_str):
-            date_word_text_norm = settings.normalize_whitespace(date_word_text)
-            if not date_word_text_norm:
-                continue
+                if not settings.keep_whitespace:
+                    date_word_text = date_word_text_norm
 
-            if not settings.keep_whitespace:
-                date_word_text = date_word_text_norm
+                if not date_word_text:
+                    continue
 
-            if not date_word_text:
-                continue
+                word_texts.append((date_word_text_norm, date_word_text))
 
-            date_word = WordNode(
-                node=len(graph),
-                implicit=True,
-                lang=word.lang,
-                text=date_word_text_norm,
-                text_with_ws=date_word_text,
-            )
-            graph.add_node(date_word.node, data=date_word)
-            graph.add_edge(word.node, date_word.node)
+            return word_texts, True
+
+        # Only the day, month, and year are verbalized
+        cache_key = (
+            word.lang,
+            InterpretAs.DATE,
+            date_format,
+            date.date(),
+            first_ws,
+            last_ws,
+        )
+        self._add_verbalized_words(
+            graph, word, self._get_verbalized_words(cache_key, verbalize)
+        )
 
     def _verbalize_time(self, graph: GraphType, node: Node):
         """Split times into words"""
@@ -2237,41 +3100,51 @@ class TextProcessor:
             # Can't verbalize
             return
 
+        verbalize_time = settings.verbalize_time
+        time = word.time
         first_ws, last_ws = settings.get_whitespace(word.text_with_ws)
-        time_words = list(settings.verbalize_time(word.time))
-        last_idx = len(time_words) - 1
 
-        # Split into words
-        for word_idx, time_word_text in enumerate(time_words):
-            if word_idx == 0:
-                time_word_text = first_ws + time_word_text
+        def verbalize():
+            time_words = list(verbalize_time(time))
+            last_idx = len(time_words) - 1
 
-            if word_idx == last_idx:
-                time_word_text += last_ws
-            else:
-                time_word_text += settings.join_str
+            # Split into words
+            word_texts: typing.List[VERBALIZED_WORD] = []
+            for word_idx, time_word_text in enumerate(time_words):
+                if word_idx == 0:
+                    time_word_text = first_ws + time_word_text
 
-            time_word_text_norm = settings.normalize_whitespace(time_word_text)
-            if not time_word_text_norm:
-                continue
+                if word_idx == last_idx:
+                    time_word_text += last_ws
+                else:
+                    time_word_text += settings.join_str
 
-            if not settings.keep_whitespace:
-                time_word_text = time_word_text_norm
+                time_word_text_norm = settings.normalize_whitespace(time_word_text)
+                if not time_word_text_norm:
+                    continue
 
-            if not time_word_text:
-                continue
+                if not settings.keep_whitespace:
+                    time_word_text = time_word_text_norm
 
-            time_word = WordNode(
-                node=len(graph),
-                implicit=True,
-                lang=word.lang,
-                text=time_word_text_norm,
-                text_with_ws=time_word_text,
-            )
+                if not time_word_text:
+                    continue
 
-            graph.add_node(time_word.node, data=time_word)
-            graph.add_edge(word.node, time_word.node)
+                word_texts.append((time_word_text_norm, time_word_text))
 
+            return word_texts, True
+
+        cache_key = (
+            word.lang,
+            InterpretAs.TIME,
+            time.hours,
+            time.minutes,
+            time.period,
+            first_ws,
+            last_ws,
+        )
+        for time_word in self._add_verbalized_words(
+            graph, word, self._get_verbalized_words(cache_key, verbalize)
+        ):
             # May contain numbers or initialisms
             self._transform_number(graph, time_word)
             for node_class, node_kwargs in self._split_initialism(graph, time_word):
@@ -2299,11 +3172,6 @@ class TextProcessor:
 
         decimal_num = word.number
 
-        # True if number has non-zero fractional part
-        num_has_frac = (decimal_num % 1) != 0
-
-        num2words_kwargs = {"lang": settings.num2words_lang, "to": "currency"}
-
         # Name of currency (e.g., USD)
         if not word.currency_name:
             currency_name = settings.default_currency
@@ -2315,46 +3183,129 @@ class TextProcessor:
 
             word.currency_name = currency_name
 
-        num2words_kwargs["currency"] = word.currency_name
+        currency_name = word.currency_name
+        first_ws, last_ws = settings.get_whitespace(word.text_with_ws)
 
-        # Custom separator so we can remove 'zero cents'
-        num2words_kwargs["separator"] = "|"
+        def verbalize():
+            from num2words import num2words
 
-        try:
-            num_str = num2words(float(decimal_num), **num2words_kwargs)
-        except Exception:
-            _LOGGER.exception(
-                "Failed to verbalize currency %s for language %s", word, word.lang
-            )
-            return
+            # True if number has non-zero fractional part
+            num_has_frac = (decimal_num % 1) != 0
 
-        # Post-process currency words
-        if num_has_frac:
-            # Discard num2words separator
-            num_str = num_str.replace("|", "")
-        else:
-            # Remove 'zero cents' part
-            num_str = num_str.split("|", maxsplit=1)[0]
+            num2words_kwargs = {"lang": settings.num2words_lang, "to": "currency"}
+            num2words_kwargs["currency"] = currency_name
 
-        # Add original whitespace back in
-        first_ws, last_ws = settings.get_whitespace(word.text_with_ws)
-        num_str = first_ws + num_str + last_ws
+            # Custom separator so we can remove 'zero cents'
+            num2words_kwargs["separator"] = "|"
 
-        # Split into separate words
-        for currency_word_text in settings.split_words(num_str):
-            currency_word_text_norm = settings.normalize_whitespace(currency_word_text)
-            if not currency_word_text_norm:
-                continue
+            try:
+                num_str = num2words(float(decimal_num), **num2words_kwargs)
+            except Exception:
+                _LOGGER.exception(
+                    "Failed to verbalize currency %s for language %s", word, word.lang
+                )
+                return [], False
 
-            if not settings.keep_whitespace:
-                currency_word_text = currency_word_text_norm
+            # Post-process currency words
+            if num_has_frac:
+                # Discard num2words separator
+                num_str = num_str.replace("|", "")
+            else:
+                # Remove 'zero cents' part
+                num_str = num_str.split("|", maxsplit=1)[0]
 
-            currency_word = WordNode(
-                node=len(graph),
-                implicit=True,
-                lang=word.lang,
-                text=currency_word_text_norm,
-                text_with_ws=currency_word_text,
-            )
-            graph.add_node(currency_word.node, data=currency_word)
-            graph.add_edge(word.node, currency_word.node)
+            # Add original whitespace back in
+            num_str = first_ws + num_str + last_ws
+
+            # Split into separate words
+            word_texts: typing.List[VERBALIZED_WORD] = []
+            for currency_word_text in settings.split_words(num_str):
+                currency_word_text_norm = settings.normalize_whitespace(
+                    currency_word_text
+                )
+                if not currency_word_text_norm:
+                    continue
+
+                if not settings.keep_whitespace:
+                    currency_word_text = currency_word_text_norm
+
+                word_texts.append((currency_word_text_norm, currency_word_text))
+
+            return word_texts, True
+
+        cache_key = (
+            word.lang,
+            InterpretAs.CURRENCY,
+            currency_name,
+            str(decimal_num),
+            first_ws,
+            last_ws,
+        )
+        self._add_verbalized_words(
+            graph, word, self._get_verbalized_words(cache_key, verbalize)
+        )
+
+
+# -----------------------------------------------------------------------------
+# Chunked processing
+# -----------------------------------------------------------------------------
+
+
+class ChunkStitcher:
+    """Renumbers sentences from consecutive chunks as if they were one document"""
+
+    def __init__(self):
+        # Paragraph index of the next chunk's first paragraph
+        self.next_par_idx = 0
+
+        # Number of sentences in the last paragraph so far
+        self.last_par_sentences = 0
+
+    def __call__(
+        self, sentences: typing.List[Sentence], num_paragraphs: int, continues: bool
+    ) -> typing.List[Sentence]:
+        """Renumber a chunk's sentences (continues=True to extend last paragraph)"""
+        par_offset = self.next_par_idx
+        sent_offset = 0
+
+        if continues and (self.next_par_idx > 0):
+            # Chunk's first paragraph is the previous chunk's last paragraph
+            par_offset -= 1
+            sent_offset = self.last_par_sentences
+
+        next_par_idx = par_offset + num_paragraphs
+        if next_par_idx != self.next_par_idx:
+            self.last_par_sentences = 0
+
+        for sentence in sentences:
+            if sentence.par_idx == 0:
+                sentence.idx += sent_offset
+
+            sentence.par_idx += par_offset
+            for word in sentence.words:
+                word.sent_idx = sentence.idx
+                word.par_idx = sentence.par_idx
+
+            if sentence.par_idx == (next_par_idx - 1):
+                self.last_par_sentences = sentence.idx + 1
+
+        self.next_par_idx = next_par_idx
+
+        return sentences
+
+
+# config key -> processor (one per process)
+_CHUNK_PROCESSORS: typing.Dict[str, TextProcessor] = {}
+
+
+def _process_chunk_in_process(
+    config: typing.Dict[str, typing.Any], chunk_text: str, *chunk_args
+) -> CHUNK_RESULT:
+    """Process a chunk with a TextProcessor cached in this process"""
+    config_key = repr(config)
+    text_processor = _CHUNK_PROCESSORS.get(config_key)
+    if text_processor is None:
+        text_processor = TextProcessor(**config)
+        _CHUNK_PROCESSORS[config_key] = text_processor
+
+    return text_processor._process_chunk(chunk_text, *chunk_args)
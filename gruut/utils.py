@@ -1,23 +1,27 @@
 """Utility methods for gruut"""
+import copy
 import itertools
 import logging
 import os
 import re
+import sys
+import threading
+import time
 import typing
 import xml.etree.ElementTree as etree
+from collections import OrderedDict
 from pathlib import Path
 
-import networkx as nx
-from gruut_ipa import IPA
-
 from gruut.const import (
     DATA_PROP,
     KNOWN_LANGS,
     LANG_ALIASES,
     NODE_TYPE,
+    STAGE_TIMING_CALLBACK,
     EndElement,
     GraphType,
     Node,
+    StageTiming,
 )
 
 _DIR = Path(__file__).parent
@@ -176,6 +180,301 @@ def sliding_window(iterable, n=2):
     return zip(*iterables)
 
 
+# -----------------------------------------------------------------------------
+# Caching
+# -----------------------------------------------------------------------------
+
+
+class LRUCache:
+    """Thread-safe, bounded cache that evicts the least recently used item
+
+    Keeps hit/miss counts so cache effectiveness can be monitored.
+    """
+
+    def __init__(self, max_size: int = 1024):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+
+        self._items: "OrderedDict[typing.Hashable, typing.Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: typing.Hashable, default: typing.Any = None) -> typing.Any:
+        """Get cached value for key (or default), counting hits and misses"""
+        with self._lock:
+            try:
+                value = self._items[key]
+            except KeyError:
+                self.misses += 1
+                return default
+
+            # Most recently used goes to the end
+            self._items.move_to_end(key)
+            self.hits += 1
+
+            return value
+
+    def put(self, key: typing.Hashable, value: typing.Any):
+        """Store value for key, evicting the least recently used item if full"""
+        if self.max_size <= 0:
+            # Caching disabled
+            return
+
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    def clear(self, reset_stats: bool = True):
+        """Remove all items (and optionally reset hit/miss counts)"""
+        with self._lock:
+            self._items.clear()
+
+            if reset_stats:
+                self.hits = 0
+                self.misses = 0
+
+    def stats(self) -> typing.Dict[str, typing.Any]:
+        """Get hit/miss counts, hit rate, and size of the cache"""
+        with self._lock:
+            num_lookups = self.hits + self.misses
+
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits / num_lookups) if num_lookups > 0 else 0.0,
+                "size": len(self._items),
+                "max_size": self.max_size,
+            }
+
+    def __contains__(self, key: typing.Hashable) -> bool:
+        with self._lock:
+            return key in self._items
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._items)
+
+
+# -----------------------------------------------------------------------------
+# Timing
+# -----------------------------------------------------------------------------
+
+
+class StageTimingAggregator:
+    """Collects StageTiming records and sums them per stage.
+
+    Pass as on_stage_timing to TextProcessor, then call print_summary.
+    """
+
+    def __init__(self):
+        # stage -> {calls, seconds, max_seconds, leaves_visited, leaves_changed}
+        self.stages: "OrderedDict[str, typing.Dict[str, typing.Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __call__(self, timing: StageTiming):
+        with self._lock:
+            stage = self.stages.get(timing.stage)
+            if stage is None:
+                stage = {
+                    "calls": 0,
+                    "seconds": 0.0,
+                    "max_seconds": 0.0,
+                    "leaves_visited": 0,
+                    "leaves_changed": 0,
+                }
+                self.stages[timing.stage] = stage
+
+            stage["calls"] += 1
+            stage["seconds"] += timing.seconds
+            stage["max_seconds"] = max(stage["max_seconds"], timing.seconds)
+            stage["leaves_visited"] += timing.leaves_visited
+            stage["leaves_changed"] += timing.leaves_changed
+
+    def reset(self):
+        """Clear all stages"""
+        with self._lock:
+            self.stages.clear()
+
+    def summary(self) -> typing.List[typing.Dict[str, typing.Any]]:
+        """Totals for each stage, slowest first"""
+        with self._lock:
+            rows = [{"stage": name, **stage} for name, stage in self.stages.items()]
+
+        return sorted(rows, key=lambda row: row["seconds"], reverse=True)
+
+    def print_summary(self, file: typing.TextIO = sys.stderr):
+        """Print per-stage breakdown as a table"""
+        rows = self.summary()
+
+        # Sub-stages (e.g., process_sentence/guess_phonemes) are part of their parent
+        total_seconds = (
+            sum(row["seconds"] for row in rows if "/" not in row["stage"]) or 1.0
+        )
+        stage_width = max([len("stage")] + [len(row["stage"]) for row in rows])
+
+        print(
+            "stage".ljust(stage_width),
+            "calls".rjust(8),
+            "total ms".rjust(10),
+            "%".rjust(6),
+            "max ms".rjust(10),
+            "visited".rjust(10),
+            "changed".rjust(10),
+            file=file,
+        )
+
+        for row in rows:
+            print(
+                row["stage"].ljust(stage_width),
+                str(row["calls"]).rjust(8),
+                f"{row['seconds'] * 1000:.2f}".rjust(10),
+                f"{100 * row['seconds'] / total_seconds:.1f}".rjust(6),
+                f"{row['max_seconds'] * 1000:.2f}".rjust(10),
+                str(row["leaves_visited"]).rjust(10),
+                str(row["leaves_changed"]).rjust(10),
+                file=file,
+            )
+
+
+# -----------------------------------------------------------------------------
+# Statistics
+# -----------------------------------------------------------------------------
+
+STATS_TYPE = typing.Dict[str, typing.Any]
+
+# Stats whose values are not cumulative (exported as Prometheus gauges)
+GAUGE_STATS = {"hit_rate", "size", "max_size", "load_seconds"}
+
+
+class StatsCounters:
+    """Thread-safe named counters for runtime statistics.
+
+    Values are ints (counts) or floats (seconds).
+    """
+
+    def __init__(self, *names: str):
+        self._names = names
+        self._values: STATS_TYPE = dict.fromkeys(names, 0)
+        self._lock = threading.Lock()
+
+    def add(self, name: str, amount: typing.Union[int, float] = 1):
+        """Add to a counter (created if missing)"""
+        with self._lock:
+            self._values[name] = self._values.get(name, 0) + amount
+
+    def stats(self, reset: bool = False) -> STATS_TYPE:
+        """Get a copy of all counters (and optionally reset them to zero)"""
+        with self._lock:
+            values = dict(self._values)
+            if reset:
+                self._values = dict.fromkeys(self._names, 0)
+
+        return values
+
+    def reset(self):
+        """Set all counters back to zero"""
+        self.stats(reset=True)
+
+
+def get_stats(obj: typing.Any, reset: bool = False) -> typing.Optional[STATS_TYPE]:
+    """Get stats from an object with a stats(reset) method (None otherwise)"""
+    stats_func = getattr(obj, "stats", None)
+    if not callable(stats_func):
+        return None
+
+    return stats_func(reset=reset)
+
+
+def stats_to_prometheus(
+    stats: STATS_TYPE,
+    prefix: str = "gruut",
+    label_keys: typing.Optional[typing.Mapping[str, str]] = None,
+    path: typing.Optional[typing.Union[str, Path]] = None,
+) -> str:
+    """Format nested stats in the Prometheus text exposition format.
+
+    Nested keys are joined into metric names (prefix_lookup_phonemes_sql_queries).
+    Children of keys in label_keys become label values instead, so
+    {"languages": {"en_US": ...}} is exported with a lang="en_US" label.
+
+    Counters get a _total suffix. If path is given, the text is also written
+    there atomically (e.g., for the node_exporter textfile collector).
+    """
+    if label_keys is None:
+        label_keys = {"languages": "lang"}
+
+    # name -> (type, [(labels, value)])
+    metrics: "OrderedDict[str, typing.Tuple[str, typing.List[typing.Any]]]" = (
+        OrderedDict()
+    )
+
+    def add_metrics(
+        value: typing.Any,
+        name_parts: typing.List[str],
+        labels: typing.List[typing.Tuple[str, str]],
+    ):
+        if isinstance(value, typing.Mapping):
+            label_name = label_keys.get(name_parts[-1]) if name_parts else None
+            for key, sub_value in value.items():
+                if label_name is not None:
+                    add_metrics(
+                        sub_value, name_parts[:-1], labels + [(label_name, str(key))]
+                    )
+                else:
+                    add_metrics(sub_value, name_parts + [str(key)], labels)
+
+            return
+
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            # Not a number
+            return
+
+        metric_type = "gauge" if name_parts[-1] in GAUGE_STATS else "counter"
+        metric_name = re.sub(r"[^a-zA-Z0-9_:]", "_", "_".join(name_parts))
+        if metric_type == "counter":
+            metric_name += "_total"
+
+        _, samples = metrics.setdefault(metric_name, (metric_type, []))
+        samples.append((labels, value))
+
+    add_metrics(stats, [prefix], [])
+
+    lines: typing.List[str] = []
+    for metric_name, (metric_type, samples) in metrics.items():
+        lines.append(f"# TYPE {metric_name} {metric_type}")
+        for labels, value in samples:
+            label_str = ""
+            if labels:
+                label_str = (
+                    "{"
+                    + ",".join(
+                        f'{label_name}="{_escape_label_value(label_value)}"'
+                        for label_name, label_value in labels
+                    )
+                    + "}"
+                )
+
+            lines.append(f"{metric_name}{label_str} {value}")
+
+    text = "\n".join(lines) + "\n" if lines else ""
+
+    if path is not None:
+        # Write to temporary file first so readers never see a partial file
+        path = Path(path)
+        temp_path = path.with_name(f".{path.name}.tmp")
+        temp_path.write_text(text, encoding="utf-8")
+        os.replace(temp_path, path)
+
+    return text
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
 # -----------------------------------------------------------------------------
 # XML
 # -----------------------------------------------------------------------------
@@ -233,6 +532,104 @@ def text_and_elements(element, is_last=False):
         yield tail
 
 
+# -----------------------------------------------------------------------------
+# Chunking
+# -----------------------------------------------------------------------------
+
+# (chunk text, True if chunk continues the previous chunk's last paragraph)
+TEXT_CHUNK = typing.Tuple[str, bool]
+
+BLANK_LINES_PATTERN = re.compile(r"\n[^\S\n]*\n\s*")
+
+
+def split_text_chunks(
+    text: str,
+    max_chunk_chars: int,
+    major_breaks: typing.Iterable[str] = (".", "?", "!"),
+) -> typing.List[TEXT_CHUNK]:
+    """Split plain text into chunks of about max_chunk_chars.
+
+    Chunks only end after a blank line that follows a major break (e.g., "."),
+    so no sentence is split across chunks. Whitespace stays with the previous chunk.
+    """
+    major_breaks = tuple(major_breaks)
+    chunks: typing.List[TEXT_CHUNK] = []
+    chunk_start = 0
+
+    for blank_match in BLANK_LINES_PATTERN.finditer(text):
+        chunk_end = blank_match.end()
+        if (chunk_end - chunk_start) < max_chunk_chars:
+            continue
+
+        # Check the end of the chunk in place (no copy of the text so far)
+        text_end = blank_match.start()
+        while (text_end > chunk_start) and text[text_end - 1].isspace():
+            text_end -= 1
+
+        if not text.endswith(major_breaks, chunk_start, text_end):
+            # Sentence may continue after blank line
+            continue
+
+        if chunk_end >= len(text):
+            break
+
+        chunks.append((text[chunk_start:chunk_end], bool(chunks)))
+        chunk_start = chunk_end
+
+    chunks.append((text[chunk_start:], bool(chunks)))
+
+    return chunks
+
+
+def split_ssml_chunks(
+    root_element: etree.Element, max_chunk_chars: int
+) -> typing.List[TEXT_CHUNK]:
+    """Split SSML into chunks of about max_chunk_chars at top-level <p> elements.
+
+    Each chunk is a copy of the root element (with the same attributes) holding
+    one or more paragraphs. Anything between paragraphs stays with the
+    previous paragraph. Top-level <lexicon> elements are repeated in every chunk.
+    """
+    groups: typing.List[typing.List[etree.Element]] = [[]]
+    group_chars = 0
+    lexicons: typing.List[etree.Element] = []
+
+    for child in root_element:
+        child_chars = len(etree.tostring(child, encoding="unicode"))
+
+        if tag_no_namespace(child.tag) == "lexicon":
+            lexicon = copy.deepcopy(child)
+            lexicon.tail = None
+            lexicons.append(lexicon)
+
+        if (
+            (tag_no_namespace(child.tag) == "p")
+            and groups[-1]
+            and (group_chars >= max_chunk_chars)
+        ):
+            # Start new chunk with this paragraph
+            groups.append([])
+            group_chars = 0
+
+        groups[-1].append(child)
+        group_chars += child_chars
+
+    chunks: typing.List[TEXT_CHUNK] = []
+    for group_idx, group in enumerate(groups):
+        chunk_element = etree.Element(root_element.tag, root_element.attrib)
+        if group_idx == 0:
+            # Text before first element
+            chunk_element.text = root_element.text
+        else:
+            # Needed for <lookup> in this chunk
+            chunk_element.extend(copy.deepcopy(lexicons))
+
+        chunk_element.extend(group)
+        chunks.append((etree.tostring(chunk_element, encoding="unicode"), False))
+
+    return chunks
+
+
 # -----------------------------------------------------------------------------
 # Text
 # -----------------------------------------------------------------------------
@@ -252,6 +649,8 @@ def maybe_split_ipa(s: str) -> typing.List[str]:
         return s.split()
 
     # Automatic separation
+    from gruut_ipa import IPA
+
     return IPA.graphemes(s)
 
 
@@ -284,6 +683,8 @@ def print_graph(
 
 def leaves(graph: GraphType, node: Node):
     """Iterate through the leaves of a graph in depth-first order"""
+    import networkx as nx
+
     for dfs_node in nx.dfs_preorder_nodes(graph, node.node):
         if not graph.out_degree(dfs_node) == 0:
             continue
@@ -291,26 +692,233 @@ def leaves(graph: GraphType, node: Node):
         yield graph.nodes[dfs_node][DATA_PROP]
 
 
-def pipeline_split(split_func, graph: GraphType, parent_node: Node,) -> bool:
-    """Splits leaf nodes of tree into zero or more sub-nodes"""
-    was_changed = False
+def pipeline_split(
+    split_func,
+    graph: GraphType,
+    parent_node: Node,
+    on_stage: typing.Optional[STAGE_TIMING_CALLBACK] = None,
+) -> bool:
+    """Splits leaf nodes of tree into zero or more sub-nodes.
+
+    If on_stage is set, it receives a timing record for the split.
+    """
+    start_time = time.perf_counter() if on_stage is not None else 0.0
+    leaf_nodes = list(leaves(graph, parent_node))
+    num_changed = 0
 
-    for leaf_node in list(leaves(graph, parent_node)):
+    for leaf_node in leaf_nodes:
+        was_leaf_changed = False
         for node_class, node_kwargs in split_func(graph, leaf_node):
             new_node = node_class(node=len(graph), **node_kwargs)
             graph.add_node(new_node.node, data=new_node)
             graph.add_edge(leaf_node.node, new_node.node)
-            was_changed = True
+            was_leaf_changed = True
+
+        if was_leaf_changed:
+            num_changed += 1
+
+    if on_stage is not None:
+        on_stage(
+            StageTiming(
+                stage=stage_name(split_func),
+                seconds=time.perf_counter() - start_time,
+                leaves_visited=len(leaf_nodes),
+                leaves_changed=num_changed,
+            )
+        )
+
+    return num_changed > 0
+
+
+# (index of original word, node) in a flat token list
+TOKEN_TYPE = typing.Tuple[int, Node]
+
+
+class TokenList:
+    """Flat list of leaf nodes for plain text, used in place of a graph.
+
+    Supports the part of the graph API that pipeline functions use to add child
+    nodes (len, add_node, add_edge). Children replace their parent in the list
+    once a stage is done, and keep the index of the original word.
+    """
+
+    def __init__(self):
+        # (index of original word, node) in document order
+        self.tokens: typing.List[TOKEN_TYPE] = []
 
-    return was_changed
+        self.num_nodes: int = 0
+        self._new_nodes: typing.Dict[NODE_TYPE, Node] = {}
+        self._children: typing.Dict[NODE_TYPE, typing.List[Node]] = {}
 
+    def __len__(self) -> int:
+        return self.num_nodes
 
-def pipeline_transform(transform_func, graph: GraphType, parent_node: Node,) -> bool:
-    """Transforms leaves of tree with a custom function"""
-    was_changed = False
+    def add_word(self, node: Node):
+        """Add a node for the next original word"""
+        self.tokens.append((len(self.tokens), node))
+        self.num_nodes = max(self.num_nodes, node.node + 1)
 
-    for leaf_node in list(leaves(graph, parent_node)):
+    def add_node(self, node: NODE_TYPE, data: Node):
+        """Add a node that will become a child with add_edge"""
+        self._new_nodes[node] = data
+        self.num_nodes = max(self.num_nodes, node + 1)
+
+    def add_edge(self, parent_node: NODE_TYPE, child_node: NODE_TYPE):
+        """Make a node added with add_node a child of another node"""
+        self._children.setdefault(parent_node, []).append(
+            self._new_nodes.pop(child_node)
+        )
+
+    def replace_children(self):
+        """Replace nodes with their children (recursively)"""
+        if not self._children:
+            return
+
+        self.tokens = [
+            (word_idx, leaf_node)
+            for word_idx, token_node in self.tokens
+            for leaf_node in self._leaves(token_node)
+        ]
+
+    def _leaves(self, node: Node) -> typing.Iterable[Node]:
+        children = self._children.pop(node.node, None)
+        if children is None:
+            yield node
+            return
+
+        for child_node in children:
+            yield from self._leaves(child_node)
+
+
+def tokens_split(
+    split_func,
+    token_list: TokenList,
+    on_stage: typing.Optional[STAGE_TIMING_CALLBACK] = None,
+) -> bool:
+    """Splits tokens of a flat list into zero or more sub-tokens.
+
+    Same as pipeline_split, but without a graph.
+    If on_stage is set, it receives a timing record for the split.
+    """
+    start_time = time.perf_counter() if on_stage is not None else 0.0
+    leaf_nodes = [token_node for _word_idx, token_node in token_list.tokens]
+    num_changed = 0
+
+    for leaf_node in leaf_nodes:
+        was_leaf_changed = False
+        for node_class, node_kwargs in split_func(token_list, leaf_node):
+            new_node = node_class(node=len(token_list), **node_kwargs)
+            token_list.add_node(new_node.node, data=new_node)
+            token_list.add_edge(leaf_node.node, new_node.node)
+            was_leaf_changed = True
+
+        if was_leaf_changed:
+            num_changed += 1
+
+    token_list.replace_children()
+
+    if on_stage is not None:
+        on_stage(
+            StageTiming(
+                stage=stage_name(split_func),
+                seconds=time.perf_counter() - start_time,
+                leaves_visited=len(leaf_nodes),
+                leaves_changed=num_changed,
+            )
+        )
+
+    return num_changed > 0
+
+
+def tokens_transform(
+    transform_func,
+    token_list: TokenList,
+    on_stage: typing.Optional[STAGE_TIMING_CALLBACK] = None,
+) -> bool:
+    """Transforms tokens of a flat list with a custom function.
+
+    Same as pipeline_transform, but without a graph. Nodes the function adds
+    as children replace their parent afterwards.
+    If on_stage is set, it receives a timing record for the transformation.
+    """
+    start_time = time.perf_counter() if on_stage is not None else 0.0
+    leaf_nodes = [token_node for _word_idx, token_node in token_list.tokens]
+    num_changed = 0
+
+    for leaf_node in leaf_nodes:
+        if transform_func(token_list, leaf_node):
+            num_changed += 1
+
+    token_list.replace_children()
+
+    if on_stage is not None:
+        on_stage(
+            StageTiming(
+                stage=stage_name(transform_func),
+                seconds=time.perf_counter() - start_time,
+                leaves_visited=len(leaf_nodes),
+                leaves_changed=num_changed,
+            )
+        )
+
+    return num_changed > 0
+
+
+def pipeline_transform(
+    transform_func,
+    graph: GraphType,
+    parent_node: Node,
+    on_stage: typing.Optional[STAGE_TIMING_CALLBACK] = None,
+) -> bool:
+    """Transforms leaves of tree with a custom function.
+
+    If on_stage is set, it receives a timing record for the transformation.
+    """
+    start_time = time.perf_counter() if on_stage is not None else 0.0
+    leaf_nodes = list(leaves(graph, parent_node))
+    num_changed = 0
+
+    for leaf_node in leaf_nodes:
         if transform_func(graph, leaf_node):
-            was_changed = True
+            num_changed += 1
+
+    if on_stage is not None:
+        on_stage(
+            StageTiming(
+                stage=stage_name(transform_func),
+                seconds=time.perf_counter() - start_time,
+                leaves_visited=len(leaf_nodes),
+                leaves_changed=num_changed,
+            )
+        )
+
+    return num_changed > 0
+
+
+def timed_stage(
+    stage_func,
+    *args,
+    on_stage: typing.Optional[STAGE_TIMING_CALLBACK] = None,
+    stage: typing.Optional[str] = None,
+    **kwargs,
+) -> typing.Any:
+    """Calls a custom pipeline stage, timing it if on_stage is set"""
+    if on_stage is None:
+        return stage_func(*args, **kwargs)
+
+    start_time = time.perf_counter()
+    result = stage_func(*args, **kwargs)
+    on_stage(
+        StageTiming(
+            stage=stage or stage_name(stage_func),
+            seconds=time.perf_counter() - start_time,
+            leaves_changed=1 if result else 0,
+        )
+    )
+
+    return result
+
 
-    return was_changed
+def stage_name(stage_func) -> str:
+    """Name of a pipeline stage function (_split_replacements -> split_replacements)"""
+    return getattr(stage_func, "__name__", str(stage_func)).lstrip("_")
@@ -0,0 +1,44 @@
+#!/usr/bin/env bash
+set -e
+
+# Runs the end-to-end pipeline benchmark.
+# Compares against bench-baseline.json if it exists (fails on regressions).
+# Use --save-baseline to write a new baseline instead.
+
+# Directory of *this* script
+this_dir="$( cd "$( dirname "$0" )" && pwd )"
+src_dir="$(realpath "${this_dir}/..")"
+
+if [[ "$1" == '--save-baseline' ]]; then
+    save_baseline='1'
+    shift
+fi
+
+venv="${src_dir}/.venv"
+if [[ -d "${venv}" ]]; then
+    source "${venv}/bin/activate"
+fi
+
+# -----------------------------------------------------------------------------
+
+export PYTHONPATH="${src_dir}"
+
+while read -r lang_dir;
+do
+    export PYTHONPATH="${lang_dir}:${PYTHONPATH}"
+done < <(find "${src_dir}" -maxdepth 1 -type d -name 'gruut-lang-*')
+
+baseline="${src_dir}/bench-baseline.json"
+report="${src_dir}/bench-report.json"
+
+if [[ -n "${save_baseline}" ]]; then
+    python3 -m gruut.bench pipeline --output "${baseline}" "$@"
+elif [[ -f "${baseline}" ]]; then
+    python3 -m gruut.bench pipeline --output "${report}" --baseline "${baseline}" "$@"
+else
+    python3 -m gruut.bench pipeline --output "${report}" "$@"
+fi
+
+# -----------------------------------------------------------------------------
+
+echo "OK"
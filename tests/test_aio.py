@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""Tests for asyncio front end"""
+import asyncio
+import concurrent.futures
+import unittest
+
+from gruut import asentences, sentences
+from gruut.aio import AsyncTextProcessor
+from gruut.text_processor import TextProcessor
+
+TEXT = "\n\n".join(f"This is paragraph {i}. It has two sentences." for i in range(20))
+
+
+def run(coro):
+    """Run coroutine on a new event loop"""
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+class AsyncTestCase(unittest.TestCase):
+    """Test cases for asyncio front end"""
+
+    def test_asentences(self):
+        """Test that async sentences match sync sentences"""
+
+        async def collect():
+            with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+                return [
+                    (s.idx, s.par_idx, s.text)
+                    async for s in asentences(
+                        TEXT, executor=executor, max_queue_size=2, phonemes=False
+                    )
+                ]
+
+        expected = [(s.idx, s.par_idx, s.text) for s in sentences(TEXT, phonemes=False)]
+        self.assertEqual(run(collect()), expected)
+
+    def test_cancel(self):
+        """Test that a dropped consumer stops further chunks"""
+        text_processor = TextProcessor(default_lang="en_US")
+        async_processor = AsyncTextProcessor(
+            text_processor, max_queue_size=1, max_pending_chunks=1, max_chunk_chars=50
+        )
+
+        async def first_sentence():
+            sentences_iter = async_processor.sentences(TEXT, phonemize=False)
+            sentence = await sentences_iter.__anext__()
+            await sentences_iter.aclose()
+
+            # Let cancellation finish
+            await asyncio.sleep(0.1)
+            return sentence
+
+        self.assertEqual(run(first_sentence()).text, "This is paragraph zero.")
+
+        num_chunks = len(text_processor.split_chunks(TEXT, max_chunk_chars=50))
+        self.assertGreaterEqual(num_chunks, 10)
+        self.assertLess(text_processor.stats()["documents"], 5)
+
+    def test_error(self):
+        """Test that processing errors are raised in the consumer"""
+        async_processor = AsyncTextProcessor(default_lang="en_US")
+
+        async def collect():
+            return [
+                s
+                async for s in async_processor.sentences(
+                    "<speak>", ssml=True, add_speak_tag=False
+                )
+            ]
+
+        with self.assertRaises(Exception):
+            run(collect())
+
+
+# -----------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""Tests for benchmark helpers"""
+import dataclasses
+import random
+import tracemalloc
+import unittest
+import xml.etree.ElementTree as etree
+
+from gruut.bench import (
+    DEFAULT_SENTENCES_PATH,
+    CachedGuesser,
+    bench_g2p,
+    compare_to_baseline,
+    count_sentences_words,
+    edit_distance,
+    load_test_sentences,
+    make_corpora,
+    measure_memory,
+    percentile,
+)
+from gruut.const import Sentence, Word
+
+
+class BenchTestCase(unittest.TestCase):
+    """Test cases for benchmark helpers"""
+
+    def test_edit_distance(self):
+        """Test phoneme edit distance"""
+        self.assertEqual(edit_distance([], []), 0)
+        self.assertEqual(edit_distance(["a"], []), 1)
+        self.assertEqual(edit_distance([], ["a", "b"]), 2)
+        self.assertEqual(edit_distance(["k", "æ", "t"], ["k", "ɑ", "t", "s"]), 2)
+
+        # Phonemes are compared whole, not character by character
+        self.assertEqual(edit_distance(["aɪ"], ["a", "ɪ"]), 2)
+
+    def test_percentile(self):
+        """Test nearest-rank percentile"""
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 99), 99)
+        self.assertEqual(percentile(values, 100), 100)
+        self.assertEqual(percentile([3.0], 99), 3.0)
+        self.assertEqual(percentile([], 50), 0.0)
+
+    def test_bench_g2p(self):
+        """Test g2p benchmark on a fake guesser"""
+        guessed_words = []
+
+        def guess_phonemes(word):
+            guessed_words.append(word)
+            if word == "missing":
+                return None
+
+            return list(word)
+
+        lexicon = {"abc": ["a", "b", "c"], "ab": ["a", "x"], "missing": ["m"]}
+        result = bench_g2p(CachedGuesser(guess_phonemes), lexicon, engine="crf+cache")
+
+        self.assertEqual(result["words"], 3)
+        self.assertEqual(result["missing"], 1)
+        self.assertEqual(result["errors"], 2)
+        self.assertEqual(result["phonemes"], 6)
+        self.assertAlmostEqual(result["per"], 2 / 6)
+        self.assertLessEqual(result["latency_ms"]["p50"], result["latency_ms"]["p99"])
+
+        # Each word is only guessed once
+        self.assertEqual(guessed_words, ["abc", "ab", "missing"])
+
+    def test_corpora(self):
+        """Test synthetic corpora for pipeline benchmark"""
+        seed_sentences = load_test_sentences(DEFAULT_SENTENCES_PATH)["en-us"]
+        self.assertTrue(seed_sentences)
+
+        corpora = make_corpora(seed_sentences, num_items=10, rng=random.Random(1))
+        self.assertEqual(set(corpora), {"prose", "numbers", "ssml", "long"})
+
+        # Seed sentences come first
+        self.assertEqual(
+            corpora["prose"]["items"][: len(seed_sentences)], seed_sentences
+        )
+        self.assertTrue(any(c.isdigit() for c in corpora["numbers"]["items"][0]))
+
+        # SSML is well-formed and has marks/breaks
+        self.assertTrue(corpora["ssml"]["ssml"])
+        for ssml_text in corpora["ssml"]["items"]:
+            root = etree.fromstring(ssml_text)
+            self.assertTrue(root.findall(".//mark"))
+            self.assertTrue(root.findall(".//break"))
+
+        # Deterministic
+        self.assertEqual(
+            corpora, make_corpora(seed_sentences, num_items=10, rng=random.Random(1))
+        )
+
+    def test_measure_memory(self):
+        """Test per-word memory of kept outputs"""
+        # Same fields as Word, but with a __dict__
+        DictWord = dataclasses.make_dataclass(
+            "DictWord",
+            [
+                (f.name, f.type, dataclasses.field(default=f.default))
+                for f in dataclasses.fields(Word)
+            ],
+        )
+
+        def make_run(word_cls):
+            def run(text):
+                words = [
+                    word_cls(idx=idx, text=word_text, text_with_ws=f"{word_text} ")
+                    for idx, word_text in enumerate(text.split())
+                ]
+                return [
+                    Sentence(
+                        idx=0, text=text, text_with_ws=text, text_spoken="", words=words
+                    )
+                ]
+
+            return run
+
+        items = [f"word{i} " * 100 for i in range(10)]
+        self.assertEqual(count_sentences_words(make_run(Word)(items[0])), (1, 100))
+
+        result = measure_memory(make_run(Word), items)
+        self.assertFalse(tracemalloc.is_tracing())
+        self.assertEqual(result["words"], 1000)
+        self.assertGreater(result["retained_bytes_per_word"], 0)
+        self.assertGreater(result["retained_blocks_per_word"], 0)
+        self.assertGreaterEqual(
+            result["peak_bytes_per_word"], result["retained_bytes_per_word"]
+        )
+
+        # Slots are smaller than a __dict__
+        dict_result = measure_memory(make_run(DictWord), items)
+        self.assertLess(
+            result["retained_bytes_per_word"], dict_result["retained_bytes_per_word"]
+        )
+
+    def test_compare_to_baseline(self):
+        """Test regression detection against a baseline report"""
+
+        def make_report(chars_per_second):
+            return {
+                "results": [
+                    {
+                        "language": "en-us",
+                        "corpus": "prose",
+                        "api": "sentences",
+                        "chars_per_second": chars_per_second,
+                        "sentences_per_second": 10.0,
+                    }
+                ]
+            }
+
+        baseline = make_report(1000.0)
+        self.assertEqual(compare_to_baseline(make_report(950.0), baseline), [])
+        self.assertEqual(compare_to_baseline(make_report(2000.0), baseline), [])
+
+        regressions = compare_to_baseline(make_report(800.0), baseline)
+        self.assertEqual(len(regressions), 1)
+        self.assertIn("en-us/prose/sentences/chars_per_second", regressions[0])
+
+        # Missing from baseline
+        self.assertEqual(compare_to_baseline(make_report(1.0), {"results": []}), [])
+
+
+# -----------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""Tests for sharded corpus processing"""
+import contextlib
+import io
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from gruut.__main__ import get_args
+from gruut.corpus import (
+    DUPLICATES_NAME,
+    MANIFEST_NAME,
+    ShardStatus,
+    iter_shard_lines,
+    run_corpus,
+    split_shards,
+)
+
+
+class CorpusTestCase(unittest.TestCase):
+    """Test cases for sharded corpus processing"""
+
+    def test_split_shards(self):
+        """Test that shards start on line boundaries and cover the whole file"""
+        with tempfile.TemporaryDirectory() as temp_dir_str:
+            input_path = Path(temp_dir_str) / "corpus.txt"
+            lines = [f"Line {i} {'x' * (i % 7)}\n" for i in range(50)]
+            input_path.write_text("".join(lines), encoding="utf-8")
+
+            for num_shards in [1, 3, 7, 50, 200]:
+                shards = split_shards(input_path, num_shards)
+                self.assertLessEqual(len(shards), num_shards)
+                self.assertEqual(shards[0].start, 0)
+                self.assertEqual(shards[-1].end, input_path.stat().st_size)
+
+                shard_lines = [
+                    line
+                    for shard in shards
+                    for line in iter_shard_lines(input_path, shard)
+                ]
+                self.assertEqual(shard_lines, lines)
+
+    def test_resume_and_dedup(self):
+        """Test that only unfinished shards are processed again"""
+        args = get_args(["--language", "en-us", "--csv"])
+
+        with tempfile.TemporaryDirectory() as temp_dir_str:
+            temp_dir = Path(temp_dir_str)
+            input_path = temp_dir / "corpus.csv"
+            output_dir = temp_dir / "output"
+            input_path.write_text(
+                "a|Hello world\nb|This is a test\nc|Hello world\nd|Goodbye\n",
+                encoding="utf-8",
+            )
+
+            def run(**kwargs):
+                with contextlib.redirect_stderr(io.StringIO()):
+                    return run_corpus(
+                        input_path, output_dir, args, num_shards=2, **kwargs
+                    )
+
+            self.assertEqual(run(), 0)
+
+            manifest_path = output_dir / MANIFEST_NAME
+            manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+            self.assertEqual(len(manifest["shards"]), 2)
+            self.assertTrue(
+                all(s["status"] == ShardStatus.DONE for s in manifest["shards"])
+            )
+
+            # Duplicate text is only processed once
+            self.assertEqual(
+                (output_dir / DUPLICATES_NAME).read_text(encoding="utf-8"), "2\tc\ta\n"
+            )
+
+            output_paths = sorted(output_dir.glob("shard-*.csv"))
+            rows = [
+                row.split("|")[0]
+                for output_path in output_paths
+                for row in output_path.read_text(encoding="utf-8").splitlines()
+            ]
+            self.assertEqual(rows, ["a", "b", "d"])
+
+            # Simulate a job interrupted during the second shard
+            expected_output = output_paths[1].read_text(encoding="utf-8")
+            output_paths[1].unlink()
+            manifest["shards"][1]["status"] = ShardStatus.PENDING
+            manifest_path.write_text(json.dumps(manifest), encoding="utf-8")
+            first_mtime = output_paths[0].stat().st_mtime_ns
+
+            self.assertEqual(run(), 0)
+            self.assertEqual(
+                output_paths[1].read_text(encoding="utf-8"), expected_output
+            )
+            self.assertEqual(output_paths[0].stat().st_mtime_ns, first_mtime)
+
+            # Different settings require a restart
+            with self.assertRaises(ValueError):
+                with contextlib.redirect_stderr(io.StringIO()):
+                    run_corpus(
+                        input_path,
+                        output_dir,
+                        get_args(["--language", "en-us", "--csv", "--no-pos"]),
+                    )
+
+    def test_malformed_csv(self):
+        """Test that empty CSV rows are skipped and malformed rows are errors"""
+        with tempfile.TemporaryDirectory() as temp_dir_str:
+            temp_dir = Path(temp_dir_str)
+            input_path = temp_dir / "corpus.csv"
+            output_dir = temp_dir / "output"
+
+            def run(input_text, *extra_args):
+                input_path.write_text(input_text, encoding="utf-8")
+                args = get_args(["--language", "en-us", "--csv", *extra_args])
+                with contextlib.redirect_stderr(io.StringIO()):
+                    return run_corpus(
+                        input_path, output_dir, args, num_shards=2, restart=True
+                    )
+
+            def output_ids():
+                return [
+                    row.split("|")[0]
+                    for output_path in sorted(output_dir.glob("shard-*.csv"))
+                    for row in output_path.read_text(encoding="utf-8").splitlines()
+                ]
+
+            # Blank lines are skipped
+            self.assertEqual(run("a|Hello world\n\nb|Goodbye\n\n"), 0)
+            self.assertEqual(output_ids(), ["a", "b"])
+
+            # Row without a delimiter
+            bad_text = "a|Hello world\n\nno delimiter\nb|Goodbye\n"
+            with self.assertRaises(ValueError):
+                run(bad_text)
+
+            self.assertEqual(run(bad_text, "--no-fail"), 0)
+            self.assertEqual(output_ids(), ["a", "b"])
+
+            manifest = json.loads(
+                (output_dir / MANIFEST_NAME).read_text(encoding="utf-8")
+            )
+            self.assertEqual(sum(s["num_errors"] for s in manifest["shards"]), 1)
+
+
+# -----------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    unittest.main()
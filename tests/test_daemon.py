@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""Tests for gruut --daemon"""
+import io
+import os
+import stat
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import gruut.__main__ as gruut_main
+from gruut.daemon import DaemonServer, forward_to_daemon, is_trusted_socket
+
+
+class DaemonTestCase(unittest.TestCase):
+    """Test cases for gruut --daemon"""
+
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.socket_path = Path(temp_dir.name) / "gruut.sock"
+
+    def start_daemon(self) -> DaemonServer:
+        """Serve commands on a temporary socket"""
+        server = DaemonServer(self.socket_path)
+        server_thread = threading.Thread(target=server.serve_forever, daemon=True)
+        server_thread.start()
+
+        def stop_daemon():
+            server.shutdown()
+            server.server_close()
+
+        self.addCleanup(stop_daemon)
+
+        return server
+
+    def forward(self, argv, stdin_text=""):
+        """Run command in daemon and return (exit code, stdout, stderr)"""
+        stdout = io.BytesIO()
+        stderr = io.BytesIO()
+        exit_code = forward_to_daemon(
+            argv,
+            socket_path=self.socket_path,
+            stdin=io.BytesIO(stdin_text.encode()),
+            stdout=stdout,
+            stderr=stderr,
+        )
+
+        return exit_code, stdout.getvalue().decode(), stderr.getvalue().decode()
+
+    def test_forward(self):
+        """Test that daemon output matches local output"""
+        self.assertIsNone(self.forward(["-l", "en-us"])[0])
+
+        server = self.start_daemon()
+        argv = ["-l", "en-us", "--no-lexicon", "--csv"]
+        stdin_text = "1|This is a test.\n2|It costs $5.\n"
+
+        for _ in range(2):
+            exit_code, stdout_text, _ = self.forward(argv, stdin_text)
+            self.assertEqual(exit_code, 0)
+
+        # Processor is reused
+        self.assertEqual(len(server.text_processors), 1)
+
+        args = gruut_main.get_args(argv)
+        local_stdout = io.StringIO()
+        gruut_main.write_output(
+            args,
+            gruut_main.make_text_processor(args),
+            gruut_main.read_lines(args, io.StringIO(stdin_text)),
+            local_stdout,
+        )
+
+        self.assertEqual(stdout_text, local_stdout.getvalue())
+
+    def test_errors(self):
+        """Test exit code and error messages from daemon"""
+        self.start_daemon()
+
+        exit_code, _, stderr_text = self.forward(
+            ["-l", "en-us", "--ssml", "--stdin-format", "lines"], "<speak>\n"
+        )
+        self.assertEqual(exit_code, 1)
+        self.assertIn("<speak>", stderr_text)
+
+        exit_code, stdout_text, _ = self.forward(
+            ["-l", "en-us", "--ssml", "--no-fail", "--stdin-format", "lines"],
+            "<speak>\n<speak>Test</speak>\n",
+        )
+        self.assertEqual(exit_code, 0)
+        self.assertIn('"text": "Test"', stdout_text)
+
+    def test_untrusted_socket(self):
+        """Test that sockets other users could have made are not used"""
+        argv = ["-l", "en-us", "--no-lexicon"]
+
+        # Not a socket
+        self.socket_path.write_text("", encoding="utf-8")
+        self.assertFalse(is_trusted_socket(self.socket_path))
+        self.assertIsNone(self.forward(argv)[0])
+        self.socket_path.unlink()
+
+        # Only accessible to this user after binding
+        self.start_daemon()
+        self.assertFalse(
+            self.socket_path.stat().st_mode & (stat.S_IRWXG | stat.S_IRWXO)
+        )
+        self.assertTrue(is_trusted_socket(self.socket_path))
+
+        # Owned by another user
+        with mock.patch("os.getuid", return_value=os.getuid() + 1):
+            self.assertIsNone(self.forward(argv)[0])
+
+        # Accessible to other users
+        os.chmod(self.socket_path, 0o666)
+        self.assertIsNone(self.forward(argv)[0])
+
+        os.chmod(self.socket_path, 0o600)
+        self.assertEqual(self.forward(argv)[0], 0)
+
+
+# -----------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""Tests for PhonetisaurusGraph class"""
+import importlib.util
+import random
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from gruut.g2p_phonetisaurus import PhonetisaurusGraph
+from gruut.lang import DelayedPhonetisaurusGraph, get_settings
+
+_DIR = Path(__file__).parent
+
+# from_node to_node ilabel olabel [weight]
+# final_node [weight]
+TEST_FST = """
+0 1 a A 0.5
+0 1 a E 1.0
+0 2 a|b X 0.4
+1 2 b B 0.1
+1 3 <eps> <eps> 2.0
+3 2 b|b B|B 0.2
+2 0.0
+"""
+
+
+def load_fst2npy():
+    """Load bin/fst2npy.py as a module"""
+    spec = importlib.util.spec_from_file_location(
+        "fst2npy", _DIR.parent / "bin" / "fst2npy.py"
+    )
+    fst2npy = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(fst2npy)  # type: ignore
+
+    return fst2npy
+
+
+class PhonetisaurusGraphTestCase(unittest.TestCase):
+    """Test cases for PhonetisaurusGraph class"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.temp_dir = tempfile.TemporaryDirectory()
+        temp_path = Path(cls.temp_dir.name)
+
+        fst_path = temp_path / "g2p.fst.txt"
+        fst_path.write_text(TEST_FST, encoding="utf-8")
+
+        cls.graph_path = temp_path / "graph.npz"
+        graph = load_fst2npy().fst2graph(fst_path)
+        with open(cls.graph_path, "wb") as graph_file:
+            np.savez(graph_file, **graph)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.temp_dir.cleanup()
+
+    def test_graph_arrays(self):
+        """Test CSR offsets and final probabilities"""
+        graph = PhonetisaurusGraph.load(self.graph_path)
+
+        # Memory-mapped by default
+        self.assertIsInstance(graph.edges, np.memmap)
+        self.assertEqual(graph.symbols[0], (1, ["a"]))
+
+        for node in range(4):
+            node_edges = graph.edges[
+                graph.edge_offsets[node] : graph.edge_offsets[node + 1]
+            ]
+            self.assertTrue(all(e[0] == node for e in node_edges))
+
+        self.assertEqual(
+            list(np.diff(graph.edge_offsets)),
+            [3, 2, 0, 1],
+        )
+        self.assertEqual(graph.node_final_probs[2], 0.0)
+        self.assertEqual(graph.node_final_probs[1], np.inf)
+
+    def test_g2p(self):
+        """Test guesses from memory-mapped and preloaded graphs"""
+        for preload in [False, True]:
+            graph = PhonetisaurusGraph.load(self.graph_path, preload=preload)
+            self.assertEqual(
+                list(graph.g2p_one("ab", max_guesses=3)),
+                [
+                    (["a", "b"], ["X"]),
+                    (["a", "b"], ["A", "B"]),
+                    (["a", "b"], ["E", "B"]),
+                ],
+            )
+
+            # Epsilon edge, then multi-grapheme edge
+            self.assertEqual(
+                list(graph.g2p_one("abb")), [(["a", "b", "b"], ["A", "B", "B"])]
+            )
+
+            # No path
+            self.assertEqual(list(graph.g2p_one("ba")), [(["b", "a"], [])])
+
+    def test_get_settings_engine(self):
+        """Test selecting Phonetisaurus graph as grapheme to phoneme engine"""
+        with tempfile.TemporaryDirectory() as lang_dir_str:
+            lang_dir = Path(lang_dir_str)
+            g2p_dir = lang_dir / "g2p"
+            g2p_dir.mkdir()
+            (g2p_dir / "graph.npz").write_bytes(self.graph_path.read_bytes())
+
+            for g2p_engine in ["fst", "auto"]:
+                settings = get_settings(
+                    "en-us",
+                    lang_dir=lang_dir,
+                    load_pos_tagger=False,
+                    load_phoneme_lexicon=False,
+                    g2p_engine=g2p_engine,
+                )
+                self.assertIsInstance(
+                    settings.guess_phonemes, DelayedPhonetisaurusGraph
+                )
+                self.assertEqual(settings.guess_phonemes("AB"), ["X"])
+                self.assertIsNone(settings.guess_phonemes("ba"))
+
+            # Graph is shared
+            self.assertIs(
+                DelayedPhonetisaurusGraph.load_graph(g2p_dir / "graph.npz"),
+                settings.guess_phonemes.graph,
+            )
+
+            # No CRF model in language directory
+            settings = get_settings(
+                "en-us",
+                lang_dir=lang_dir,
+                load_pos_tagger=False,
+                load_phoneme_lexicon=False,
+                g2p_engine="crf",
+            )
+            self.assertIsNone(settings.guess_phonemes)
+
+            with self.assertRaises(ValueError):
+                get_settings("en-us", lang_dir=lang_dir, g2p_engine="hmm")
+
+    def test_search_matches_python(self):
+        """Test vectorized search against one-edge-at-a-time search"""
+        fst2npy = load_fst2npy()
+        temp_path = Path(self.temp_dir.name)
+        fst_path = temp_path / "random.fst.txt"
+
+        for seed in range(10):
+            rng = random.Random(seed)
+            fst_path.write_text(make_random_fst(rng), encoding="utf-8")
+            graph = PhonetisaurusGraph(fst2npy.fst2graph(fst_path))
+
+            for num_graphemes in range(1, 6):
+                word = [rng.choice("abcdz") for _ in range(num_graphemes)]
+                for beam, min_beam, max_guesses in [
+                    (5000, 100, 1),
+                    (3, 1, 3),
+                    (2, 2, 5),
+                    (1, 1, 1),
+                ]:
+                    search_args = {
+                        "beam": beam,
+                        "min_beam": min_beam,
+                        "max_guesses": max_guesses,
+                    }
+                    self.assertEqual(
+                        graph._search(word, **search_args),
+                        graph._search_python(word, **search_args),
+                        (seed, word, search_args),
+                    )
+
+    def test_batch_matches_words(self):
+        """Test batch search with shared prefixes against word-by-word search"""
+        fst2npy = load_fst2npy()
+        temp_path = Path(self.temp_dir.name)
+        fst_path = temp_path / "random.fst.txt"
+
+        for seed in range(10):
+            rng = random.Random(seed)
+            fst_path.write_text(make_random_fst(rng), encoding="utf-8")
+            graph = PhonetisaurusGraph(fst2npy.fst2graph(fst_path))
+
+            # Words with common prefixes, duplicates, and an empty word
+            prefixes = ["".join(rng.choice("abcd") for _ in range(n)) for n in range(5)]
+            words = [
+                rng.choice(prefixes)
+                + "".join(rng.choice("abcdz") for _ in range(rng.randint(0, 3)))
+                for _ in range(30)
+            ]
+            words.extend(words[:3])
+
+            for beam, min_beam, max_guesses in [(5000, 100, 2), (3, 1, 3), (1, 1, 1)]:
+                g2p_args = {
+                    "beam": beam,
+                    "min_beam": min_beam,
+                    "max_guesses": max_guesses,
+                }
+                self.assertEqual(
+                    list(graph.g2p_batch(words, batch_size=7, **g2p_args)),
+                    list(graph.g2p(words, **g2p_args)),
+                    (seed, g2p_args),
+                )
+
+
+def make_random_fst(rng: random.Random, letters: str = "abcd") -> str:
+    """Create a random text FST with multi-grapheme and eps edges"""
+    lines = []
+    num_nodes = rng.randint(3, 12)
+
+    for from_node in range(num_nodes):
+        for _ in range(rng.randint(1, 6)):
+            to_node = rng.randrange(1, num_nodes)
+            label_type = rng.random()
+            if (label_type < 0.15) and (to_node > from_node):
+                # No eps cycles
+                ilabel, olabel = "<eps>", "<eps>"
+            elif label_type < 0.35:
+                ilabel = "|".join(rng.choice(letters) for _ in range(2))
+                olabel = "|".join(rng.choice("PQR") for _ in range(2))
+            else:
+                ilabel = rng.choice(letters)
+                olabel = rng.choice(["P", "Q", "R", "_"])
+
+            # Include repeated weights to check tie-breaking
+            weight = rng.choice([0.5, 1.0, 1.5, round(rng.random() * 3, 3)])
+            lines.append(f"{from_node} {to_node} {ilabel} {olabel} {weight}")
+
+    for final_node in rng.sample(range(1, num_nodes), max(1, num_nodes // 3)):
+        weight = rng.choice([0.0, 0.5, round(rng.random(), 3)])
+        lines.append(f"{final_node} {weight}")
+
+    return "\n".join(lines)
+
+
+# -----------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    unittest.main()
@@ -5,51 +5,57 @@ https://github.com/diasks2/pragmatic_segmenter#the-golden-rules
 """
 import unittest
 
-from gruut import sentences
+from gruut import segment, sentences
 
 
 class GoldenRulesTestCase(unittest.TestCase):
     """Test golden rules of sentence segmentation"""
 
+    def get_sentences(self, text):
+        """Get sentence texts with the full pipeline"""
+        return _get_sentences(text)
+
     def test_rule_1(self):
         """Simple period to end sentence"""
         self.assertEqual(
-            _get_sentences("Hello World. My name is Jonas."),
+            self.get_sentences("Hello World. My name is Jonas."),
             ["Hello World.", "My name is Jonas."],
         )
 
     def test_rule_2(self):
         """Question mark to end sentence"""
         self.assertEqual(
-            _get_sentences("What is your name? My name is Jonas."),
+            self.get_sentences("What is your name? My name is Jonas."),
             ["What is your name?", "My name is Jonas."],
         )
 
     def test_rule_3(self):
         """Exclamation point to end sentence"""
         self.assertEqual(
-            _get_sentences("There it is! I found it."), ["There it is!", "I found it."],
+            self.get_sentences("There it is! I found it."),
+            ["There it is!", "I found it."],
         )
 
     def test_rule_4(self):
         """One letter upper case abbreviations"""
         # NOTE: gruut removes the "." from E
         self.assertEqual(
-            _get_sentences("My name is Jonas E. Smith."), ["My name is Jonas E Smith."],
+            self.get_sentences("My name is Jonas E. Smith."),
+            ["My name is Jonas E Smith."],
         )
 
     def test_rule_5(self):
         """One letter lower case abbreviations"""
         # NOTE: gruut removes the "." from p
         self.assertEqual(
-            _get_sentences("Please turn to p. 55."), ["Please turn to p 55."],
+            self.get_sentences("Please turn to p. 55."), ["Please turn to p 55."],
         )
 
     def test_rule_6(self):
         """Two letter lower case abbreviations in the middle of a sentence"""
         # NOTE: gruut expands abbreviations
         self.assertEqual(
-            _get_sentences("Were Jane and co. at the party?"),
+            self.get_sentences("Were Jane and co. at the party?"),
             ["Were Jane and company at the party?"],
         )
 
@@ -57,7 +63,7 @@ class GoldenRulesTestCase(unittest.TestCase):
         """Two letter upper case abbreviations in the middle of a sentence"""
         # NOTE: gruut expands abbreviations
         self.assertEqual(
-            _get_sentences("They closed the deal with Pitt, Briggs & Co. at noon."),
+            self.get_sentences("They closed the deal with Pitt, Briggs & Co. at noon."),
             ["They closed the deal with Pitt, Briggs and Company at noon."],
         )
 
@@ -79,7 +85,7 @@ class GoldenRulesTestCase(unittest.TestCase):
         """Two letter (prepositive) abbreviations"""
         # NOTE: gruut expands abbreviations
         self.assertEqual(
-            _get_sentences("I can see Mt. Fuji from here."),
+            self.get_sentences("I can see Mt. Fuji from here."),
             ["I can see Mount Fuji from here."],
         )
 
@@ -94,14 +100,15 @@ class GoldenRulesTestCase(unittest.TestCase):
         """Possesive two letter abbreviations"""
         # NOTE: gruut expands abbreviations
         self.assertEqual(
-            _get_sentences("That is JFK Jr.'s book."), ["That is J F K Junior's book."],
+            self.get_sentences("That is JFK Jr.'s book."),
+            ["That is J F K Junior's book."],
         )
 
     def test_rule_13(self):
         """Multi-period abbreviations in the middle of a sentence"""
         # NOTE: gruut expands abbreviations
         self.assertEqual(
-            _get_sentences("I visited the U.S.A. last year."),
+            self.get_sentences("I visited the U.S.A. last year."),
             ["I visited the U S A last year."],
         )
 
@@ -121,7 +128,7 @@ class GoldenRulesTestCase(unittest.TestCase):
         """U.S. as non sentence boundary"""
         # NOTE: gruut expands abbreviations
         self.assertEqual(
-            _get_sentences("I have lived in the U.S. for 20 years."),
+            self.get_sentences("I have lived in the U.S. for 20 years."),
             ["I have lived in the U S for 20 years."],
         )
 
@@ -132,7 +139,7 @@ class GoldenRulesTestCase(unittest.TestCase):
     def test_rule_19(self):
         """Number as non sentence boundary"""
         self.assertEqual(
-            _get_sentences("She has $100.00 in her bag."),
+            self.get_sentences("She has $100.00 in her bag."),
             ["She has $100.00 in her bag."],
         )
 
@@ -163,26 +170,26 @@ class GoldenRulesTestCase(unittest.TestCase):
     def test_rule_27(self):
         """Double punctuation (exclamation point)"""
         self.assertEqual(
-            _get_sentences("Hello!! Long time no see."),
+            self.get_sentences("Hello!! Long time no see."),
             ["Hello!!", "Long time no see."],
         )
 
     def test_rule_28(self):
         """Double punctuation (question mark)"""
         self.assertEqual(
-            _get_sentences("Hello?? Who is there?"), ["Hello??", "Who is there?"],
+            self.get_sentences("Hello?? Who is there?"), ["Hello??", "Who is there?"],
         )
 
     def test_rule_29(self):
         """Double punctuation (exclamation point / question mark)"""
         self.assertEqual(
-            _get_sentences("Hello!? Is that you?"), ["Hello!?", "Is that you?"],
+            self.get_sentences("Hello!? Is that you?"), ["Hello!?", "Is that you?"],
         )
 
     def test_rule_30(self):
         """Double punctuation (question mark / exclamation point)"""
         self.assertEqual(
-            _get_sentences("Hello?! Is that you?"), ["Hello?!", "Is that you?"],
+            self.get_sentences("Hello?! Is that you?"), ["Hello?!", "Is that you?"],
         )
 
     # 31) List (period followed by parens and no period to end item)
@@ -224,14 +231,16 @@ class GoldenRulesTestCase(unittest.TestCase):
     def test_rule_40(self):
         """Errant newlines in the middle of sentences (PDF)"""
         self.assertEqual(
-            _get_sentences("This is a sentence\ncut off in the middle because pdf."),
+            self.get_sentences(
+                "This is a sentence\ncut off in the middle because pdf."
+            ),
             ["This is a sentence cut off in the middle because pdf."],
         )
 
     def test_rule_41(self):
         """Errant newlines in the middle of sentences"""
         self.assertEqual(
-            _get_sentences("It was a cold \nnight in the city."),
+            self.get_sentences("It was a cold \nnight in the city."),
             ["It was a cold night in the city."],
         )
 
@@ -290,6 +299,18 @@ def _get_sentences(text):
     ]
 
 
+def _segment_sentences(text):
+    return [s.text for s in segment(text)]
+
+
+class SegmentGoldenRulesTestCase(GoldenRulesTestCase):
+    """Test golden rules of sentence segmentation (segmentation only)"""
+
+    def get_sentences(self, text):
+        """Get sentence texts without numbers, dates, lexicon, etc."""
+        return _segment_sentences(text)
+
+
 # -----------------------------------------------------------------------------
 
 if __name__ == "__main__":
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""Tests for import time of gruut"""
+import json
+import subprocess
+import sys
+import unittest
+
+# Budget for "import gruut" (seconds, number of new modules)
+IMPORT_SECONDS_BUDGET = 0.5
+IMPORT_MODULES_BUDGET = 150
+
+# Dependencies that should only be imported on first use
+HEAVY_MODULES = [
+    "asyncio",
+    "babel",
+    "dateparser",
+    "gruut_ipa",
+    "networkx",
+    "num2words",
+    "numpy",
+    "pycrfsuite",
+]
+
+IMPORT_SCRIPT = """
+import json, sys, time
+
+before_modules = set(sys.modules)
+start_time = time.perf_counter()
+
+import gruut
+
+seconds = time.perf_counter() - start_time
+
+def loaded(modules):
+    return [m for m in modules if m in sys.modules]
+
+heavy_modules = json.loads(sys.argv[1])
+result = {
+    "seconds": seconds,
+    "num_modules": len(set(sys.modules) - before_modules),
+    "import": loaded(heavy_modules),
+}
+
+import sqlite3
+
+sqlite_connects = []
+sqlite_connect = sqlite3.connect
+
+def record_connect(*args, **kwargs):
+    sqlite_connects.append(str(args[0]))
+    return sqlite_connect(*args, **kwargs)
+
+sqlite3.connect = record_connect
+list(gruut.segment("On 4/1/2020, Dr. Smith paid $5.00 for 10 cats. Really?"))
+result["segment"] = loaded(heavy_modules)
+result["segment_sqlite"] = sqlite_connects
+sqlite3.connect = sqlite_connect
+
+list(gruut.sentences("Hello world.", phonemes=False))
+result["no_numbers"] = loaded(["dateparser", "num2words"])
+
+list(gruut.sentences("I have 5 cats.", phonemes=False))
+result["numbers"] = loaded(["num2words"])
+
+print(json.dumps(result))
+"""
+
+
+def run_import_script():
+    """Import gruut in a fresh interpreter"""
+    output = subprocess.check_output(
+        [sys.executable, "-c", IMPORT_SCRIPT, json.dumps(HEAVY_MODULES)],
+        universal_newlines=True,
+    )
+
+    return json.loads(output.strip().splitlines()[-1])
+
+
+class ImportTestCase(unittest.TestCase):
+    """Test cases for import time"""
+
+    def test_import_budget(self):
+        """Test that importing gruut is fast and doesn't load heavy dependencies"""
+        results = [run_import_script() for _ in range(3)]
+        result = results[0]
+
+        self.assertEqual(result["import"], [])
+        self.assertLessEqual(result["num_modules"], IMPORT_MODULES_BUDGET)
+
+        # Fastest run, to tolerate a busy machine
+        self.assertLessEqual(min(r["seconds"] for r in results), IMPORT_SECONDS_BUDGET)
+
+    def test_segment(self):
+        """Test that segmentation never loads models or number/date parsers"""
+        result = run_import_script()
+
+        self.assertEqual(result["segment"], [])
+        self.assertEqual(result["segment_sqlite"], [])
+
+    def test_loaded_on_first_use(self):
+        """Test that dateparser and num2words wait for text that needs them"""
+        result = run_import_script()
+
+        self.assertEqual(result["no_numbers"], [])
+        self.assertEqual(result["numbers"], ["num2words"])
+
+
+# -----------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    unittest.main()
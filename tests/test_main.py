@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""Tests for command-line interface"""
+import contextlib
+import io
+import multiprocessing
+import sys
+import unittest
+from unittest.mock import patch
+
+import gruut.__main__ as gruut_main
+
+
+def get_args(*argv):
+    """Parse gruut command-line arguments"""
+    with patch.object(sys, "argv", ["gruut", *argv]):
+        return gruut_main.get_args()
+
+
+class MainTestCase(unittest.TestCase):
+    """Test cases for command-line interface"""
+
+    def test_process_parallel(self):
+        """Test that parallel output is in input order and matches serial output"""
+        args = get_args("--language", "en-us", "--workers", "2", "--chunk-size", "2")
+        texts = [f"This is test number {i}." for i in range(7)]
+
+        text_processor = gruut_main.make_text_processor(args)
+        expected_sentences = [
+            gruut_main.process_text(text_processor, text, args) for text in texts
+        ]
+
+        with contextlib.redirect_stderr(io.StringIO()) as stderr:
+            results = list(
+                gruut_main.process_parallel(
+                    ((text, i) for i, text in enumerate(texts)), args
+                )
+            )
+
+        self.assertEqual([r[0] for r in results], texts)
+        self.assertEqual([r[1] for r in results], list(range(len(texts))))
+        self.assertEqual([r[2] for r in results], expected_sentences)
+        self.assertTrue(all(r[3] is None for r in results))
+
+        # Throughput
+        self.assertIn("7 line(s)", stderr.getvalue())
+
+    def test_process_chunk_errors(self):
+        """Test that errors are caught for each line"""
+        args = get_args("--language", "en-us")
+        gruut_main._init_worker(args)
+
+        real_process_text = gruut_main.process_text
+
+        def process_text(text_processor, text, args):
+            if text == "fail":
+                raise ValueError(text)
+
+            return real_process_text(text_processor, text, args)
+
+        with patch.object(gruut_main, "process_text", process_text):
+            results = gruut_main._process_chunk(["first", "fail", "last"])
+
+        self.assertEqual(len(results), 3)
+        self.assertEqual(results[0][0][0].text, "first")
+        self.assertIsNone(results[1][0])
+        self.assertIn("ValueError: fail", results[1][1])
+        self.assertEqual(results[2][0][0].text, "last")
+
+    @unittest.skipUnless(
+        multiprocessing.get_start_method() == "fork", "requires fork start method"
+    )
+    def test_parallel_errors(self):
+        """Test that errors in worker processes are returned in order"""
+        args = get_args("--language", "en-us", "--workers", "2", "--chunk-size", "1")
+        texts = ["first", "fail", "last"]
+
+        def process_text(text_processor, text, args):
+            if text == "fail":
+                raise ValueError(text)
+
+            return []
+
+        # Workers are forked with the patched function
+        with patch.object(gruut_main, "process_text", process_text):
+            with contextlib.redirect_stderr(io.StringIO()):
+                results = list(
+                    gruut_main.process_parallel(((t, None) for t in texts), args)
+                )
+
+        self.assertEqual([r[0] for r in results], texts)
+        self.assertEqual([r[3] is not None for r in results], [False, True, False])
+
+
+# -----------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,7 +3,9 @@
 import copy
 import unittest
 
+from gruut.lang import DelayedPartOfSpeechTagger
 from gruut.pos import PartOfSpeechTagger
+from gruut.utils import LRUCache
 
 
 class PartOfSpeechTaggerTestCase(unittest.TestCase):
@@ -82,6 +84,66 @@ class PartOfSpeechTaggerTestCase(unittest.TestCase):
 
         self.assertEqual(expected_features, actual_features)
 
+    def test_sentence_features_match_word_features(self):
+        """Test that shared sentence features match per-word features"""
+        sentence = (
+            "The 2 quick brown foxes , «jumped» over the lazy dog ' s 3rd bed ."
+        ).split()
+
+        for kwargs in [{}, {"words_backward": 1, "words_forward": 3, "encode": False}]:
+            expected_features = [
+                PartOfSpeechTagger.word2features(sentence, i, **kwargs)
+                for i in range(len(sentence))
+            ]
+            actual_features = PartOfSpeechTagger.sent2features(sentence, **kwargs)
+
+            self.assertEqual(expected_features, actual_features)
+
+            # Key order is also preserved
+            self.assertEqual(
+                [list(f.keys()) for f in expected_features],
+                [list(f.keys()) for f in actual_features],
+            )
+
+        self.assertEqual(PartOfSpeechTagger.sent2features([]), [])
+
+    def test_sentence_cache(self):
+        """Test caching of tags for repeated sentences"""
+        tagged_sentences = []
+
+        def fake_tagger(words):
+            tagged_sentences.append(list(words))
+            return [f"TAG{len(w)}" for w in words]
+
+        cache = LRUCache(max_size=2)
+        tagger = DelayedPartOfSpeechTagger("model.crf", lang="en-us", cache=cache)
+        tagger.tagger = fake_tagger
+
+        sentence = ["Press", "one", "to", "continue"]
+        expected_tags = ["TAG5", "TAG3", "TAG2", "TAG8"]
+        for _ in range(3):
+            self.assertEqual(list(tagger(sentence)), expected_tags)
+
+        # Only tagged once
+        self.assertEqual(tagged_sentences, [sentence])
+
+        stats = tagger.cache_stats()
+        self.assertEqual(stats["hits"], 2)
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["size"], 1)
+
+        # Same words, different language
+        other_tagger = DelayedPartOfSpeechTagger("model.crf", lang="fr-fr", cache=cache)
+        other_tagger.tagger = fake_tagger
+        other_tagger(sentence)
+        self.assertEqual(len(tagged_sentences), 2)
+
+        # Least recently used sentence is evicted
+        tagger(["Goodbye"])
+        tagger(sentence)
+        self.assertEqual(len(tagged_sentences), 4)
+        self.assertEqual(len(cache), 2)
+
 
 # -----------------------------------------------------------------------------
 
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""Tests for Profiler class"""
+import contextlib
+import io
+import tempfile
+import typing
+import unittest
+from pathlib import Path
+
+from gruut.profiling import Profiler, collapsed_stacks, hottest_functions
+from gruut.text_processor import TextProcessor
+
+
+class ProfilerTestCase(unittest.TestCase):
+    """Test cases for Profiler class"""
+
+    def test_profile(self):
+        """Test pstats, collapsed stacks, and summary"""
+        with tempfile.TemporaryDirectory() as temp_dir_str:
+            temp_dir = Path(temp_dir_str)
+            pstats_path = temp_dir / "gruut.pstats"
+            collapsed_path = temp_dir / "gruut.collapsed"
+
+            profiler = Profiler(
+                pstats_path=pstats_path,
+                collapsed_path=collapsed_path,
+                trace_memory=True,
+            )
+            processor = TextProcessor(
+                default_lang="en_US",
+                on_stage_timing=profiler,
+                guess_phonemes=lambda word, role=None: list(word),
+            )
+
+            with contextlib.redirect_stderr(io.StringIO()), profiler:
+                for _ in range(3):
+                    graph, root = processor("It costs $5. This is a test.")
+                    list(processor.sentences(graph, root))
+
+            self.assertGreater(pstats_path.stat().st_size, 0)
+
+            # frame;frame;frame microseconds
+            collapsed_lines = collapsed_path.read_text(encoding="utf-8").splitlines()
+            self.assertTrue(collapsed_lines)
+            for line in collapsed_lines:
+                stack, micros = line.rsplit(" ", maxsplit=1)
+                self.assertTrue(stack)
+                self.assertGreater(int(micros), 0)
+
+            self.assertTrue(
+                any("text_processor.py" in line for line in collapsed_lines)
+            )
+
+            # Memory was traced at each stage
+            self.assertIn("break_sentences", profiler.stage_memory)
+            self.assertIsNotNone(profiler.memory_snapshot)
+
+            stats = profiler.get_stats()
+            summary = io.StringIO()
+            profiler.print_summary(file=summary)
+            self.assertIn("text_processor.py", summary.getvalue())
+
+            # Profiler's own functions are excluded
+            hot_funcs = [row["function"] for row in hottest_functions(stats)]
+            self.assertFalse(any("profiling.py" in f for f in hot_funcs))
+
+    def test_collapsed_stacks(self):
+        """Test splitting time across callers"""
+        profiler = Profiler()
+        with contextlib.redirect_stderr(io.StringIO()):
+            with profiler:
+                outer_func()
+
+        stacks = collapsed_stacks(profiler.get_stats())
+        stack_micros: typing.Dict[str, int] = {}
+        for stack, micros in stacks.items():
+            funcs = tuple(f.split(":")[-1] for f in stack.split(";"))
+            if funcs[-1] == "leaf_func":
+                stack_micros[funcs] = micros
+
+        # Called from two places
+        self.assertEqual(
+            set(stack_micros),
+            {("outer_func", "leaf_func"), ("outer_func", "middle_func", "leaf_func")},
+        )
+
+        # Stacks account for (almost) all of the profiled time
+        stats = profiler.get_stats()
+        self.assertAlmostEqual(
+            sum(stacks.values()) / 1e6, stats.total_tt, delta=0.1 * stats.total_tt
+        )
+
+
+def outer_func():
+    """Calls leaf_func directly and through middle_func"""
+    for _ in range(20):
+        leaf_func()
+        middle_func()
+
+
+def middle_func():
+    """Calls leaf_func"""
+    leaf_func()
+
+
+def leaf_func():
+    """Does some work"""
+    return sum(i * i for i in range(5000))
+
+
+# -----------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""Tests for HTTP server"""
+import concurrent.futures
+import json
+import threading
+import time
+import unittest
+import urllib.error
+import urllib.request
+
+from gruut.server import GruutHTTPServer, MicroBatcher, SentencesRequest
+from gruut.text_processor import TextProcessor
+
+
+class ServerTestCase(unittest.TestCase):
+    """Test cases for HTTP server"""
+
+    def start_server(self, **batcher_args) -> str:
+        """Start server on a free port and return its URL"""
+        batcher = MicroBatcher(TextProcessor(default_lang="en_US"), **batcher_args)
+        http_server = GruutHTTPServer(
+            ("127.0.0.1", 0), batcher, default_options={"phonemize": False}
+        )
+        self.batcher = batcher
+
+        server_thread = threading.Thread(target=http_server.serve_forever, daemon=True)
+        server_thread.start()
+
+        def stop_server():
+            http_server.shutdown()
+            http_server.server_close()
+            batcher.close()
+
+        self.addCleanup(stop_server)
+
+        return "http://{}:{}".format(*http_server.server_address[:2])
+
+    def post(self, url: str, request_dict):
+        """POST JSON and return (status, response JSON)"""
+        http_request = urllib.request.Request(
+            url, data=json.dumps(request_dict).encode(), method="POST"
+        )
+        try:
+            with urllib.request.urlopen(http_request) as response:
+                return response.status, json.load(response)
+        except urllib.error.HTTPError as e:
+            return e.code, json.load(e)
+
+    def test_sentences(self):
+        """Test concurrent requests, batching, and metrics"""
+        url = self.start_server(batch_window=0.2, max_workers=2)
+        texts = [f"Test number {n}." for n in ["one", "two", "three", "four"]] * 2
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=len(texts)) as pool:
+            responses = list(
+                pool.map(
+                    lambda text: self.post(
+                        url + "/sentences", {"text": text, "punctuations": False}
+                    ),
+                    texts,
+                )
+            )
+
+        for text, (status, response) in zip(texts, responses):
+            self.assertEqual(status, 200)
+            self.assertEqual(
+                [w["text"] for w in response["sentences"][0]["words"]],
+                text.rstrip(".").split() + ["."],
+            )
+
+        stats = self.batcher.stats()
+        self.assertEqual(stats["requests"], len(texts))
+        self.assertLess(stats["batches"], len(texts))
+        self.assertGreater(stats["deduplicated_requests"], 0)
+
+        with urllib.request.urlopen(url + "/metrics") as response:
+            metrics_lines = response.read().decode().splitlines()
+
+        self.assertIn(f"gruut_server_requests_total {len(texts)}", metrics_lines)
+        self.assertIn("gruut_documents_total", "\n".join(metrics_lines))
+        self.assertIn("# TYPE gruut_server_queue_size gauge", metrics_lines)
+
+    def test_errors(self):
+        """Test bad requests and timeouts"""
+        url = self.start_server(batch_window=0.5)
+
+        status, response = self.post(url + "/sentences", {"text": "a", "color": True})
+        self.assertEqual(status, 400)
+        self.assertIn("color", response["error"])
+
+        status, _ = self.post(url + "/sentences", ["a"])
+        self.assertEqual(status, 400)
+
+        status, _ = self.post(url + "/missing", {"text": "a"})
+        self.assertEqual(status, 404)
+
+        # Times out before the batch starts, so it's never processed
+        status, _ = self.post(url + "/sentences", {"text": "a", "timeout": 0.1})
+        self.assertEqual(status, 504)
+        self.batcher.close()
+        self.assertEqual(self.batcher.text_processor.stats()["documents"], 0)
+
+    def test_parallel_requests(self):
+        """Test that distinct requests in a batch don't wait for each other"""
+        processor = BlockingProcessor()
+        batcher = MicroBatcher(processor, max_workers=2, batch_window=0.2)
+        self.addCleanup(batcher.close)
+
+        futures = [batcher.submit(SentencesRequest(text=t)) for t in ["a", "b", "a"]]
+
+        # Both distinct requests are running at the same time
+        self.assertTrue(processor.wait_started(2))
+        processor.release.set()
+
+        self.assertEqual([f.result(timeout=5) for f in futures], [["a"], ["b"], ["a"]])
+        self.assertEqual(sorted(processor.texts), ["a", "b"])
+        self.assertEqual(batcher.stats()["deduplicated_requests"], 1)
+
+    def test_cancel_before_processing(self):
+        """Test that requests cancelled while waiting for a worker are skipped"""
+        processor = BlockingProcessor()
+        batcher = MicroBatcher(processor, max_workers=1, batch_window=0.2)
+        self.addCleanup(batcher.close)
+
+        future_a = batcher.submit(SentencesRequest(text="a"))
+        future_b = batcher.submit(SentencesRequest(text="b"))
+
+        # Same batch, but "b" waits for "a" to finish
+        self.assertTrue(processor.wait_started(1))
+        self.assertTrue(future_b.cancel())
+        processor.release.set()
+
+        self.assertEqual(future_a.result(timeout=5), ["a"])
+        batcher.close()
+        self.assertEqual(processor.texts, ["a"])
+
+
+class BlockingProcessor:
+    """Stands in for TextProcessor, blocking until released"""
+
+    def __init__(self):
+        self.texts = []
+        self.release = threading.Event()
+        self._lock = threading.Lock()
+
+    def __call__(self, text, **kwargs):
+        """Record text and wait"""
+        with self._lock:
+            self.texts.append(text)
+
+        self.release.wait(timeout=5)
+
+        return None, text
+
+    def sentences(self, graph, root, **kwargs):
+        """Text is the only sentence"""
+        return [root]
+
+    def wait_started(self, num_texts: int, timeout: float = 5) -> bool:
+        """Wait until num_texts calls have started"""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            with self._lock:
+                if len(self.texts) >= num_texts:
+                    return True
+
+            time.sleep(0.01)
+
+        return False
+
+
+# -----------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    unittest.main()
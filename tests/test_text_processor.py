@@ -1,10 +1,42 @@
 #!/usr/bin/env python3
 """Tests for TextProcessor"""
+import copy
+import dataclasses
+import itertools
+import pickle
+import re
+import sqlite3
 import sys
+import tempfile
 import unittest
-
+from datetime import datetime
+from pathlib import Path
+from unittest import mock
+
+from gruut.const import (
+    ABBREVIATION_GROUP_PREFIX,
+    DATA_PROP,
+    KNOWN_LANGS,
+    BreakNode,
+    BreakWordNode,
+    IgnoreNode,
+    MarkNode,
+    Node,
+    ParagraphNode,
+    PunctuationWordNode,
+    SentenceNode,
+    SpeakNode,
+    WordNode,
+    combine_regexes,
+)
+from gruut.lang import DelayedPartOfSpeechTagger, DelayedSqlitePhonemizer, get_settings
 from gruut.text_processor import Sentence, TextProcessor, TextProcessorSettings, Word
-from gruut.utils import print_graph
+from gruut.utils import (
+    LRUCache,
+    StageTimingAggregator,
+    print_graph,
+    stats_to_prometheus,
+)
 
 WORDS_KWARGS = {"explicit_lang": False, "phonemes": False, "pos": False}
 
@@ -688,6 +720,209 @@ class TextProcessorTestCase(unittest.TestCase):
             ],
         )
 
+    def test_date_shapes(self):
+        """Test date recognition before dateparser"""
+        processor = TextProcessor(default_lang="en_US")
+        shapes = processor.get_settings("en_US").date_shapes
+        assert shapes is not None
+
+        # Parsed directly (day/month order follows dateparser)
+        self.assertEqual(shapes("4/1/1999"), (True, datetime(1999, 4, 1)))
+        self.assertEqual(shapes("1999-04-01"), (True, datetime(1999, 4, 1)))
+        self.assertEqual(shapes("1-April-1999"), (True, datetime(1999, 4, 1)))
+
+        # Not dates
+        for text in ["1,000", "3.14", "$5", "2021", "10:30", "1.000.000"]:
+            self.assertEqual(shapes(text), (False, None), text)
+
+        # Left to dateparser (two digit year, invalid month)
+        self.assertEqual(shapes("4/1/99"), (True, None))
+        self.assertEqual(shapes("13/1/1999"), (True, None))
+
+        de_shapes = processor.get_settings("de_DE").date_shapes
+        assert de_shapes is not None
+        self.assertEqual(de_shapes("01.04.1999"), (True, datetime(1999, 4, 1)))
+
+        # Numbers never reach dateparser, and dates are memoized
+        for _ in range(2):
+            graph, root = processor("It cost $1,000 on 4/1/1999 and 13/1/1999")
+            list(processor.words(graph, root, **WORDS_KWARGS))
+
+        stats = processor.stats()
+        self.assertEqual(stats["date_shape_parses"], 1)
+        self.assertEqual(stats["dateparser_parses"], 1)
+
+    def test_date_cache_day(self):
+        """Test that dateparser results are not reused on a different day"""
+        processor = TextProcessor(default_lang="en_US")
+        settings = processor.get_settings("en_US")
+
+        def parse_dates(now):
+            with mock.patch("gruut.text_processor.datetime", wraps=datetime) as dt:
+                dt.now.return_value = now
+                for text in ["4/1/1999", "March 5"]:
+                    processor._parse_date(text, settings, strict=False, force=True)
+                    processor._parse_date(text, settings, strict=True, force=True)
+
+            return processor.stats()
+
+        stats = parse_dates(datetime(2030, 12, 31, 23, 0))
+        self.assertEqual(stats["date_shape_parses"], 1)
+        self.assertEqual(stats["dateparser_parses"], 3)
+
+        # Same day
+        stats = parse_dates(datetime(2030, 12, 31, 23, 30))
+        self.assertEqual(stats["date_shape_parses"], 1)
+        self.assertEqual(stats["dateparser_parses"], 3)
+
+        # Next day (shape-matched dates are absolute)
+        stats = parse_dates(datetime(2031, 1, 1, 0, 30))
+        self.assertEqual(stats["date_shape_parses"], 1)
+        self.assertEqual(stats["dateparser_parses"], 6)
+
+    def test_number_parser(self):
+        """Test locale number parser against babel for every shipped locale"""
+        import babel.numbers
+
+        texts = [
+            "1,000",
+            "1.000",
+            "1 000",
+            "1\u00a0000",
+            "1\u202f000",
+            "3,14",
+            "3.14",
+            "1,000.50",
+            "1.000,50",
+            "1,2,3",
+            "-5",
+            " +5 ",
+            ".5",
+            "5.",
+            ",",
+            "1_000",
+            "_1",
+            "1e5",
+            "1e",
+            "inf",
+            "NaN5",
+            "\u0663\u066b\u0661\u0664",
+            "12:30",
+            "4/1/1999",
+            "5%",
+            "10am",
+            "",
+        ]
+
+        for lang in sorted(KNOWN_LANGS):
+            settings = get_settings(lang)
+            parser = settings.number_parser
+            assert parser is not None
+
+            for text in texts:
+                try:
+                    expected = babel.numbers.parse_decimal(
+                        text, locale=settings.babel_locale
+                    )
+                except ValueError:
+                    expected = None
+
+                actual = parser(text)
+                self.assertEqual(str(actual), str(expected), (lang, text))
+
+            # Currency symbols are tried in order until the rest is a number
+            for symbol in settings.currency_symbols:
+                for text in [f"{symbol}5", f"{symbol}1,000.50", f"{symbol}abc"]:
+                    expected_currency = None
+                    for maybe_symbol in settings.currency_symbols:
+                        if text.startswith(maybe_symbol):
+                            number = parser(text[len(maybe_symbol) :])
+                            if number is not None:
+                                expected_currency = (maybe_symbol, number)
+                                break
+
+                    self.assertEqual(
+                        parser.parse_currency(text), expected_currency, (lang, text)
+                    )
+
+    def test_combine_regexes(self):
+        """Test combined patterns find the same rule as trying each in order"""
+        pattern = combine_regexes(
+            [r"^(?P<a>x)y$", r"^(?P<a>x)z?$", r"^q"], group_prefix="rule"
+        )
+        assert pattern is not None
+
+        # First matching alternative wins, with group names kept unique
+        match = pattern.match("xy")
+        assert match is not None
+        self.assertEqual(match.lastgroup, "rule0")
+        self.assertEqual(match.group("a__0"), "x")
+        self.assertEqual(pattern.match("x").lastgroup, "rule1")
+        self.assertIsNone(pattern.match("y"))
+
+        # Numbered back-references and mixed flags can't be combined
+        self.assertIsNone(combine_regexes([r"(a)\1", "b"]))
+        self.assertIsNotNone(combine_regexes([r"(a)\\1", "b"]))  # escaped backslash
+        self.assertIsNone(
+            combine_regexes([re.compile("a", re.IGNORECASE), re.compile("b")])
+        )
+
+        settings = get_settings("en_US")
+        assert settings.abbreviations_pattern is not None
+        abbreviations = list(settings.abbreviations.items())
+        for text in ["Dr. ", "dr.", "Mr.", "st.", "Street", "etc. ", "x"]:
+            expected = next(
+                (
+                    idx
+                    for idx, (abbr_pattern, _) in enumerate(abbreviations)
+                    if abbr_pattern.match(text)
+                ),
+                None,
+            )
+            match = settings.abbreviations_pattern.match(text)
+            actual = (
+                None
+                if match is None
+                else int(match.lastgroup[len(ABBREVIATION_GROUP_PREFIX) :])
+            )
+            self.assertEqual(actual, expected, text)
+
+    def test_segment(self):
+        """Test that segmentation without a graph matches the graph pipeline"""
+        texts = [
+            "",
+            "Hello world. Bye now, ok?",
+            "I visited the U.S.A. last year. That is JFK Jr.'s book.",
+            'He said "Hello." Then (quietly.) she left!',
+            "Were Jane and co. at the party? Yes!! It cost $5.00 on 4/1/2020.",
+            "Bye-bye ~~ now...   spaces   and\nnewlines",
+        ]
+
+        for keep_whitespace in (True, False):
+            processor = TextProcessor(
+                default_lang="en_US", keep_whitespace=keep_whitespace
+            )
+            for text in texts:
+                for sentences_args in [
+                    {},
+                    {"major_breaks": False, "minor_breaks": False},
+                    {"punctuations": False, "explicit_lang": False},
+                ]:
+                    graph, root = processor(
+                        text,
+                        pos=False,
+                        phonemize=False,
+                        detect_numbers=False,
+                        detect_currency=False,
+                        detect_dates=False,
+                        detect_times=False,
+                    )
+                    expected = processor.sentences(
+                        graph, root, phonemes=False, pos=False, **sentences_args
+                    )
+                    actual = processor.segment(text, **sentences_args)
+                    self.assertEqual(actual, expected, (keep_whitespace, text))
+
     def test_date_format_ordinal(self):
         """Test date format in SSML (ordinal)"""
         processor = TextProcessor(default_lang="en_US")
@@ -1086,6 +1321,283 @@ class TextProcessorTestCase(unittest.TestCase):
             words, [Word(idx=0, text="ROOFUS", text_with_ws="ROOFUS",)],
         )
 
+    def test_stage_timings(self):
+        """Test per-stage timing records"""
+        timings = []
+        processor = TextProcessor(
+            default_lang="en_US",
+            on_stage_timing=timings.append,
+            get_parts_of_speech=lambda words: ["NN"] * len(words),
+            guess_phonemes=lambda word, role=None: list(word),
+        )
+        graph, root = processor("It costs $5.")
+        sentences = list(processor.sentences(graph, root))
+        self.assertEqual(len(sentences), 1)
+
+        stages = {timing.stage for timing in timings}
+        for stage in [
+            "parse",
+            "split_replacements",
+            "transform_currency",
+            "verbalize_currency",
+            "break_sentences",
+            "process_sentence",
+            "process_sentence/get_parts_of_speech",
+            "process_sentence/guess_phonemes",
+            "post_process_graph",
+            "sentences",
+        ]:
+            self.assertIn(stage, stages)
+
+        # $5 was the only currency leaf
+        currency_timing = next(t for t in timings if t.stage == "transform_currency")
+        self.assertEqual(currency_timing.leaves_changed, 1)
+        self.assertGreater(currency_timing.leaves_visited, 1)
+
+        # All words were phonemized in one sentence
+        sentence_timings = [t for t in timings if t.stage == "process_sentence"]
+        self.assertEqual(len(sentence_timings), 1)
+        self.assertEqual(
+            sentence_timings[0].leaves_changed,
+            sum(1 for w in sentences[0] if w.is_spoken),
+        )
+
+        # Aggregated per stage
+        aggregator = StageTimingAggregator()
+        for timing in timings:
+            aggregator(timing)
+
+        summary = {row["stage"]: row for row in aggregator.summary()}
+        self.assertEqual(set(summary), stages)
+        self.assertEqual(
+            summary["process_sentence/guess_phonemes"]["calls"],
+            sentence_timings[0].leaves_visited,
+        )
+
+        aggregator.reset()
+        self.assertEqual(aggregator.summary(), [])
+
+    def test_stats(self):
+        """Test runtime counters and Prometheus export"""
+        with tempfile.TemporaryDirectory() as temp_dir_str:
+            db_path = Path(temp_dir_str) / "lexicon.db"
+            with sqlite3.connect(str(db_path)) as db_conn:
+                db_conn.execute(
+                    "CREATE TABLE word_phonemes "
+                    + "(word TEXT, role TEXT, phonemes TEXT, pron_order INTEGER)"
+                )
+                db_conn.executemany(
+                    "INSERT INTO word_phonemes VALUES (?, ?, ?, 0)",
+                    [("hello", "", "h ə l oʊ"), ("world", "", "w ɚ l d")],
+                )
+
+            tagger = DelayedPartOfSpeechTagger("model.crf", cache=LRUCache())
+            tagger.tagger = lambda words: ["NN"] * len(words)
+
+            processor = TextProcessor(
+                default_lang="en_US",
+                lookup_phonemes=DelayedSqlitePhonemizer(db_path),
+                guess_phonemes=lambda word, role=None: list(word),
+                get_parts_of_speech=tagger,
+            )
+
+            lexicon_hits = []
+            for _ in range(2):
+                graph, root = processor("hello world costs $5. hello world!")
+                list(processor.sentences(graph, root))
+                lexicon_hits.append(
+                    processor.stats()["languages"]["en_US"]["lookup_phonemes"][
+                        "lexicon_hits"
+                    ]
+                )
+
+            stats = processor.stats()
+            self.assertEqual(stats["documents"], 2)
+            self.assertEqual(stats["sentences"], 4)
+            self.assertGreaterEqual(stats["babel_parses"], 2)
+
+            lang_stats = stats["languages"]["en_US"]
+            lexicon_stats = lang_stats["lookup_phonemes"]
+
+            # Database is only queried on a cache miss, and hello/world are cached
+            self.assertEqual(
+                lexicon_stats["sql_queries"], lexicon_stats["lexicon_misses"]
+            )
+            self.assertGreater(lexicon_hits[1], 2 * lexicon_hits[0])
+            self.assertGreaterEqual(lexicon_stats["load_seconds"], 0)
+
+            pos_stats = lang_stats["get_parts_of_speech"]
+            self.assertEqual(pos_stats["calls"], 4)
+            self.assertEqual(pos_stats["cache_hits"], 2)
+            self.assertEqual(pos_stats["cache_misses"], 2)
+
+            # Guesser without stats is skipped
+            self.assertNotIn("guess_phonemes", lang_stats)
+
+            prom_path = Path(temp_dir_str) / "gruut.prom"
+            prom_text = stats_to_prometheus(processor.stats(reset=True), path=prom_path)
+            self.assertEqual(prom_path.read_text(encoding="utf-8"), prom_text)
+
+            prom_lines = prom_text.splitlines()
+            self.assertIn("# TYPE gruut_documents_total counter", prom_lines)
+            self.assertIn("gruut_documents_total 2", prom_lines)
+            self.assertIn(
+                "gruut_lookup_phonemes_lexicon_hits_total"
+                + f'{{lang="en_US"}} {lexicon_hits[1]}',
+                prom_lines,
+            )
+            self.assertIn("# TYPE gruut_lookup_phonemes_load_seconds gauge", prom_lines)
+
+            # Counters were reset
+            stats = processor.stats()
+            self.assertEqual(stats["documents"], 0)
+            self.assertEqual(stats["words"], 0)
+            self.assertEqual(
+                stats["languages"]["en_US"]["lookup_phonemes"]["sql_queries"], 0
+            )
+
+    def test_verbalize_cache(self):
+        """Test that repeated numbers/currency skip num2words and the lexicon"""
+        lookups = []
+
+        def lookup_phonemes(word, role=None, do_transforms=True):
+            if do_transforms:
+                lookups.append(word)
+
+            return list(word) if word.isalpha() else None
+
+        processor = TextProcessor(
+            default_lang="en_US", lookup_phonemes=lookup_phonemes
+        )
+
+        text = "It was $1,000 in 2021 too. It was $1,000 in 2021 too."
+        sentences = list(processor.sentences(*processor(text)))
+        self.assertEqual(len(sentences), 2)
+
+        # Same words and phonemes for both sentences
+        self.assertEqual(
+            [(w.text, w.phonemes) for w in sentences[0]],
+            [(w.text, w.phonemes) for w in sentences[1]],
+        )
+        self.assertEqual(
+            sentences[0].text, "It was one thousand dollars in twenty twenty one too."
+        )
+
+        # Verbalized words were only looked up in the lexicon once
+        for verbalized_word in ["one", "thousand", "dollars", "twenty"]:
+            self.assertEqual(lookups.count(verbalized_word), 1, verbalized_word)
+
+        # Non-verbalized words are still looked up each time
+        self.assertEqual(lookups.count("was"), 2)
+
+        stats = processor.stats()
+        self.assertEqual(stats["verbalize_cache_misses"], 2)
+        self.assertEqual(stats["verbalize_cache_hits"], 2)
+
+    def test_sentences_chunked(self):
+        """Test chunked processing against processing the whole document"""
+        processor = TextProcessor(default_lang="en_US")
+
+        def sentence_tuples(sentences):
+            return [
+                (
+                    s.idx,
+                    s.par_idx,
+                    s.text_with_ws,
+                    s.pause_before_ms,
+                    s.pause_after_ms,
+                    s.marks_before,
+                    s.marks_after,
+                    [(w.idx, w.sent_idx, w.par_idx, w.text_with_ws) for w in s],
+                )
+                for s in sentences
+            ]
+
+        text = "\n\n".join(
+            f"Sentence {i} is here. It is {i} May 2020!\nMore text" + ("." * (i % 2))
+            for i in range(20)
+        )
+
+        ssml = (
+            "<speak>Intro. "
+            + "".join(
+                f'<p><s>Paragraph <mark name="m{i}" /> {i}.</s> '
+                + f'Two <break time="{i}ms" /> here.</p><break time="5ms" /> Tail.'
+                for i in range(20)
+            )
+            + '<mark name="end" /></speak>'
+        )
+
+        for input_text, ssml_arg in [(text, False), (ssml, True)]:
+            self.assertGreater(
+                len(
+                    processor.split_chunks(
+                        input_text, ssml=ssml_arg, max_chunk_chars=200
+                    )
+                ),
+                2,
+            )
+
+            graph, root = processor(input_text, ssml=ssml_arg, phonemize=False)
+            expected = sentence_tuples(processor.sentences(graph, root))
+
+            actual = sentence_tuples(
+                processor.sentences_chunked(
+                    input_text,
+                    ssml=ssml_arg,
+                    max_chunk_chars=200,
+                    max_workers=2,
+                    phonemize=False,
+                )
+            )
+            self.assertEqual(actual, expected)
+
+    def test_compact_words(self):
+        """Test that words, sentences, and nodes use slots without a __dict__"""
+        processor = TextProcessor(default_lang="en_US")
+        graph, root = processor("Hello  world. Bye!", pos=False, phonemize=False)
+        sentences = processor.sentences(graph, root)
+
+        nodes = [graph.nodes[node][DATA_PROP] for node in graph.nodes]
+        self.assertTrue(any(isinstance(node, WordNode) for node in nodes))
+
+        # Every node class
+        node_classes = [
+            Node,
+            IgnoreNode,
+            BreakNode,
+            MarkNode,
+            WordNode,
+            BreakWordNode,
+            PunctuationWordNode,
+            SentenceNode,
+            ParagraphNode,
+            SpeakNode,
+        ]
+        nodes.extend(node_class(node=0) for node_class in node_classes)
+
+        for obj in itertools.chain(sentences, sentences[0].words, nodes):
+            self.assertFalse(hasattr(obj, "__dict__"), obj)
+            with self.assertRaises(AttributeError):
+                obj.not_a_field = True
+
+        # Same public API
+        self.assertEqual(WordNode(node=0).text, "")
+        self.assertEqual(
+            [f.name for f in dataclasses.fields(PunctuationWordNode)],
+            ["node", "element", "voice", "lang", "implicit", "text", "text_with_ws"],
+        )
+        self.assertEqual(dataclasses.asdict(sentences[1])["words"][0]["text"], "Bye")
+        self.assertEqual(pickle.loads(pickle.dumps(sentences)), sentences)
+        self.assertEqual(copy.deepcopy(nodes), nodes)
+
+        # Whitespace always comes from text_with_ws
+        word = sentences[0].words[0]
+        self.assertEqual((word.leading_ws, word.trailing_ws), ("", "  "))
+
+        word = dataclasses.replace(word, text_with_ws=" Hello")
+        self.assertEqual((word.leading_ws, word.trailing_ws), (" ", ""))
+
 
 def print_graph_stderr(graph, root):
     """Print graph to stderr"""
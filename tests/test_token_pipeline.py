@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""Differential tests for the plain-text token pipeline against the graph"""
+import random
+import unittest
+from unittest.mock import patch
+
+from gruut.bench import DEFAULT_SENTENCES_PATH, make_corpora
+from gruut.const import KNOWN_LANGS
+from gruut.text_processor import TextProcessor
+
+# Plain text from other tests (golden rules, English, numbers, etc.)
+TEXTS = [
+    "",
+    "Hello World. My name is Jonas.",
+    "What is your name? My name is Jonas.",
+    "My name is Jonas E. Smith.",
+    "Please turn to p. 55.",
+    "They closed the deal with Pitt, Briggs & Co. at noon.",
+    "I can see Mt. Fuji from here.",
+    "That is JFK Jr.'s book.",
+    "I have lived in the U.S. for 20 years.",
+    "She has $100.00 in her bag.",
+    "Hello!? Is that you?",
+    "This is a sentence\ncut off in the middle because pdf.",
+    "IT’S <a> 'test' (seNtEnce) for-only $100, Dr., & [I] ## *like* ## it 100%!",
+    'He said "Hello." Then (quietly.) she left!',
+    "It was $1,000 in 2021 too. Call me at 4:30pm on 4/1/2020, ok?",
+    "ABCD-10 nan inf ROOFUS 1st 2nd 3.14 -5 10am",
+    "Bye-bye ~~ now...   spaces   and\n\nnewlines",
+]
+
+# Texts for every language
+LANG_TEXTS = [
+    "1, 2, 3. 4/1/2020 12:30 1.000,5 $5 €5 10%.",
+    'A-B «c» (d) "e" f? g! h; i: j.',
+]
+
+
+def lookup_phonemes(word, role=None, **kwargs):
+    """Made-up lexicon with only some words"""
+    if word.isalpha() and (len(word) % 2 == 0):
+        return list(word.lower())
+
+    return None
+
+
+def guess_phonemes(word, role=None):
+    """Made-up guesser that depends on the part of speech"""
+    return list(word.upper()) + ([role] if role else [])
+
+
+def get_parts_of_speech(words):
+    """Made-up tagger that depends on the whole sentence"""
+    return [f"{len(words)}{word[:1]}" for word in words]
+
+
+def load_corpora():
+    """Plain text corpora (see gruut.bench)"""
+    lang_texts = []
+    with open(DEFAULT_SENTENCES_PATH, "r", encoding="utf-8") as sentences_file:
+        for line in sentences_file:
+            line = line.strip()
+            if (not line) or line.startswith("#"):
+                continue
+
+            lang, text, *_ = line.split("|")
+            lang_texts.append((lang, text))
+
+    corpora = make_corpora(
+        [text for _, text in lang_texts] + TEXTS, num_items=20, rng=random.Random(0)
+    )
+    for corpus in corpora.values():
+        if not corpus["ssml"]:
+            lang_texts.extend(("en-us", text) for text in corpus["items"])
+
+    return lang_texts
+
+
+class TokenPipelineTestCase(unittest.TestCase):
+    """Test that plain text gives the same sentences with and without a graph"""
+
+    def assert_same_sentences(
+        self, processors, text, lang=None, sentences_args=None, **process_args
+    ):
+        """Compare process_sentences (no graph) to process + sentences"""
+        graph_processor, token_processor = processors
+        sentences_args = sentences_args or {}
+        graph, root = graph_processor.process(text, lang=lang, **process_args)
+        expected = list(graph_processor.sentences(graph, root, **sentences_args))
+
+        with patch.object(token_processor, "process", side_effect=AssertionError):
+            actual = token_processor.process_sentences(
+                text, lang=lang, sentences_args=sentences_args, **process_args
+            )
+
+        self.assertEqual(actual, expected, (lang, text))
+
+    def make_processor(self, **kwargs):
+        """Processor with made-up lexicon, guesser, and tagger"""
+        return TextProcessor(
+            lookup_phonemes=lookup_phonemes,
+            guess_phonemes=guess_phonemes,
+            get_parts_of_speech=get_parts_of_speech,
+            **kwargs,
+        )
+
+    def make_processors(self, **kwargs):
+        """Separate processors for each path, so neither reads the other's caches"""
+        return (self.make_processor(**kwargs), self.make_processor(**kwargs))
+
+    def test_texts(self):
+        """Test texts from other tests with different options"""
+        for keep_whitespace in (True, False):
+            processors = self.make_processors(
+                default_lang="en_US", keep_whitespace=keep_whitespace
+            )
+            for text in TEXTS:
+                self.assert_same_sentences(processors, text)
+                self.assert_same_sentences(
+                    processors,
+                    text,
+                    pos=False,
+                    verbalize_numbers=False,
+                    verbalize_currency=False,
+                    sentences_args={"major_breaks": False, "punctuations": False},
+                )
+                self.assert_same_sentences(
+                    processors,
+                    text,
+                    phonemize=False,
+                    detect_dates=False,
+                    detect_times=False,
+                    sentences_args={"explicit_lang": False, "break_phonemes": False},
+                )
+
+    def test_corpora(self):
+        """Test benchmark corpora built from test/test_sentences.txt"""
+        lang_processors = {}
+        for lang, text in load_corpora():
+            processors = lang_processors.get(lang)
+            if processors is None:
+                processors = self.make_processors(default_lang=lang)
+                lang_processors[lang] = processors
+
+            # No liaisons, etc. (needs the graph)
+            self.assert_same_sentences(processors, text, post_process=False)
+
+    def test_languages(self):
+        """Test every language"""
+        for lang in sorted(KNOWN_LANGS):
+            processors = self.make_processors(default_lang=lang)
+            for text in LANG_TEXTS:
+                self.assert_same_sentences(processors, text, post_process=False)
+
+    def test_other_lang(self):
+        """Test text in a language other than the default"""
+        processors = self.make_processors(default_lang="en_US")
+        for text in TEXTS:
+            self.assert_same_sentences(processors, text, lang="de_DE")
+
+    def test_needs_graph(self):
+        """Test that post-processing still goes through the graph"""
+        graph_processor, token_processor = self.make_processors(default_lang="fr_FR")
+        text = "J’ai des petites oreilles. Les amis."
+
+        graph, root = graph_processor.process(text)
+        expected = list(graph_processor.sentences(graph, root))
+        self.assertEqual(token_processor.process_sentences(text), expected)
+
+        class SubProcessor(TextProcessor):
+            """Processor with graph post-processing"""
+
+            def post_process_graph(self, graph, root):
+                pass
+
+        sub_processor = SubProcessor(default_lang="en_US")
+        with patch.object(
+            sub_processor, "process", wraps=sub_processor.process
+        ) as process:
+            sub_processor.process_sentences("Hello world.")
+            process.assert_called_once()
+
+
+# -----------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    unittest.main()